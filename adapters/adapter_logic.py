@@ -2,32 +2,50 @@
 """
  -- adapter_logic.py --
     Defines logic for which adapter to call and how to concatenate results
+    Sources are declared in the adapter registry (see adapters/registry.py), which skips
+    the ones whose circuit is open and tries healthy sources before degraded ones.
 """
-
 from adapters.jobicy import  parse_jobicy_job
 from adapters.remoteok import parse_remoteok_job
 from adapters.remotive import parse_remotive_job
 from adapters.arbeitnow import parse_arbeitnow_job
+from adapters.registry import adapter_registry, SourceUnavailable
+
+# Fallback order: Remotive first, ArbeitNow as the last resort.
+# Remotive (`search`) and Jobicy (`tag`) can filter by a search term.
+adapter_registry.register("remotive", parse_remotive_job, priority=1, searchable=True)
+adapter_registry.register("remoteok", parse_remoteok_job, priority=2)
+adapter_registry.register("jobicy", parse_jobicy_job, priority=3, searchable=True)
+adapter_registry.register("arbeitnow", parse_arbeitnow_job, priority=4)
+
+# Sources the miss runner can search, by priority
+SEARCHABLE_SOURCES = tuple(adapter_registry.names(searchable=True))
+
 
 def aggregate_job_listings():
-    """Aggregate job listings from multiple adapters based on API availability"""
-    all_jobs = []
-    try:
-        remotive = parse_remotive_job()
-        all_jobs.extend(remotive)
-    except Exception as e:
-        # print(f"Error fetching from primary adapters: {e}")
+    """Jobs from the first available source that returns any, falling back through the registry order"""
+    for source in adapter_registry.ordered():
         try:
-            remoteok = parse_remoteok_job()
-            all_jobs.extend(remoteok)
-            # jobicy = parse_jobicy_job()
-            # all_jobs.extend(jobicy)
+            jobs = adapter_registry.fetch(source)
+        except SourceUnavailable:
+            continue
         except Exception as e:
-            # print(f"Error fetching from JobIcy adapter: {e}")
-            try:
-                arbeitnow = parse_arbeitnow_job()
-                all_jobs.extend(arbeitnow)
-            except Exception as e:
-                print(f"Error fetching from ArbeitNow adapter: {e}")
-
-    return all_jobs
\ No newline at end of file
+            print(f"Error fetching from {source} adapter: {e}")
+            continue
+        if jobs:
+            return jobs
+        print(f"No jobs from {source} adapter. Trying the next source.")
+    return []
+
+
+def search_job_listings(source, query):
+    """
+    Fetches the jobs matching a search term from one searchable source
+    :raises SourceUnavailable: The source's circuit is open
+    """
+    return adapter_registry.fetch(source, query)
+
+
+def get_source_status():
+    """Health and circuit state of every source"""
+    return adapter_registry.status()
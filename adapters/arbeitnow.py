@@ -3,19 +3,16 @@
 import requests
 
 from config import Config
+from models.job_record import JobRecord
 from utils.formatters import html_to_text
 
 
 def fetch_arbeitnow_jobs():
-    """Fetches job listings from the ArbeitNow API"""
-    try:
-        response = requests.get(Config.ARBEITNOW_API_URL, timeout=10)
-        response.raise_for_status()
-        jobs_data = response.json()
-        return jobs_data.get('data', [])
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching ArbeitNow jobs data: {e}")
-        return []
+    """Fetches job listings from the ArbeitNow API; network and HTTP errors are raised"""
+    response = requests.get(Config.ARBEITNOW_API_URL, timeout=Config.ADAPTER_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    jobs_data = response.json()
+    return jobs_data.get('data', [])
 
 def parse_arbeitnow_job():
     """Parse data from ArbeitNow API into standardized job format"""
@@ -26,20 +23,18 @@ def parse_arbeitnow_job():
     parsed_jobs = []
 
     for job in jobs:
-        new_job = {}
-        new_job["job_title"] = job.get('title', None)
-        new_job["company_name"] = job.get('company_name', None)
         description = job.get('description', None)
-        if description:
-            new_job["job_description"] = html_to_text(description)
-        else:
-            new_job["job_description"] = job.get('description', None)
-        new_job["is_remote"] = job.get('remote', True)
-        new_job["location"] = job.get('location', None)
-        new_job["job_url"] = job.get('url', None)
-        new_job["tags"] = job.get('tags', [])
-        new_job["date_posted"] = job.get('created_at', None)
-        parsed_jobs.append(new_job)
+        parsed_jobs.append(JobRecord(
+            source="arbeitnow",
+            job_title=job.get('title', None),
+            company_name=job.get('company_name', None),
+            job_description=html_to_text(description) if description else description,
+            is_remote=job.get('remote', True),
+            location=job.get('location', None),
+            job_url=job.get('url', None),
+            tags=tuple(job.get('tags') or ()),
+            date_posted=job.get('created_at', None),
+        ))
 
     return parsed_jobs
 
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""
+ -- registry.py --
+    Registry of job sources with health tracking and circuit breakers
+    1. Each source registers its parse function (fetch + parse into JobRecords), a priority
+       and whether it accepts a search term
+    2. Every call is recorded in a rolling window per source: latency, success and payload
+       size (jobs returned). The health score combines the success rate and the latency;
+       sources scoring under ADAPTER_MIN_HEALTH are tried after the healthy ones for a while.
+    3. ADAPTER_FAILURE_THRESHOLD consecutive failures open the source's circuit: it is skipped
+       for ADAPTER_OPEN_SECONDS, then a single half-open probe call is let through. A probe that
+       succeeds closes the circuit, one that fails opens it again.
+    Health is tracked per process; refreshes run in one process at a time (see refresh_cache),
+    so that process sees every full fetch.
+"""
+import threading
+import time
+from collections import deque
+
+from config import Config
+from utils.metrics import inc_counter, observe, set_gauge
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SourceUnavailable(Exception):
+    """The source's circuit is open (or its half-open probe is already in flight)"""
+
+
+class SourceHealth:
+    """Rolling call statistics and circuit state of one source"""
+
+    def __init__(self, window: int):
+        self._calls = deque(maxlen=window)  # (latency seconds, ok, jobs returned)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.last_error = None
+        self.last_call_at = None
+
+    def record(self, latency: float, ok: bool, jobs: int = 0):
+        self._calls.append((latency, ok, jobs))
+        self.last_call_at = time.monotonic()
+
+    @property
+    def calls(self):
+        return len(self._calls)
+
+    @property
+    def error_rate(self):
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, ok, _ in self._calls if not ok) / len(self._calls)
+
+    @property
+    def median_latency(self):
+        latencies = sorted(latency for latency, _, _ in self._calls)
+        return latencies[len(latencies) // 2] if latencies else 0.0
+
+    @property
+    def mean_jobs(self):
+        payloads = [jobs for _, ok, jobs in self._calls if ok]
+        return sum(payloads) / len(payloads) if payloads else 0.0
+
+    @property
+    def score(self):
+        """1.0 for a source that always answers quickly, towards 0 as it fails or slows down"""
+        if self.state == OPEN:
+            return 0.0
+        latency_factor = 1.0 / (1.0 + self.median_latency / Config.ADAPTER_SLOW_SECONDS)
+        return round((1.0 - self.error_rate) * latency_factor, 3)
+
+    def to_dict(self):
+        return {
+            "state": self.state,
+            "score": self.score,
+            "calls": self.calls,
+            "error_rate": round(self.error_rate, 3),
+            "median_latency_s": round(self.median_latency, 3),
+            "mean_jobs": round(self.mean_jobs, 1),
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
+
+
+class AdapterRegistry:
+    """Job sources by name, called through their circuit breakers"""
+
+    def __init__(self, window: int, failure_threshold: int, open_seconds: float):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._lock = threading.Lock()
+        self._sources = {}  # name -> (parse function, priority, searchable)
+        self._health = {}
+
+    def register(self, name, parse_function, priority, searchable=False):
+        """
+        Adds a source
+        :param parse_function: Fetches and parses the source's jobs; called with the search term when searchable
+        :param priority: Lower is tried first
+        """
+        with self._lock:
+            self._sources[name] = (parse_function, priority, searchable)
+            self._health.setdefault(name, SourceHealth(self.window))
+
+    def names(self, searchable=False):
+        """Registered sources by priority (only those accepting a search term when searchable)"""
+        return [name for name, (_, _, can_search) in sorted(self._sources.items(), key=lambda item: item[1][1])
+                if can_search or not searchable]
+
+    def is_available(self, name):
+        """False while the source's circuit is open (a due half-open probe counts as available)"""
+        health = self._health[name]
+        with self._lock:
+            if health.state == OPEN:
+                return time.monotonic() - health.opened_at >= self.open_seconds
+            return not (health.state == HALF_OPEN and health.probe_in_flight)
+
+    def is_degraded(self, name):
+        """
+        True when the source scored below ADAPTER_MIN_HEALTH in the last ADAPTER_OPEN_SECONDS.
+        Afterwards it gets its priority back, so a source that recovered is used again.
+        """
+        health = self._health[name]
+        return (health.score < Config.ADAPTER_MIN_HEALTH and health.last_call_at is not None
+                and time.monotonic() - health.last_call_at < self.open_seconds)
+
+    def ordered(self, searchable=False):
+        """Available sources to try in turn: healthy ones by priority, then degraded ones by priority"""
+        names = [name for name in self.names(searchable) if self.is_available(name)]
+        return sorted(names, key=self.is_degraded)
+
+    def fetch(self, name, *args):
+        """
+        Calls a source through its circuit breaker
+        :raises SourceUnavailable: The circuit is open
+        :raises Exception: Whatever the source raised (recorded as a failure)
+        """
+        parse_function = self._sources[name][0]
+        health = self._health[name]
+        self._before_call(name, health)
+
+        start = time.perf_counter()
+        try:
+            jobs = parse_function(*args)
+        except Exception as e:
+            latency = time.perf_counter() - start
+            self._after_call(name, health, latency, error=e)
+            raise
+        latency = time.perf_counter() - start
+        self._after_call(name, health, latency, jobs=len(jobs))
+        return jobs
+
+    def _before_call(self, name, health):
+        with self._lock:
+            if health.state == OPEN:
+                if time.monotonic() - health.opened_at < self.open_seconds:
+                    inc_counter("jobsearchai_adapter_fetches_total", source=name, outcome="skipped")
+                    raise SourceUnavailable(f"{name} circuit is open")
+                health.state = HALF_OPEN
+                print(f"Adapter {name}: circuit half-open, probing")
+            if health.state == HALF_OPEN:
+                if health.probe_in_flight:
+                    inc_counter("jobsearchai_adapter_fetches_total", source=name, outcome="skipped")
+                    raise SourceUnavailable(f"{name} is being probed")
+                health.probe_in_flight = True
+
+    def _after_call(self, name, health, latency, jobs=0, error=None):
+        with self._lock:
+            health.record(latency, error is None, jobs)
+            health.probe_in_flight = False
+            if error is None:
+                if health.state != CLOSED:
+                    print(f"Adapter {name}: probe succeeded, circuit closed")
+                health.state = CLOSED
+                health.consecutive_failures = 0
+            else:
+                health.consecutive_failures += 1
+                health.last_error = f"{type(error).__name__}: {error}"[:500]
+                if health.state == HALF_OPEN or health.consecutive_failures >= self.failure_threshold:
+                    health.state = OPEN
+                    health.opened_at = time.monotonic()
+                    print(f"Adapter {name}: circuit opened for {self.open_seconds:.0f}s ({health.last_error})")
+            outcome = "error" if error is not None else ("ok" if jobs else "empty")
+            score = health.score
+            circuit_open = health.state == OPEN
+        observe("jobsearchai_adapter_fetch_duration_seconds", latency, source=name)
+        inc_counter("jobsearchai_adapter_fetches_total", source=name, outcome=outcome)
+        set_gauge("jobsearchai_adapter_health", score, source=name)
+        set_gauge("jobsearchai_adapter_circuit_open", 1 if circuit_open else 0, source=name)
+
+    def status(self):
+        """Health of every source, for the status endpoint"""
+        with self._lock:
+            return {name: {"priority": priority, "searchable": searchable, **self._health[name].to_dict()}
+                    for name, (_, priority, searchable) in self._sources.items()}
+
+
+adapter_registry = AdapterRegistry(Config.ADAPTER_HEALTH_WINDOW, Config.ADAPTER_FAILURE_THRESHOLD,
+                                   Config.ADAPTER_OPEN_SECONDS)
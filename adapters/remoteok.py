@@ -3,18 +3,15 @@
 
 import requests
 from config import Config
+from models.job_record import JobRecord
 from utils.formatters import html_to_text
 
 def fetch_remoteok_jobs():
-    """Fetches job listings from the RemoteOK API"""
-    try:
-        response = requests.get(Config.REMOTEOK_API_URL, timeout=10)
-        response.raise_for_status()
-        jobs_data = response.json()
-        return jobs_data[1:]  # The first element is metadata
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching RemoteOK jobs data: {e}")
-        return []
+    """Fetches job listings from the RemoteOK API; network and HTTP errors are raised"""
+    response = requests.get(Config.REMOTEOK_API_URL, timeout=Config.ADAPTER_TIMEOUT_SECONDS)
+    response.raise_for_status()
+    jobs_data = response.json()
+    return jobs_data[1:]  # The first element is metadata
 
 
 def parse_remoteok_job():
@@ -26,19 +23,17 @@ def parse_remoteok_job():
     parsed_jobs = []
 
     for job in jobs:
-        new_job = {}
-        new_job["job_title"] = job.get('position', None)
-        new_job["company_name"] = job.get('company', None)
         description = job.get('description', None)
-        if description:
-            new_job["job_description"] = html_to_text(description)
-        else:
-            new_job["job_description"] = job.get('description', None)
-        new_job["is_remote"] = job.get('remote', True)
-        new_job["location"] = job.get('location', None)
-        new_job["job_url"] = job.get('url', None)
-        new_job["tags"] = job.get('tags', [])
-        new_job["date_posted"] = job.get('date', None)
-        parsed_jobs.append(new_job)
+        parsed_jobs.append(JobRecord(
+            source="remoteok",
+            job_title=job.get('position', None),
+            company_name=job.get('company', None),
+            job_description=html_to_text(description) if description else description,
+            is_remote=job.get('remote', True),
+            location=job.get('location', None),
+            job_url=job.get('url', None),
+            tags=tuple(job.get('tags') or ()),
+            date_posted=job.get('date', None),
+        ))
 
     return parsed_jobs
\ No newline at end of file
@@ -1,33 +1,327 @@
 #!/usr/bin/env python
 """Agent Handler"""
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pprint
-from agent.llm_agent_service import generate_recommendations
+from typing import List
+
+from agent.llm_agent_service import generate_recommendations, generate_batch_recommendations
+from config import Config
+from schemas.dbStorage import DBStorage
 # In agent/handler.py
-from utils.intent_detector import extract_job_title
-from services.cache_logic import get_cached_jobs_by_title, caching_logic
-from utils.formatters import format_job_response, format_no_jobs_message
+from utils.intent_detector import (extract_job_title, parse_more_request, parse_skill_query,
+                                   looks_like_job_description, parse_search_filters, parse_follow_up)
+from services.cache_logic import (get_cached_jobs_page, get_cached_jobs_by_skills, get_top_skills,
+                                  current_generation, find_known_title, record_search_miss, find_similar_jobs,
+                                  get_ranked_job_ids, matches_filters)
+from services.conversation_store import get_conversation, save_conversation, new_conversation
+from utils.formatters import (format_job_response, format_no_jobs_message, describe_search,
+                              format_job_recommendations)
 from agent.llm_agent_service import extract_title_with_llm
+from services.response_cache import (get_cached_response, store_response, make_response_key,
+                                     get_cached_recommendations, store_recommendations)
+from utils.metrics import timed, record_cache_lookup
+from utils.cursor import encode_cursor, decode_cursor, looks_like_cursor
+from services.admission import llm_admission, PRIORITY_TITLE, PRIORITY_RECOMMENDATIONS
+from services.market_trends import get_market_skills
+
+
+NO_TITLE_MESSAGE = (
+    "🤔 I couldn't identify a job title from your message.\n\n"
+    "Try something like:\n"
+    "• 'python developer'\n"
+    "• 'looking for backend engineer jobs'\n"
+    "• 'show me data analyst positions'\n\n"
+)
 
+ERROR_MESSAGE = "😞 Sorry, something went wrong while processing your request."
 
-def process_message(user_message):
-    """Main entry point to process user messages"""
+INVALID_CURSOR_MESSAGE = (
+    "🔗 That page link has expired or is invalid.\n\n"
+    "Search for the job title again to get fresh results and a new 'more ...' line."
+)
+
+
+def process_message(user_message, context_id=None):
+    """
+    Main entry point to process user messages
+    :param context_id: A2A conversation id; follow-ups in a conversation are answered from its last results
+    :return: The response, or an apology when processing failed
+    """
     try:
-        return handle_job_search(user_message)
+        return answer_message(user_message, context_id)
     except Exception as e:
         print(f"Error processing message: {e}")
-        return "😞 Sorry, something went wrong while processing your request."
+        return ERROR_MESSAGE
+
+
+def answer_message(user_message, context_id=None):
+    """process_message without the apology: errors reach the caller (see services/task_queue.py)"""
+    more_token = parse_more_request(user_message)
+    if more_token is not None:
+        cursor = decode_cursor(more_token)
+        if _is_page_cursor(cursor):
+            return handle_more_results(cursor)
+        if cursor is not None or looks_like_cursor(more_token):
+            # A damaged or foreign token must not turn into a search for "more <token>"
+            return INVALID_CURSOR_MESSAGE
+        if not more_token:
+            return (context_id and handle_follow_up(context_id, 'more')) or handle_more_results(None)
+    follow_up = parse_follow_up(user_message) if context_id else None
+    if follow_up:
+        response = handle_follow_up(context_id, *follow_up)
+        if response:
+            return response
+    return handle_job_search(user_message, context_id)
+
+
+
+def handle_job_search(message: str, context_id=None) -> str:
+    """Handle job search requests from users (remembering the results for the conversation, if any)."""
+
+    with timed("freshness_check"):
+        generation = current_generation() # Cache populated and fresh (checked every few seconds); gazetteer in step
+
+    # A pasted job description is matched on its content, not on a title
+    if looks_like_job_description(message):
+        return handle_description_search(message, generation=generation, context_id=context_id)
+
+    # "remote ... posted this week" become structured filters; the rest is searched for
+    search_text, filters = parse_search_filters(message)
+
+    # "jobs requiring kubernetes and go" is answered from the skill index
+    skill_query = parse_skill_query(search_text)
+    if skill_query:
+        return handle_skill_search(*skill_query, filters=filters, generation=generation, context_id=context_id)
+
+    job_title = resolve_job_title(search_text)
+    print(f"Extracted job title from user message: {job_title}")
+    if not job_title:
+        # Free text without a recognizable title may still describe jobs we hold
+        return handle_description_search(message, no_match_response=NO_TITLE_MESSAGE, generation=generation,
+                                         context_id=context_id)
+
+    # Responses are deterministic until the next refresh
+    cached_response = get_cached_response(job_title, generation, filters)
+    record_cache_lookup("response", bool(cached_response))
+    if cached_response:
+        print(f"Serving cached response for: {job_title}")
+        if context_id:
+            _remember_title_search(context_id, job_title, filters, generation)
+        return cached_response
+
+    with timed("db_search"):
+        cached_jobs, next_page = get_cached_jobs_page(job_title, filters=filters) # Could have called Db.get_by_title here
+
+    if not cached_jobs:
+        # Only unfiltered misses say the cache lacks a title
+        if not filters:
+            record_search_miss(job_title)
+        return format_no_jobs_message(describe_search(job_title, filters))
+
+
+    # Generate recommendations based on the first job
+    top_skills = get_top_skills(cached_jobs)
+    market_skills = get_market_skills(job_title, cached_jobs[0].job_title)
+    recommendations, recommendations_paused = _recommend_for_job(cached_jobs[0], top_skills, market_skills)
+
+    if context_id:
+        _remember_title_search(context_id, job_title, filters, generation, cached_jobs, next_page, recommendations)
+    return _build_search_response(job_title, generation, cached_jobs, next_page,
+                                  recommendations, recommendations_paused, top_skills, filters)
+
+
+def handle_skill_search(job_title, skills, filters=None, generation=None, context_id=None) -> str:
+    """Answer a search by required skills with an intersection of the skill index"""
+    print(f"Skill search: title={job_title} skills={skills} filters={filters}")
+    with timed("skill_search"):
+        jobs = get_cached_jobs_by_skills(skills, job_title, filters=filters)
+
+    label = describe_search(f"{job_title or 'jobs'} requiring {', '.join(skills)}", filters)
+    if not jobs:
+        return format_no_jobs_message(label)
+
+    top_skills = get_top_skills(jobs)
+    market_skills = get_market_skills(job_title, jobs[0].job_title)
+    recommendations, recommendations_paused = _recommend_for_job(jobs[0], top_skills, market_skills)
+    if recommendations and generation is not None:
+        store_recommendations(jobs[0].id, generation, recommendations)
+    if context_id:
+        save_conversation(context_id, new_conversation('skills', job_title, filters, generation,
+                                                       [job.id for job in jobs], len(jobs),
+                                                       _recommended(jobs, recommendations), label=label))
+    with timed("formatting"):
+        return format_job_response(jobs, recommendations, label, recommendations_paused=recommendations_paused,
+                                   top_skills=top_skills)
+
+
+def handle_description_search(text, no_match_response=None, generation=None, context_id=None) -> str:
+    """Answer a pasted job description or free-text brief with the most similar cached jobs"""
+    with timed("semantic_search"):
+        jobs = find_similar_jobs(text)
+    label = "your description"
+    if not jobs:
+        return no_match_response or format_no_jobs_message(label)
+
+    top_skills = get_top_skills(jobs)
+    market_skills = get_market_skills(None, jobs[0].job_title)
+    # Recommendations target the pasted role itself, titled after its closest cached match
+    recommendations, recommendations_paused = _recommend_for_job(jobs[0], top_skills, market_skills,
+                                                                 description=text)
+    if context_id:
+        # These recommendations target the pasted role, not the job they are titled after
+        save_conversation(context_id, new_conversation('description', None, None, generation,
+                                                       [job.id for job in jobs], len(jobs), label=label))
+    with timed("formatting"):
+        return format_job_response(jobs, recommendations, label, recommendations_paused=recommendations_paused,
+                                   top_skills=top_skills)
+
+
+def _remember_title_search(context_id, job_title, filters, generation, jobs=None, next_page=None,
+                           recommendations=None):
+    """Save a title search as the conversation's last results (jobs=None: it was served from the response cache)"""
+    if jobs is None:
+        # Cached responses are only stored with recommendations for the first job
+        job_ids = get_ranked_job_ids(job_title, Config.CONVERSATION_MAX_RESULTS, filters)
+        state = new_conversation('title', job_title, filters, generation, job_ids,
+                                 min(len(job_ids), Config.RESULTS_PAGE_SIZE), recommended=job_ids[:1])
+    else:
+        job_ids = [job.id for job in jobs]
+        if next_page:
+            job_ids = get_ranked_job_ids(job_title, Config.CONVERSATION_MAX_RESULTS, filters)
+        state = new_conversation('title', job_title, filters, generation, job_ids, len(jobs),
+                                 _recommended(jobs, recommendations))
+    save_conversation(context_id, state)
+
+
+def _recommended(jobs, recommendations):
+    """Job ids whose recommendations are cached once a search generated them for its first job"""
+    return [jobs[0].id] if recommendations else []
+
+
+def handle_follow_up(context_id, kind, value=None):
+    """
+    Answer "more", "only remote" or "recommend for job 3" from the conversation's last result set,
+    without extracting a title, searching or calling the LLM again (unless a new job needs recommendations)
+    :return: The response, or None when the conversation has no results to refine
+    """
+    with timed("freshness_check"):
+        generation = current_generation()
+    state = get_conversation(context_id, generation)
+    if state is None:
+        return None
+    print(f"Follow-up '{kind}' in conversation {context_id}")
+    with timed("follow_up"):
+        if kind == 'more':
+            return _follow_up_more(context_id, state)
+        if kind == 'filter':
+            return _follow_up_filter(context_id, state, value)
+        return _follow_up_recommend(context_id, state, value, generation)
+
+
+def _conversation_label(state, filters=None):
+    return describe_search(state['label'] or state['q'], state['f'] if filters is None else filters)
+
 
+def _follow_up_more(context_id, state):
+    """Next page of the conversation's result set"""
+    start = state['n']
+    page_ids = state['ids'][start:start + Config.RESULTS_PAGE_SIZE]
+    label = _conversation_label(state)
+    if not page_ids:
+        return f"That's all the jobs I have for '{label.title()}'."
+    jobs = DBStorage().get_by_ids(page_ids)
+    shown = start + len(page_ids)
+    save_conversation(context_id, {**state, 'n': shown})
+    with timed("formatting"):
+        return format_job_response(jobs, None, label, start_index=start + 1, show_recommendations=False,
+                                   has_more=shown < len(state['ids']))
 
 
-def handle_job_search(message: str) -> str:
-    """Handle job search requests from users."""
+def _follow_up_filter(context_id, state, filters):
+    """The conversation's result set narrowed by more filters ("only remote"), from its first job"""
+    merged = {**state['f'], **filters}
+    jobs = [job for job in DBStorage().get_by_ids(state['ids']) if matches_filters(job, merged)]
+    label = _conversation_label(state, merged)
+    if not jobs:
+        return format_no_jobs_message(label)
+    page = jobs[:Config.RESULTS_PAGE_SIZE]
+    save_conversation(context_id, {**state, 'f': merged, 'ids': [job.id for job in jobs], 'n': len(page),
+                                   'recs': [job_id for job_id in state['recs'] if any(job.id == job_id for job in jobs)]})
+    with timed("formatting"):
+        return format_job_response(page, None, label, show_recommendations=False, has_more=len(jobs) > len(page))
 
+
+def _follow_up_recommend(context_id, state, number, generation):
+    """Recommendations for one job of the conversation's list, generated once per job and generation"""
+    if not 1 <= number <= len(state['ids']):
+        return f"I listed {len(state['ids'])} jobs. Pick a number between 1 and {len(state['ids'])}."
+    job_id = state['ids'][number - 1]
+    jobs = DBStorage().get_by_ids([job_id])
+    if not jobs:
+        return None
+    job = jobs[0]
+
+    recommendations = get_cached_recommendations(job_id, generation) if job_id in state['recs'] else None
+    record_cache_lookup("recommendations", recommendations is not None)
+    recommendations_paused, top_skills = False, None
+    if recommendations is None:
+        top_skills = get_top_skills([job])
+        market_skills = get_market_skills(state['q'], job.job_title)
+        recommendations, recommendations_paused = _recommend_for_job(job, top_skills, market_skills)
+        if recommendations:
+            store_recommendations(job_id, generation, recommendations)
+            save_conversation(context_id, {**state, 'recs': state['recs'] + [job_id]})
+    with timed("formatting"):
+        return format_job_recommendations(job, number, recommendations, recommendations_paused, top_skills)
+
+
+def _recommend_for_job(job, skills=None, market_skills=None, description=None):
+    """
+    Admitted LLM recommendations for a job, grounded on its indexed skills and this week's market demand.
+    A description (e.g. one the user pasted) replaces the job's own.
+    :return: (recommendations or None, whether the call was shed)
+    """
+    try:
+        job_data = job.to_dict()
+        # jobs_formatter_test = format_job_response(cached_jobs, recommendations, job_title)
+        if skills:
+            job_data['skills'] = skills
+        if market_skills:
+            job_data['market_skills'] = market_skills
+        if description:
+            job_data['job_description'] = description
+        with llm_admission.slot(PRIORITY_RECOMMENDATIONS) as admitted:
+            if not admitted:
+                # Too busy: degrade to jobs without recommendations instead of queueing
+                print("LLM queue over budget. Returning jobs without recommendations.")
+                return None, True
+            with timed("llm_recommendations"):
+                return generate_recommendations(job_data), False
+    except Exception as e:
+        print(f"LLM recommendation error: {e}")
+        return None, False
+
+
+def resolve_job_title(message: str):
+    """Extract the job title from a message: regex, then the cached-title gazetteer, then the LLM"""
     # Extract job title from user message
-    job_title = extract_job_title(message)
+    with timed("regex_intent"):
+        job_title = extract_job_title(message)
+
+    # Look for a title we already hold in the cache before paying for an LLM call
+    if not job_title or len(job_title.split()) > 3:
+        with timed("gazetteer_title"):
+            known_title = find_known_title(message)
+        record_cache_lookup("title_gazetteer", bool(known_title))
+        if known_title:
+            # A cached title is trusted whatever its length: searching for it finds jobs
+            print(f"Gazetteer matched known job title: {known_title}")
+            return known_title
 
-    # Extract using LLM if regex fails.
+    # Extract using LLM if regex and gazetteer fail.
     if not job_title or len(job_title.split()) > 3:  # If title is too long or not confidently extracted, try LLM
-        llm_response = extract_title_with_llm(message)
+        with llm_admission.slot(PRIORITY_TITLE) as admitted, timed("llm_title"):
+            llm_response = extract_title_with_llm(message) if admitted else None
         print(f"LLM response for title extraction: {llm_response}")
         print(f"LLM response type: {type(llm_response)}")
         if llm_response and isinstance(llm_response, dict) and llm_response.get("status") == "True":
@@ -35,43 +329,215 @@ def handle_job_search(message: str) -> str:
             print(f"LLM extracted job title: {job_title}")
         else:
             job_title = None
+    return job_title
 
 
-    print(f"Extracted job title from user message: {job_title}")
-    if not job_title:
-        return (
-            "🤔 I couldn't identify a job title from your message.\n\n"
-            "Try something like:\n"
-            "• 'python developer'\n"
-            "• 'looking for backend engineer jobs'\n"
-            "• 'show me data analyst positions'\n\n"
-        )
+def _build_search_response(job_title, generation, jobs, next_page, recommendations,
+                           recommendations_paused=False, top_skills=None, filters=None):
+    """Format the first page of a search and cache it when it is complete"""
+    # Format and return the job response
+    with timed("formatting"):
+        next_cursor = _make_cursor(job_title, next_page, len(jobs) + 1, filters)
+        response = format_job_response(jobs, recommendations, describe_search(job_title, filters),
+                                       next_cursor=next_cursor, recommendations_paused=recommendations_paused,
+                                       top_skills=top_skills)
+    # Only cache complete responses so a failed LLM call is retried next time
+    if recommendations:
+        store_response(job_title, generation, response, filters)
+        store_recommendations(jobs[0].id, generation, recommendations)
+    return response
 
-    caching_logic() # Ensure cache is populated and fresh
-    cached_jobs = get_cached_jobs_by_title(job_title) # Could have called Db.get_by_title here
 
-    if not cached_jobs:
-        return format_no_jobs_message(job_title)
+def process_batch(messages: List[str], context_ids: List = None) -> List[str]:
+    """
+    Process a JSON-RPC batch of messages together.
+    Every message is classified as process_message would (page requests, follow-ups, pasted
+    descriptions and skill searches are answered one by one). Title searches are batched:
+    titles are extracted concurrently (once per distinct message), each distinct title is
+    searched once on a shared DB session and every title that needs recommendations is
+    covered by a single LLM call. Responses are returned in request order.
+    :param context_ids: A2A conversation id per message (None entries for none)
+    """
+    context_ids = context_ids or [None] * len(messages)
+    responses = [None] * len(messages)
+    title_searches = {}  # Message index -> (search text, filters)
+    for i, (message, context_id) in enumerate(zip(messages, context_ids)):
+        search = _classify_batch_message(message, context_id)
+        if isinstance(search, str):
+            responses[i] = search
+        elif search:
+            title_searches[i] = search
+        else:
+            responses[i] = _answer_safely(handle_job_search, message, context_id)
+    if not title_searches:
+        return responses
 
+    try:
+        with timed("freshness_check"):
+            generation = current_generation()
 
-    # Generate recommendations based on the first job
-    recommendations = None
+        # Deduplicated, concurrent title extraction (after the filter phrases are taken out)
+        unique_texts = list(dict.fromkeys(search_text for search_text, _ in title_searches.values()))
+        workers = max(1, min(Config.BATCH_MAX_WORKERS, len(unique_texts)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="batch-title") as pool:
+            titles = dict(zip(unique_texts, pool.map(_resolve_job_title_safely, unique_texts)))
+
+        # One search per distinct canonical title and filters, all on one session
+        key_by_index = {}
+        search_by_key = {}
+        for i, (search_text, filters) in title_searches.items():
+            job_title = titles[search_text]
+            if not job_title:
+                # Free text without a recognizable title may still describe jobs we hold
+                responses[i] = _answer_safely(handle_description_search, messages[i],
+                                              no_match_response=NO_TITLE_MESSAGE, generation=generation,
+                                              context_id=context_ids[i])
+                continue
+            key = make_response_key(job_title, generation, filters)
+            key_by_index[i] = key
+            search_by_key.setdefault(key, (job_title, filters))
+
+        db_storage = DBStorage()
+        responses_by_key = {}
+        results_by_key = {}  # Key -> (jobs, next page, recommendations); absent for cached responses
+        pending = []
+        for key, (job_title, filters) in search_by_key.items():
+            cached_response = get_cached_response(job_title, generation, filters)
+            record_cache_lookup("response", bool(cached_response))
+            if cached_response:
+                responses_by_key[key] = cached_response
+                continue
+            with timed("db_search"):
+                jobs, next_page = get_cached_jobs_page(job_title, db_storage=db_storage, filters=filters)
+            if not jobs:
+                if not filters:
+                    record_search_miss(job_title)
+                responses_by_key[key] = format_no_jobs_message(describe_search(job_title, filters))
+                results_by_key[key] = None
+                continue
+            pending.append((key, job_title, filters, jobs, next_page, get_top_skills(jobs)))
+
+        # A single recommendation pass for every title that still needs one
+        job_dicts = []
+        for _, job_title, _, jobs, _, top_skills in pending:
+            job_data = jobs[0].to_dict()
+            job_data['skills'] = top_skills
+            job_data['market_skills'] = get_market_skills(job_title, jobs[0].job_title, db_storage)
+            job_dicts.append(job_data)
+        recommendations_list, recommendations_paused = _batch_recommendations(job_dicts)
+        for (key, job_title, filters, jobs, next_page, top_skills), recommendations in zip(pending,
+                                                                                            recommendations_list):
+            results_by_key[key] = (jobs, next_page, recommendations)
+            responses_by_key[key] = _build_search_response(job_title, generation, jobs, next_page, recommendations,
+                                                           recommendations_paused, top_skills, filters)
+
+        for i, key in key_by_index.items():
+            responses[i] = responses_by_key[key]
+            result = results_by_key.get(key, ())
+            if context_ids[i] and result is not None:
+                job_title, filters = search_by_key[key]
+                _remember_title_search(context_ids[i], job_title, filters, generation, *result)
+    except Exception as e:
+        print(f"Error processing batch: {e}")
+        for i in title_searches:
+            if responses[i] is None:
+                responses[i] = ERROR_MESSAGE
+    return responses
+
+
+def _classify_batch_message(message, context_id):
+    """
+    The first steps of answer_message and handle_job_search for a batched message.
+    :return: The response when it is already answered (a page request or follow-up),
+             (search text, filters) for a title search, None for any other search
+    """
+    if parse_more_request(message) is not None:
+        return process_message(message, context_id)
+    follow_up = parse_follow_up(message) if context_id else None
+    if follow_up:
+        response = _answer_safely(handle_follow_up, context_id, *follow_up)
+        if response:
+            return response
+    if looks_like_job_description(message):
+        return None
+    search_text, filters = parse_search_filters(message)
+    if parse_skill_query(search_text):
+        return None
+    return search_text, filters
+
+
+def _answer_safely(handler, *args, **kwargs):
+    """Runs one message's handler inside a batch: its errors only fail that message"""
     try:
-        first_cached_job = cached_jobs[0].to_dict()
-        # jobs_formatter_test = format_job_response(cached_jobs, recommendations, job_title)
-        recommendations = generate_recommendations(first_cached_job)
+        return handler(*args, **kwargs)
     except Exception as e:
-        print(f"LLM recommendation error: {e}")
+        print(f"Error processing message: {e}")
+        return ERROR_MESSAGE
+
+
+def _resolve_job_title_safely(message):
+    """resolve_job_title for executor threads: errors become 'no title'"""
+    try:
+        return resolve_job_title(message)
+    except Exception as e:
+        print(f"Error extracting job title: {e}")
+        return None
+    finally:
+        DBStorage.remove_sessions()
 
-    # Format and return the job response
-    response = format_job_response(cached_jobs, recommendations, job_title)
-    return response
 
+def _batch_recommendations(job_dicts):
+    """
+    Recommendations for several jobs through one admitted LLM call.
+    :return: (list of recommendations or None per job, whether the call was shed)
+    """
+    if not job_dicts:
+        return [], False
+    with llm_admission.slot(PRIORITY_RECOMMENDATIONS) as admitted:
+        if not admitted:
+            print("LLM queue over budget. Returning batch without recommendations.")
+            return [None] * len(job_dicts), True
+        with timed("llm_recommendations"):
+            if len(job_dicts) == 1:
+                return [generate_recommendations(job_dicts[0])], False
+            return generate_batch_recommendations(job_dicts), False
 
 
+def handle_more_results(cursor) -> str:
+    """Serve the next page of a previous search from its continuation cursor"""
+    if not cursor or 'q' not in cursor:
+        return (
+            "📄 There is nothing more to show yet.\n\n"
+            "Search for a job title first, then reply with the 'more ...' line at the end of the results."
+        )
 
+    job_title = cursor['q']
+    filters = cursor.get('f')
+    label = describe_search(job_title, filters)
+    with timed("db_search"):
+        jobs, next_page = get_cached_jobs_page(job_title, after=cursor.get('a'), filters=filters)
+    if not jobs:
+        return f"That's all the jobs I have for '{label.title()}'."
 
+    start_index = cursor.get('n', 1)
+    with timed("formatting"):
+        next_cursor = _make_cursor(job_title, next_page, start_index + len(jobs), filters)
+        return format_job_response(jobs, None, label, start_index=start_index,
+                                   next_cursor=next_cursor, show_recommendations=False)
 
 
+def _is_page_cursor(cursor):
+    """True for cursors made by _make_cursor (decoded tokens are otherwise untrusted)"""
+    return (isinstance(cursor, dict) and isinstance(cursor.get('q'), str) and bool(cursor['q'])
+            and isinstance(cursor.get('a'), dict) and isinstance(cursor.get('n', 1), int)
+            and isinstance(cursor.get('f', {}), dict))
 
 
+def _make_cursor(job_title, next_page, next_index, filters=None):
+    """Build the continuation token for the page after this one (None on the last page)"""
+    if not next_page:
+        return None
+    cursor = {'q': job_title, 'a': next_page, 'n': next_index}
+    if filters:
+        cursor['f'] = filters
+    return encode_cursor(cursor)
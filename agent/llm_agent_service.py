@@ -2,7 +2,6 @@
 """LLM Agent Service to handle interactions with the language model"""
 from utils.prompts import Prompts
 from pprint import pprint
-from openai import OpenAI
 from config import Config
 import json
 from typing import Dict, List, Optional
@@ -14,6 +13,7 @@ def get_client():
     """Get or initialize the OpenAI client"""
     global _client
     if _client is None:
+        from openai import OpenAI  # Heavy import, deferred until the first LLM call
         _client = OpenAI(
             api_key=Config.OPENAI_API_KEY,
             base_url="https://openrouter.ai/api/v1"
@@ -43,6 +43,26 @@ def generate_recommendations(job_data: Dict) -> Optional[List[Dict]]:
         return None
 
 
+def generate_batch_recommendations(job_list: List[Dict]) -> List[Optional[List[Dict]]]:
+    """Generate recommendations for several jobs with one LLM call; one entry (or None) per job"""
+    try:
+        client = get_client()
+        prompt = Prompts.generate_batch_recommendation_prompt(job_list)
+        response = client.chat.completions.create(
+            model="openai/gpt-oss-120b",
+            messages=[
+                {"role": "system", "content": "You are an expert career advisor helping job seekers create portfolio projects that align them as top candidates for job roles."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        return parse_batch_response(response.choices[0].message.content, len(job_list))
+    except Exception as e:
+        print(f"Error generating batch recommendations: {e}")
+        return [None] * len(job_list)
+
+
 def extract_title_with_llm(user_input: str):
     """Use LLM to extract job title from user input"""
     try:
@@ -99,3 +119,24 @@ def parse_response(response_text: str) -> Optional[List[Dict]]:
         print(f"Parse error: {e}")
         return None
 
+
+def parse_batch_response(response_text: str, job_count: int) -> List[Optional[List[Dict]]]:
+    """Parse a batch recommendation response into one project list (or None) per job"""
+    results = [None] * job_count
+    try:
+        response_text = response_text.strip()
+        if response_text.startswith('```'):
+            lines = response_text.split('\n')
+            response_text = '\n'.join(lines[1:-1]).strip()
+
+        data = json.loads(response_text)
+        for entry in data.get("results", []):
+            index = entry.get("job_index")
+            projects = entry.get("projects", [])
+            if isinstance(index, int) and 0 <= index < job_count and projects:
+                results[index] = projects[:3]
+    except json.JSONDecodeError as e:
+        print(f"Error parsing batch JSON response: {e}")
+    except Exception as e:
+        print(f"Batch parse error: {e}")
+    return results
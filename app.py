@@ -1,12 +1,30 @@
 #!/usr/bin/env python
 """Flask application entry point"""
-from flask import Flask, jsonify, request
-from agent.handler import process_message
+from flask import Flask, jsonify, request, Response
+from config import Config
+from utils.metrics import timed, render_metrics
+from utils.profiling import profile_trigger, profiled, PROFILE_HEADER
 import os
+import sys
+
+# The agent (openai, bs4, sqlalchemy, ...) is imported on first use so that
+# /health and /metrics stay cheap; gunicorn.conf.py preloads it before workers fork.
 
 
 app = Flask(__name__)
 
+
+@app.teardown_appcontext
+def remove_db_sessions(exception=None):
+    """Returns the request's database connections to the pool"""
+    # Requests that never touched the database (/health, /metrics) don't load it here either
+    db_storage_module = sys.modules.get("schemas.dbStorage")
+    if db_storage_module is not None:
+        db_storage_module.DBStorage.remove_sessions()
+
+
+GREETING_TEXT = "👋 Hi! I'm JobInsightAI. Tell me what job you're looking for and I'll find listings + recommend portfolio projects!\n\nExample: 'python developer' or 'backend engineer'"
+
 def extract_message_from_telex(request_data):
     """
     Extract the actual user message from Telex's JSON-RPC format.
@@ -42,6 +60,149 @@ def extract_message_from_telex(request_data):
         print(f"Error extracting message: {e}")
         return None
 
+def wants_async_task(request_data):
+    """
+    Check whether the client asked for non-blocking (A2A task) execution.
+    Either `params.configuration.blocking: false` or `?async=true`.
+    """
+    configuration = request_data.get('params', {}).get('configuration') or {}
+    if configuration.get('blocking') is False:
+        return True
+    return request.args.get('async', '').lower() in ('1', 'true', 'yes')
+
+
+def request_context_id(request_data):
+    """The A2A conversation a message belongs to (contextId, falling back to the taskId)"""
+    params = request_data.get('params') or {}
+    message = params.get('message') or {}
+    return message.get('contextId') or params.get('contextId') or message.get('taskId')
+
+
+def submit_async_task(request_data, user_message, messageId):
+    """Queue the message as an A2A task and return the task immediately"""
+    from services.task_queue import submit_task, InvalidPushUrl
+
+    params = request_data.get('params', {})
+    configuration = params.get('configuration') or {}
+    push_config = configuration.get('pushNotificationConfig') or {}
+    context_id = request_context_id(request_data)
+
+    try:
+        task = submit_task(
+            user_message,
+            context_id=context_id,
+            message_id=messageId,
+            push_url=push_config.get('url'),
+            push_token=push_config.get('token')
+        )
+    except InvalidPushUrl as e:
+        return jsonrpc_error(request_data, -32602, str(e))
+    if task is None:
+        return jsonrpc_error(request_data, -32000, "Server busy. Please retry shortly.")
+
+    print(f"Submitted task {task.id}")
+    return jsonify({
+        "jsonrpc": "2.0",
+        "id": request_data.get('id'),
+        "result": task.to_a2a()
+    }), 200
+
+
+def get_async_task(request_data):
+    """Answer a `tasks/get` poll"""
+    return jsonify(task_status_body(request_data)), 200
+
+
+def task_status_body(request_data):
+    """Build the JSON-RPC response body for a `tasks/get` poll"""
+    from services.task_queue import get_task
+
+    task_id = request_data.get('params', {}).get('id')
+    task = get_task(task_id) if task_id else None
+    if task is None:
+        return jsonrpc_error_body(request_data, -32001, "Task not found")
+
+    return {
+        "jsonrpc": "2.0",
+        "id": request_data.get('id'),
+        "result": task.to_a2a()
+    }
+
+
+def handle_batch_request(batch):
+    """
+    Answer a JSON-RPC batch. Messages are processed together by the agent
+    (see agent.handler.process_batch) and responses keep the request order.
+    """
+    from agent.handler import process_batch
+
+    if not batch:
+        return jsonify(jsonrpc_error_body({}, -32600, "Invalid Request: empty batch")), 200
+    if len(batch) > Config.BATCH_MAX_SIZE:
+        return jsonify(jsonrpc_error_body(
+            {}, -32600, f"Invalid Request: batches are limited to {Config.BATCH_MAX_SIZE} requests"
+        )), 200
+
+    responses = [None] * len(batch)
+    messages = []
+    context_ids = []
+    message_slots = []
+    for i, item in enumerate(batch):
+        if not isinstance(item, dict):
+            responses[i] = jsonrpc_error_body({}, -32600, "Invalid Request")
+            continue
+        if item.get('method') == 'tasks/get':
+            responses[i] = task_status_body(item)
+            continue
+
+        with timed("message_extraction"):
+            user_message = extract_message_from_telex(item)
+        messageId = item.get("params", {}).get("message", {}).get("messageId", "")
+        if not user_message:
+            responses[i] = agent_message_body(item, GREETING_TEXT, messageId)
+        else:
+            messages.append(user_message)
+            context_ids.append(request_context_id(item))
+            message_slots.append((i, messageId))
+
+    print(f"Processing batch of {len(batch)} requests ({len(messages)} messages)")
+    response_texts = process_batch(messages, context_ids) if messages else []
+    for (i, messageId), response_text in zip(message_slots, response_texts):
+        responses[i] = agent_message_body(batch[i], response_text, messageId)
+    return jsonify(responses), 200
+
+
+def agent_message_body(request_data, text, messageId):
+    """Build a JSON-RPC response body carrying an agent text message"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_data.get('id'),
+        "result": {
+            "role": "agent",
+            "parts": [
+                {
+                    "kind": "text",
+                    "text": text
+                }
+            ],
+            "messageId": messageId
+        }
+    }
+
+
+def jsonrpc_error(request_data, code, message):
+    """Build a JSON-RPC error response"""
+    return jsonify(jsonrpc_error_body(request_data, code, message)), 200
+
+
+def jsonrpc_error_body(request_data, code, message):
+    """Build a JSON-RPC error response body"""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_data.get('id'),
+        "error": {"code": code, "message": message}
+    }
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -53,6 +214,27 @@ def health_check():
             "version": "1.0.0"
         }), 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics endpoint"""
+    return Response(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/cache/status', methods=['GET'])
+def cache_status():
+    """Cache generation, freshness and the progress of any refresh in progress"""
+    from services.cache_logic import get_refresh_status
+    try:
+        return jsonify(get_refresh_status()), 200
+    except Exception as e:
+        print(f"Error reading cache status: {e}")
+        return jsonify({"error": "Cache status unavailable"}), 500
+
+@app.route('/sources/status', methods=['GET'])
+def sources_status():
+    """Health score and circuit state of every job source (as seen by this process)"""
+    from adapters.adapter_logic import get_source_status
+    return jsonify(get_source_status()), 200
+
 @app.route('/a2a/jobsearchai', methods=['POST', 'GET'])
 def jobsearchai():
     """Endpoint to process to handle Telex. A2A Protocol for Telex.im"""
@@ -70,15 +252,27 @@ def jobsearchai():
     # Handle POST requests for job search
     try:
         if request.method == 'POST':
-            request_data = request.get_json(silent=True) or {}
+            request_data = request.get_json(silent=True)
+            # An empty list is still a (invalid) batch; other non-objects are treated as no JSON
+            if not isinstance(request_data, (dict, list)):
+                request_data = {}
 
             # Log for debugging
             print(f"=== INCOMING REQUEST ===")
             print(f"METHOD: {request.method}")
             print(f"Has JSON: {request_data is not None}")
 
+            # JSON-RPC batch: several requests in one array
+            if isinstance(request_data, list):
+                return handle_batch_request(request_data)
+
+            # Poll for the result of an asynchronous task
+            if request_data.get('method') == 'tasks/get':
+                return get_async_task(request_data)
+
             # Extract message from Telex format
-            user_message = extract_message_from_telex(request_data)
+            with timed("message_extraction"):
+                user_message = extract_message_from_telex(request_data)
             # print(f"Telex message: {user_message}")
             messageId = request_data.get("params", {}).get("message", {}).get("messageId", "")
 
@@ -97,7 +291,7 @@ def jobsearchai():
                         "parts": [
                             {
                                 "kind": "text",
-                                "text": "👋 Hi! I'm JobInsightAI. Tell me what job you're looking for and I'll find listings + recommend portfolio projects!\n\nExample: 'python developer' or 'backend engineer'"
+                                "text": GREETING_TEXT
                             }
 
                         ],
@@ -105,8 +299,15 @@ def jobsearchai():
                     }
                 }), 200
 
-            # Process the message
-            response_text = process_message(user_message)
+            # Asynchronous mode: accept the task now, process it in the background
+            if wants_async_task(request_data):
+                return submit_async_task(request_data, user_message, messageId)
+
+            # Process the message (profiled when asked for with the profile token, or sampled)
+            from agent.handler import process_message
+            trigger = profile_trigger(request.headers.get(PROFILE_HEADER), request.args.get('profile'))
+            with profiled(trigger, {"path": request.path, "message": user_message[:200]}) as profile_id:
+                response_text = process_message(user_message, request_context_id(request_data))
 
 
             print(f"Generated response (first 100 chars): {response_text[:100]}...")
@@ -124,13 +325,15 @@ def jobsearchai():
                     ],
                     "messageId": messageId
                 }
-            }), 200
+            }), 200, {"X-Profile-Id": profile_id} if profile_id else {}
 
     except Exception as e:
         print(f"Error in jobsearchai endpoint: {e}")
         import traceback
         traceback.print_exc()
         request_data = request.get_json(silent=True) or {}
+        if not isinstance(request_data, dict):
+            request_data = {}
         messageId = request_data.get("params", {}).get("message", {}).get("messageId", "")
 
         return jsonify({
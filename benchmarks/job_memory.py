@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+ -- job_memory.py --
+    Memory held per job representation, scaled to 10k jobs
+    1. Parsed adapter output: the per-job dicts the adapters used to build vs JobRecords
+    2. Search results: ORM CacheJobData entities plus their to_dict() copies (the old result
+       path) vs JobRecords built from tuple rows (DBStorage.get_by_title)
+    Sizes are tracemalloc bytes still allocated while the results are held.
+
+    Usage (from the repository root):
+        python -m benchmarks.job_memory [--jobs 10000] [--output out.json]
+    Runs against a throwaway SQLite database filled with synthetic jobs.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PER_JOBS = 10000
+
+
+def _synthetic_job(i):
+    """Source fields of one fake posting, as an adapter would see them"""
+    return {
+        "source": ("remotive", "remoteok", "jobicy", "arbeitnow")[i % 4],
+        "job_title": f"Senior Software Engineer {i}",
+        "company_name": f"Company {i % 500}",
+        "job_description": f"Job {i}: build and run backend services in Python and Go. " * 20,
+        "is_remote": True,
+        "location": ("Worldwide", "Europe", "USA", "Berlin, Germany")[i % 4],
+        "job_url": f"https://example.com/jobs/{i}",
+        "tags": ["python", "go", "kubernetes"],
+        "date_posted": "2026-10-01T12:00:00",
+    }
+
+
+def _held_bytes(build):
+    """Bytes still allocated after build() while its result is alive"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = build()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return held
+
+
+def _report(before, after, jobs):
+    scale = PER_JOBS / jobs
+    return {
+        "before_mib_per_10k": round(before * scale / 2 ** 20, 2),
+        "after_mib_per_10k": round(after * scale / 2 ** 20, 2),
+        "saved_pct": round(100 * (before - after) / before, 1) if before else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=PER_JOBS)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="jobsearchai-memory-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'cache.db')}"
+    sys.path.insert(0, ROOT)
+    from sqlalchemy.orm import Session
+    from models.cache_job_data import CacheJobData
+    from models.job_record import JobRecord
+    from schemas.dbStorage import DBStorage
+    from services.cache_logic import ingest_jobs
+
+    raw_jobs = [_synthetic_job(i) for i in range(args.jobs)]
+
+    def parse_dicts():
+        return [{**job, "tags": list(job["tags"])} for job in raw_jobs]
+
+    def parse_records():
+        return [JobRecord(**{**job, "tags": tuple(job["tags"])}) for job in raw_jobs]
+
+    db_storage = DBStorage()
+    ingest_jobs(db_storage, parse_records(), datetime.now(), replace=True)
+    engine = DBStorage.get_engine()
+
+    def read_entities():
+        with Session(engine) as orm_session:
+            jobs = orm_session.query(CacheJobData).filter(CacheJobData.job_title.like("%engineer%")).all()
+            return jobs, [job.to_dict() for job in jobs]
+
+    def read_records():
+        return DBStorage().get_by_title("software engineer")
+
+    results = {
+        "jobs": args.jobs,
+        "parsed": _report(_held_bytes(parse_dicts), _held_bytes(parse_records), args.jobs),
+        "search_results": _report(_held_bytes(read_entities), _held_bytes(read_records), args.jobs),
+    }
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
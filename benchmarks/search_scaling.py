@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+ -- search_scaling.py --
+    How the search path scales with the size of the cache
+    For each scale, a throwaway SQLite database is filled with synthetic jobs (benchmarks/synthetic.py), then:
+    1. ingest: ingest_jobs throughput (parse, skill extraction, bulk insert) in jobs per second
+    2. title_search: DBStorage.get_by_title on title phrases that exist in the data
+    3. page_search: DBStorage.get_page_by_title for the first page, as the handler serves it
+    4. fuzzy_fallback: get_by_title on misspelled phrases, answered by the _fuzzy_search fallback
+    5. format: format_job_response on the first page of each title search
+    6. memory: tracemalloc peak of the largest title search and the database file size
+    Latencies are per query (p50 / p95 / mean ms over --repeat runs of every query).
+
+    Usage (from the repository root):
+        python -m benchmarks.search_scaling [--scales 100,1000,10000,100000] [--queries 20] [--repeat 3]
+                                            [--seed 0] [--output out.json] [--baseline old.json]
+    With --baseline, p50 latencies more than --tolerance slower than the baseline's (and more than
+    --min-delta-ms slower) and ingest throughput more than --tolerance lower are reported as
+    regressions, and the exit status is 1.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCALES = "100,1000,10000,100000"
+LATENCY_METRICS = ("title_search", "page_search", "fuzzy_fallback", "format")
+
+
+def _latency_stats(samples):
+    """p50 / p95 / mean of per-query latencies, in milliseconds"""
+    samples = sorted(samples)
+    return {
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def _time_queries(run, queries, repeat, size_name="mean_results"):
+    """Times run(query) for every query, repeat times; returns the latency stats and the mean result size"""
+    samples, results = [], []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            result = run(query)
+            samples.append(time.perf_counter() - start)
+            results.append(len(result))
+    return {**_latency_stats(samples), size_name: round(statistics.fmean(results), 1)}
+
+
+def _peak_bytes(run):
+    """Peak bytes allocated while run() executes"""
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def bench_scale(jobs_count, queries, repeat, seed, workdir):
+    """Fills a fresh database with jobs_count synthetic jobs and measures the search path on it"""
+    from config import Config
+    from benchmarks.synthetic import generate_jobs, generate_queries
+    from schemas.dbStorage import DBStorage
+    from services.cache_logic import ingest_jobs
+    from utils.formatters import format_job_response
+
+    db_path = os.path.join(workdir, f"cache_{jobs_count}.db")
+    Config.DATABASE_URL = f"sqlite:///{db_path}"
+    db_storage = DBStorage()
+
+    jobs = generate_jobs(jobs_count, seed)
+    exact_queries, typo_queries = generate_queries(jobs, queries, seed)
+
+    start = time.perf_counter()
+    ingest_jobs(db_storage, jobs, datetime.now(), replace=True)
+    ingest_seconds = time.perf_counter() - start
+    del jobs
+    gc.collect()
+
+    def title_search(query):
+        return db_storage.get_by_title(query)
+
+    def page_search(query):
+        return db_storage.get_page_by_title(query, Config.RESULTS_PAGE_SIZE)[0]
+
+    pages = {query: page_search(query) for query in exact_queries}
+
+    def format_page(query):
+        return format_job_response(pages[query], None, query, show_recommendations=False)
+
+    largest_query = max(exact_queries, key=lambda query: len(title_search(query)))
+    result = {
+        "jobs": jobs_count,
+        "ingest": {"seconds": round(ingest_seconds, 3), "jobs_per_s": round(jobs_count / ingest_seconds, 1)},
+        "title_search": _time_queries(title_search, exact_queries, repeat),
+        "page_search": _time_queries(page_search, exact_queries, repeat),
+        "fuzzy_fallback": _time_queries(title_search, typo_queries, repeat),
+        "format": _time_queries(format_page, exact_queries, repeat, size_name="mean_chars"),
+        "memory": {
+            "largest_search_query": largest_query,
+            "largest_search_peak_mib": round(_peak_bytes(lambda: title_search(largest_query)) / 2 ** 20, 2),
+            "db_file_mib": round(os.path.getsize(db_path) / 2 ** 20, 2),
+        },
+    }
+    DBStorage.get_engine().dispose()
+    return result
+
+
+def find_regressions(results, baseline, tolerance, min_delta_ms):
+    """p50 latencies slower than the baseline's at the same scale by more than tolerance and min_delta_ms"""
+    baseline_scales = {scale["jobs"]: scale for scale in baseline.get("scales", [])}
+    regressions = []
+    for scale in results["scales"]:
+        previous = baseline_scales.get(scale["jobs"])
+        if not previous:
+            continue
+        for metric in LATENCY_METRICS:
+            if metric not in previous:
+                continue
+            now_ms, before_ms = scale[metric]["p50_ms"], previous[metric]["p50_ms"]
+            if now_ms > before_ms * (1 + tolerance) and now_ms - before_ms > min_delta_ms:
+                regressions.append({"jobs": scale["jobs"], "metric": metric,
+                                    "baseline_p50_ms": before_ms, "p50_ms": now_ms})
+        previous_rate, rate = previous["ingest"]["jobs_per_s"], scale["ingest"]["jobs_per_s"]
+        if rate < previous_rate / (1 + tolerance):
+            regressions.append({"jobs": scale["jobs"], "metric": "ingest",
+                                "baseline_jobs_per_s": previous_rate, "jobs_per_s": rate})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help="Comma-separated numbers of cached jobs")
+    parser.add_argument("--queries", type=int, default=20, help="Queries of each kind per scale")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    workdir = tempfile.mkdtemp(prefix="jobsearchai-scaling-")
+    try:
+        scales = []
+        for jobs_count in sorted(int(scale) for scale in args.scales.split(",")):
+            print(f"Benchmarking {jobs_count} jobs...", file=sys.stderr)
+            # The app logs with print; keep stdout for the JSON results
+            with contextlib.redirect_stdout(sys.stderr):
+                scales.append(bench_scale(jobs_count, args.queries, args.repeat, args.seed, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    results = {
+        "python": sys.version.split()[0],
+        "seed": args.seed,
+        "queries": args.queries,
+        "repeat": args.repeat,
+        "scales": scales,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = find_regressions(results, json.load(f), args.tolerance, args.min_delta_ms)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
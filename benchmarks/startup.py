@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+ -- startup.py --
+    Import-time and first-request benchmark
+    Every measurement runs in a fresh interpreter so module caches don't leak between runs:
+    1. `import app` time, checked against Config.IMPORT_TIME_BUDGET_MS, and which heavy modules it loaded
+    2. First GET /health
+    3. First search request without warm-up (cold) and after services.warmup.warm_up() (warm)
+
+    Usage (from the repository root):
+        python -m benchmarks.startup [--runs 5] [--message "python developer"] [--no-llm] [--output out.json]
+                                     [--snapshot snapshot.zip]
+    With --snapshot every run uses a private database loaded from the snapshot and never
+    refreshes it, so results come from a fixed dataset without network access.
+    Exits with status 1 when the median import time is over budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("openai", "bs4", "sqlalchemy", "fuzzywuzzy", "requests", "numpy")
+
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+import_ms = (time.perf_counter() - start) * 1000
+loaded = [m for m in {heavy!r} if m in sys.modules]
+
+from config import Config
+if {no_llm!r}:
+    import os
+    os.environ.pop("OPENAI_API_KEY", None)
+    Config.OPENAI_API_KEY = None
+
+warm_up_s = None
+if {warm!r}:
+    from services.warmup import warm_up
+    warm_up_s = warm_up()
+
+client = app.app.test_client()
+start = time.perf_counter()
+client.get("/health")
+health_ms = (time.perf_counter() - start) * 1000
+
+start = time.perf_counter()
+client.post("/a2a/jobsearchai", json={{"message": {message!r}}})
+request_ms = (time.perf_counter() - start) * 1000
+
+print("RESULT " + json.dumps({{
+    "import_ms": import_ms, "heavy_modules_loaded": loaded, "warm_up_s": warm_up_s,
+    "first_health_ms": health_ms, "first_request_ms": request_ms,
+}}))
+"""
+
+
+def _run_child(message, warm, no_llm):
+    """Runs one measurement in a fresh interpreter and returns its result dict"""
+    code = _CHILD.format(heavy=HEAVY_MODULES, message=message, warm=warm, no_llm=no_llm)
+    completed = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"Benchmark run failed:\n{completed.stderr[-2000:]}")
+
+
+def _median(runs, key):
+    values = [run[key] for run in runs if run[key] is not None]
+    return statistics.median(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--message", default="python developer")
+    parser.add_argument("--no-llm", action="store_true", help="Skip LLM calls (recommendations degrade to none)")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--snapshot", help="Run against this cache snapshot instead of the live cache")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        # Children inherit these: a throwaway database that is never considered stale
+        workdir = tempfile.mkdtemp(prefix="jobsearchai-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'cache.db')}"
+        os.environ["SEMANTIC_INDEX_DIR"] = os.path.join(workdir, "semantic_index")
+        os.environ["CACHE_MAX_AGE_HOURS"] = str(24 * 365 * 100)
+
+    sys.path.insert(0, ROOT)
+    from config import Config
+    if args.snapshot:
+        from services.snapshot import import_snapshot
+        import_snapshot(os.path.abspath(args.snapshot))
+
+    results = {"budget_ms": Config.IMPORT_TIME_BUDGET_MS}
+    for mode, warm in (("cold", False), ("warm", True)):
+        runs = [_run_child(args.message, warm, args.no_llm) for _ in range(args.runs)]
+        results[mode] = {
+            "import_ms": _median(runs, "import_ms"),
+            "warm_up_s": _median(runs, "warm_up_s"),
+            "first_health_ms": _median(runs, "first_health_ms"),
+            "first_request_ms": _median(runs, "first_request_ms"),
+            "heavy_modules_loaded": runs[-1]["heavy_modules_loaded"],
+        }
+
+    import_ms = results["cold"]["import_ms"]
+    results["within_budget"] = import_ms <= Config.IMPORT_TIME_BUDGET_MS
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    if not results["within_budget"]:
+        print(f"Import time {import_ms:.0f}ms is over the {Config.IMPORT_TIME_BUDGET_MS}ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
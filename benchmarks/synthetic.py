@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+"""
+ -- synthetic.py --
+    Deterministic synthetic job postings and search queries for the benchmarks
+    1. Titles combine a seniority, a specialty and a role ("Senior Backend Engineer"), drawn with a
+       skewed distribution like real boards: a few titles are very common, most are rare
+    2. Descriptions are assembled from sentence templates naming the posting's skills; their
+       lengths follow a log-normal distribution (a few hundred characters to several pages)
+    3. Queries are title phrases that exist in the data, and the same phrases with one typo in a
+       word ("backend enginer") so the title search misses and falls back to fuzzy matching
+    The same seed always yields the same jobs and queries.
+
+    Usage (from the repository root):
+        python -m benchmarks.synthetic [--jobs 1000] [--seed 0] [--output jobs.jsonl]
+"""
+import argparse
+import json
+import random
+import string
+from datetime import datetime, timedelta
+
+from models.job_record import JobRecord
+
+# Fixed so the same seed gives the same posting dates on every run
+REFERENCE_TIME = datetime(2026, 10, 1, 12, 0, 0)
+
+SENIORITIES = ("", "", "", "Senior", "Senior", "Junior", "Lead", "Staff", "Principal", "Mid-Level")
+SPECIALTIES = (
+    "Backend", "Frontend", "Full Stack", "Python", "Java", "JavaScript", "Data", "Machine Learning",
+    "DevOps", "Cloud", "Mobile", "iOS", "Android", "Platform", "Security", "QA", "Site Reliability",
+    "Golang", "Ruby on Rails", "React", "Node.js", "Embedded", "Data Platform", "Product", "UX",
+)
+ROLES = (
+    "Engineer", "Engineer", "Engineer", "Developer", "Developer", "Software Engineer", "Architect",
+    "Analyst", "Scientist", "Designer", "Manager", "Consultant", "Specialist", "Administrator",
+)
+SKILLS = (
+    "python", "django", "flask", "fastapi", "javascript", "typescript", "react", "node.js", "java", "spring",
+    "go", "rust", "ruby", "rails", "kotlin", "swift", "sql", "postgresql", "mysql", "mongodb", "redis",
+    "kafka", "docker", "kubernetes", "terraform", "aws", "gcp", "azure", "linux", "graphql", "pytorch",
+    "tensorflow", "pandas", "spark", "airflow", "ci/cd", "git", "figma",
+)
+LOCATIONS = (
+    "Worldwide", "Worldwide", "Europe", "USA", "United States", "Berlin, Germany", "London, UK",
+    "Remote - EMEA", "Canada", "Anywhere", "Latin America", "Amsterdam, Netherlands", "India", "APAC",
+)
+SOURCES = ("remotive", "remoteok", "jobicy", "arbeitnow")
+COMPANY_WORDS = (
+    "Acme", "Blue", "Cloud", "Data", "Echo", "Forge", "Green", "Harbor", "Insight", "Jet", "Kite", "Lumen",
+    "Metric", "Nova", "Orbit", "Pixel", "Quant", "River", "Stack", "Terra", "Unity", "Vector", "Wave",
+)
+COMPANY_SUFFIXES = ("Labs", "Inc", "GmbH", "Technologies", "Systems", "Software", "Health", "AI", "Group")
+SENTENCES = (
+    "You will design, build and operate services written in {skill} that serve millions of requests.",
+    "Our team relies on {skill} and {other} every day, and you will help us use them better.",
+    "Experience with {skill} in production is required; familiarity with {other} is a plus.",
+    "You will review code, mentor colleagues and improve our {skill} tooling.",
+    "We ship small changes often, with {other} pipelines and thorough automated tests.",
+    "Work closely with product and design to turn customer problems into {skill} features.",
+    "We offer a flexible schedule, a learning budget and a fully distributed team.",
+    "Help us migrate legacy systems to {skill} while keeping the platform reliable.",
+    "You care about observability, performance and clear documentation.",
+    "Previous work with {other} at scale will help you hit the ground running.",
+)
+# Characters typed by mistake next to each key, for realistic substitutions
+KEYBOARD_NEIGHBOURS = {
+    "a": "sq", "b": "vn", "c": "xv", "d": "sf", "e": "wr", "f": "dg", "g": "fh", "h": "gj", "i": "uo",
+    "j": "hk", "k": "jl", "l": "k", "m": "n", "n": "bm", "o": "ip", "p": "o", "q": "w", "r": "et",
+    "s": "ad", "t": "ry", "u": "yi", "v": "cb", "w": "qe", "x": "zc", "y": "tu", "z": "x",
+}
+
+
+def _skewed_choice(rng, options):
+    """Picks options near the front more often (roughly Zipf-like)"""
+    return options[min(int(rng.paretovariate(1.2)) - 1, len(options) - 1)]
+
+
+def _description(rng, skills):
+    """A description of log-normal length (median around 1,500 characters) naming the skills"""
+    target_length = min(max(int(rng.lognormvariate(7.3, 0.7)), 200), 12000)
+    sentences = []
+    length = 0
+    while length < target_length:
+        sentence = rng.choice(SENTENCES).format(skill=rng.choice(skills), other=rng.choice(SKILLS))
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return " ".join(sentences)
+
+
+def generate_job(rng, index, reference_time=REFERENCE_TIME):
+    """One synthetic posting as an adapter would return it (source fields only)"""
+    title = " ".join(part for part in (rng.choice(SENIORITIES), _skewed_choice(rng, SPECIALTIES),
+                                       _skewed_choice(rng, ROLES)) if part)
+    skills = rng.sample(SKILLS, rng.randint(2, 6))
+    posted_at = reference_time - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+    return JobRecord(
+        job_title=title,
+        job_description=_description(rng, skills),
+        job_url=f"https://jobs.example.com/{index}",
+        company_name=f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}",
+        location=rng.choice(LOCATIONS),
+        date_posted=posted_at.isoformat(),
+        is_remote=rng.choice((True, True, None, False)),
+        source=rng.choice(SOURCES),
+        tags=tuple(skills[:3]),
+    )
+
+
+def generate_jobs(count, seed=0, reference_time=REFERENCE_TIME):
+    """count synthetic postings; the same seed always yields the same jobs"""
+    rng = random.Random(seed)
+    return [generate_job(rng, index, reference_time) for index in range(count)]
+
+
+def add_typo(word, rng):
+    """The word with one realistic typo: a dropped, doubled, swapped or mistyped letter"""
+    position = rng.randrange(1, len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:position] + word[position + 1:]
+    if kind == 1:
+        return word[:position] + word[position] + word[position:]
+    if kind == 2 and word[position - 1] != word[position]:
+        return word[:position - 1] + word[position] + word[position - 1] + word[position + 1:]
+    # Swapping a doubled letter ("engineer") would change nothing: mistype it instead
+    letter = word[position]
+    replacement = rng.choice(KEYBOARD_NEIGHBOURS.get(letter, string.ascii_lowercase))
+    return word[:position] + replacement + word[position + 1:]
+
+
+def generate_queries(jobs, count, seed=0):
+    """
+    Search queries over the jobs' titles
+    :return: (exact queries, typo queries); an exact query matches at least one job, a typo query has
+             a misspelled word that appears in no title, so it only matches through the fuzzy fallback
+    """
+    rng = random.Random(seed)
+    titles = sorted({job.job_title.lower() for job in jobs})
+    title_words = {word for title in titles for word in title.split()}
+    exact, typos = [], []
+    attempts = 0
+    while (len(exact) < count or len(typos) < count) and attempts < count * 50:
+        attempts += 1
+        words = rng.choice(titles).split()
+        # Users often type part of a title ("backend engineer" for "senior backend engineer")
+        start = rng.randrange(len(words))
+        phrase = words[start:start + rng.randint(1, 2)]
+        if len(exact) < count:
+            exact.append(" ".join(phrase))
+        candidates = [i for i, word in enumerate(phrase) if len(word) >= 5 and word.isalpha()]
+        if len(typos) < count and candidates:
+            i = rng.choice(candidates)
+            misspelled = add_typo(phrase[i], rng)
+            if not any(misspelled in word for word in title_words):
+                typos.append(" ".join(phrase[:i] + [misspelled] + phrase[i + 1:]))
+    return exact, typos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON lines to this file instead of stdout")
+    args = parser.parse_args()
+
+    lines = (json.dumps(job.to_dict()) for job in generate_jobs(args.jobs, args.seed))
+    if args.output:
+        with open(args.output, "w") as f:
+            f.writelines(line + "\n" for line in lines)
+    else:
+        for line in lines:
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
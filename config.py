@@ -8,9 +8,87 @@ load_dotenv()
 class Config:
     """Base configuration class"""
     OPENAI_API_KEY = os.getenv("LLM_KEY")
+    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///cache_job_data.db")
 
     # API URLs
     ARBEITNOW_API_URL = "https://www.arbeitnow.com/api/job-board-api" # Last resort
     JOBICY_API_URL = "https://www.jobicy.com/api/v2/remote-jobs" # 3rd resort
     REMOTEOK_API_URL = "https://remoteok.com/api" # 2nd resort
     REMOTIVE_API_URL = "https://remotive.com/api/remote-jobs" # 1st resort
+    ADAPTER_TIMEOUT_SECONDS = float(os.getenv("ADAPTER_TIMEOUT_SECONDS", "10"))  # Per request to a job source
+
+    # Asynchronous A2A tasks
+    TASK_WORKERS = int(os.getenv("TASK_WORKERS", "16"))  # Concurrent tasks processed per process
+    TASK_QUEUE_LIMIT = int(os.getenv("TASK_QUEUE_LIMIT", "256"))  # Tasks accepted (running + waiting) per process
+    TASK_TTL_HOURS = float(os.getenv("TASK_TTL_HOURS", "24"))  # Tasks are deleted this long after their last update
+    TASK_STALE_SECONDS = int(os.getenv("TASK_STALE_SECONDS", "900"))  # Unfinished tasks idle this long failed (worker died)
+    TASK_PUSH_TIMEOUT = 10  # Seconds to wait on a client's push notification endpoint
+    TASK_PUSH_ALLOWED_HOSTS = {host.strip().lower() for host in os.getenv("TASK_PUSH_ALLOWED_HOSTS", "").split(",")
+                               if host.strip()}  # Push URL hosts accepted (empty: any public host)
+
+    # Formatted response cache
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))  # Entries kept in each process
+    RESPONSE_CACHE_SHARED = os.getenv("RESPONSE_CACHE_SHARED", "false").lower() == "true"  # Also share via the DB
+    GENERATION_CHECK_SECONDS = float(os.getenv("GENERATION_CHECK_SECONDS", "5"))  # Cache freshness checked at most this often
+
+    # Metrics
+    METRICS_DIR = os.getenv("METRICS_DIR")  # Shared directory for per-worker metrics (required with >1 worker)
+    METRICS_FLUSH_INTERVAL = 1.0  # Seconds between per-worker metric snapshots
+    METRICS_GAUGE_TTL = 60  # Gauges of workers silent for longer than this are not reported
+
+    # Startup
+    WARM_UP_ON_START = os.getenv("WARM_UP_ON_START", "true").lower() == "true"  # Prime caches before serving
+    IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "400"))  # Max time to `import app`
+
+    # Search results
+    RESULTS_PAGE_SIZE = int(os.getenv("RESULTS_PAGE_SIZE", "10"))  # Jobs listed per response
+
+    # LLM admission control
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))  # Concurrent LLM calls per process
+    LLM_QUEUE_LATENCY_BUDGET = float(os.getenv("LLM_QUEUE_LATENCY_BUDGET", "10"))  # Max seconds to wait for a slot
+
+    # JSON-RPC batches
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "20"))  # Requests accepted in one batch
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))  # Concurrent title extractions per batch
+
+    # Search-miss runner (targeted fetches for titles users searched but the cache lacked)
+    MISS_RUNNER_BATCH = int(os.getenv("MISS_RUNNER_BATCH", "10"))  # Misses handled per run
+    MISS_RUNNER_MIN_MISSES = int(os.getenv("MISS_RUNNER_MIN_MISSES", "1"))  # Misses before a title is fetched for
+    MISS_RUNNER_RETRY_HOURS = int(os.getenv("MISS_RUNNER_RETRY_HOURS", "24"))  # Wait before retrying a fruitless title
+    MISS_RUNNER_SOURCE_INTERVAL = float(os.getenv("MISS_RUNNER_SOURCE_INTERVAL", "30"))  # Min seconds between calls to one source
+    MISS_RUNNER_STATE_FILE = os.getenv("MISS_RUNNER_STATE_FILE", "miss_runner_state.json")  # Resume point between runs
+
+    # Semantic matching of pasted job descriptions
+    SEMANTIC_INDEX_DIR = os.getenv("SEMANTIC_INDEX_DIR", "semantic_index")  # Memory-mapped vector files
+    SEMANTIC_DIMENSIONS = int(os.getenv("SEMANTIC_DIMENSIONS", "2048"))  # Hashed features per job
+    SEMANTIC_MIN_SCORE = float(os.getenv("SEMANTIC_MIN_SCORE", "0.1"))  # Lowest cosine similarity returned
+    SEMANTIC_MIN_WORDS = int(os.getenv("SEMANTIC_MIN_WORDS", "30"))  # Messages this long are treated as descriptions
+
+    # Cache refresh coordination
+    CACHE_MAX_AGE_HOURS = float(os.getenv("CACHE_MAX_AGE_HOURS", "24"))  # Snapshot age that triggers a refresh
+    REFRESH_IN_WORKERS = os.getenv("REFRESH_IN_WORKERS", "true").lower() == "true"  # False: only the refresh runner refreshes
+    REFRESH_LEASE_SECONDS = int(os.getenv("REFRESH_LEASE_SECONDS", "300"))  # Lease expiry without renewal
+    REFRESH_WAIT_SECONDS = int(os.getenv("REFRESH_WAIT_SECONDS", "60"))  # Max wait for another process' first fill
+    REFRESH_RETRY_SECONDS = int(os.getenv("REFRESH_RETRY_SECONDS", "300"))  # Pause after a failed refresh
+
+    # Cache snapshots (python -m services.snapshot export/import)
+    SNAPSHOT_PATH = os.getenv("SNAPSHOT_PATH")  # Loaded into an empty cache at warm-up
+
+    # Request profiling (see utils/profiling.py)
+    PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")  # Requests carrying this token are profiled (unset: disabled)
+    PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # Share of requests profiled at random
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")  # Where profiles are written
+    PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))  # Newest profiles kept in PROFILE_DIR
+
+    # Job source health and circuit breakers (see adapters/registry.py)
+    ADAPTER_HEALTH_WINDOW = int(os.getenv("ADAPTER_HEALTH_WINDOW", "20"))  # Recent calls the health score covers
+    ADAPTER_FAILURE_THRESHOLD = int(os.getenv("ADAPTER_FAILURE_THRESHOLD", "3"))  # Consecutive failures that open a circuit
+    ADAPTER_OPEN_SECONDS = float(os.getenv("ADAPTER_OPEN_SECONDS", "600"))  # Skip time before a half-open probe
+    ADAPTER_SLOW_SECONDS = float(os.getenv("ADAPTER_SLOW_SECONDS", "5"))  # Median latency that halves the health score
+    ADAPTER_MIN_HEALTH = float(os.getenv("ADAPTER_MIN_HEALTH", "0.5"))  # Sources scoring lower are tried last
+
+    # Conversation state for follow-up messages (see services/conversation_store.py)
+    CONVERSATION_CACHE_SIZE = int(os.getenv("CONVERSATION_CACHE_SIZE", "1024"))  # Conversations kept in each process
+    CONVERSATION_TTL_SECONDS = int(os.getenv("CONVERSATION_TTL_SECONDS", "1800"))  # Idle time before a conversation is forgotten
+    CONVERSATION_SHARED = os.getenv("CONVERSATION_SHARED", "false").lower() == "true"  # Also share via the DB
+    CONVERSATION_MAX_RESULTS = int(os.getenv("CONVERSATION_MAX_RESULTS", "200"))  # Ranked result ids kept per conversation
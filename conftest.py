@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+Shared pytest fixtures: every test gets its own SQLite cache filled from canned job
+listings, with the job sources and the LLM replaced so nothing leaves the machine.
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+# Config reads the environment at import time (and .env never overrides what is set here)
+_test_dir = tempfile.mkdtemp(prefix="jobsearchai-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_test_dir, 'cache.db')}",
+    "SEMANTIC_INDEX_DIR": os.path.join(_test_dir, "semantic_index"),
+    "MISS_RUNNER_STATE_FILE": os.path.join(_test_dir, "miss_runner_state.json"),
+    "PROFILE_DIR": os.path.join(_test_dir, "profiles"),
+    "LLM_KEY": "",
+    "WARM_UP_ON_START": "false",
+})
+os.environ.pop("METRICS_DIR", None)
+
+import pytest
+
+from config import Config
+from models.job_record import JobRecord
+
+RECOMMENDATIONS = [{"title": "Job board API", "description": "A REST API over cached job postings",
+                    "technologies": ["python", "flask"], "demonstrates": "API design", "timeline": "1 week"}]
+
+
+def make_job(i, title, source="remotive", is_remote=True, days_ago=1, location="Worldwide",
+             description="Build python django services with docker and kubernetes. ", tags=("python",)):
+    """A job posting as an adapter returns it"""
+    posted = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return JobRecord(job_title=title, job_description=description * 5, job_url=f"https://jobs.example.com/{i}",
+                     company_name=f"Company {i}", location=location, date_posted=posted.isoformat(),
+                     is_remote=is_remote, source=source, tags=tuple(tags))
+
+
+SAMPLE_JOBS = [
+    make_job(1, "Python Developer", "remotive", None, 2, "Worldwide"),
+    make_job(2, "Python Developer", "arbeitnow", False, 1, "Berlin, Germany"),
+    make_job(3, "Senior Python Developer", "remoteok", True, 20, "USA"),
+    make_job(4, "Python Developer", "arbeitnow", True, 3, "Munich"),
+    make_job(5, "Python Engineer", "jobicy", None, 5, "Europe"),
+    make_job(6, "Backend Engineer", "remotive", True, 1, "Worldwide",
+             description="Design Go and Kubernetes backends with PostgreSQL. ", tags=("go", "kubernetes")),
+    make_job(7, "Mid-Level Full Stack Engineer", "remotive", True, 4, "Europe",
+             description="React and Node.js across the stack. ", tags=("react", "node.js")),
+    make_job(8, "Frontend Developer", "jobicy", True, 2, "USA",
+             description="Build React interfaces in TypeScript. ", tags=("react", "typescript")),
+]
+
+
+class FakeLLM:
+    """Counts recommendation calls and answers them with canned recommendations"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, job_data):
+        self.calls.append(job_data)
+        return RECOMMENDATIONS
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Replaces the LLM: canned recommendations, no title extraction"""
+    import agent.handler as handler
+    fake = FakeLLM()
+    monkeypatch.setattr(handler, "generate_recommendations", fake)
+    monkeypatch.setattr(handler, "generate_batch_recommendations", lambda jobs: [fake(job) for job in jobs])
+    monkeypatch.setattr(handler, "extract_title_with_llm", lambda message: None)
+    return fake
+
+
+@pytest.fixture
+def fresh_db(monkeypatch, tmp_path):
+    """An empty database and semantic index of the test's own, with the process-wide caches cleared"""
+    import services.cache_logic as cache_logic
+    import services.conversation_store as conversation_store
+    import services.response_cache as response_cache
+
+    monkeypatch.setattr(Config, "DATABASE_URL", f"sqlite:///{tmp_path / 'cache.db'}")
+    monkeypatch.setattr(Config, "SEMANTIC_INDEX_DIR", str(tmp_path / "semantic_index"))
+    monkeypatch.setattr(Config, "MISS_RUNNER_STATE_FILE", str(tmp_path / "miss_runner_state.json"))
+    monkeypatch.setattr(cache_logic, "_title_gazetteer", None)
+    monkeypatch.setattr(cache_logic, "_title_gazetteer_generation", None)
+    monkeypatch.setattr(cache_logic, "_checked_generation", None)
+    response_cache._responses.clear()
+    monkeypatch.setattr(response_cache, "_responses_generation", None)
+    conversation_store._conversations.clear()
+    yield tmp_path
+
+    from schemas.dbStorage import DBStorage
+    DBStorage.remove_sessions()
+
+
+@pytest.fixture
+def cache(fresh_db, monkeypatch, llm):
+    """A cache filled from SAMPLE_JOBS (the job sources return them on every refresh)"""
+    import services.cache_logic as cache_logic
+    monkeypatch.setattr(cache_logic, "aggregate_job_listings", lambda: list(SAMPLE_JOBS))
+    cache_logic.save_to_cache()
+    return llm
@@ -0,0 +1,21 @@
+#!/usr/bin/env python
+"""Gunicorn settings: load and warm the app once in the master, then fork workers"""
+from config import Config
+
+# Import app.py in the master so every worker shares the loaded modules
+preload_app = True
+
+
+def when_ready(server):
+    """Runs in the master before any worker is forked"""
+    if Config.WARM_UP_ON_START:
+        from services.warmup import warm_up
+        warm_up()
+
+
+def post_fork(server, worker):
+    """Workers must not reuse database connections (or metrics) from the master"""
+    from schemas.dbStorage import DBStorage
+    from utils.metrics import reset_metrics
+    DBStorage.dispose_engines()
+    reset_metrics()
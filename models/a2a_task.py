@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Database model for asynchronous A2A tasks"""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, String, Text, DateTime
+
+from models.cache_job_data import Base
+
+
+class A2ATask(Base):
+    """Defines table for A2A tasks processed outside the request cycle"""
+    __tablename__ = 'a2a_task'
+
+    # A2A task lifecycle states
+    SUBMITTED = 'submitted'
+    WORKING = 'working'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    id = Column(String(36), primary_key=True, nullable=False)
+    context_id = Column(String(255), nullable=True)
+    message_id = Column(String(255), nullable=True)
+    state = Column(String(20), nullable=False, index=True)
+    user_message = Column(Text, nullable=False)
+    result_text = Column(Text, nullable=True)
+    push_url = Column(String(1024), nullable=True)
+    push_token = Column(String(255), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(self, user_message: str, context_id: str = None, message_id: str = None,
+                 push_url: str = None, push_token: str = None):
+        """Initializes a freshly submitted task"""
+        now = datetime.now()
+        self.id = str(uuid.uuid4())
+        self.context_id = context_id or str(uuid.uuid4())
+        self.message_id = message_id
+        self.state = self.SUBMITTED
+        self.user_message = user_message
+        self.push_url = push_url
+        self.push_token = push_token
+        self.created_at = now
+        self.updated_at = now
+
+    def set_state(self, state: str, result_text: str = None):
+        """Moves the task to a new state"""
+        self.state = state
+        if result_text is not None:
+            self.result_text = result_text
+        self.updated_at = datetime.now()
+
+    def to_a2a(self):
+        """Converts the task to an A2A Task object"""
+        task = {
+            "kind": "task",
+            "id": self.id,
+            "contextId": self.context_id,
+            "status": {
+                "state": self.state,
+                "timestamp": self.updated_at.isoformat()
+            }
+        }
+        if self.result_text is not None:
+            parts = [{"kind": "text", "text": self.result_text}]
+            task["status"]["message"] = {
+                "role": "agent",
+                "parts": parts,
+                "messageId": self.message_id
+            }
+            task["artifacts"] = [{"artifactId": f"{self.id}-response", "parts": parts}]
+        return task
@@ -2,11 +2,14 @@
 """Database models design for application"""
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Enum, Index
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
+# Job boards the adapters fetch from
+JOB_SOURCES = ('remotive', 'remoteok', 'jobicy', 'arbeitnow')
+
 
 class CacheJobData(Base):
     """Defines table for caching job data"""
@@ -18,12 +21,25 @@ class CacheJobData(Base):
     job_title = Column(String(255), nullable=False, index=True)
     company_name = Column(String(255), nullable=True)
     location = Column(String(255), nullable=True)
-    date_posted = Column(String(100), nullable=True)
-    is_remote = Column(String, default='True', nullable=False)
+    date_posted = Column(String(100), nullable=True)  # As the source wrote it, for display
+    is_remote = Column(Boolean, nullable=True)  # None when the source doesn't say
+    source = Column(Enum(*JOB_SOURCES, name='job_source', native_enum=False, validate_strings=True), nullable=True)
+    # Typed copies of the source fields, for filtering (see utils/job_fields.py)
+    posted_at = Column(DateTime, nullable=True, index=True)  # UTC
+    location_normalized = Column(String(64), nullable=True)
     fetch_timestamp = Column(DateTime, default=datetime.now(), nullable=False)
 
+    # Every filter is an equality on one column plus a range on posted_at
+    __table_args__ = (
+        Index('ix_cache_job_remote_posted', 'is_remote', 'posted_at'),
+        Index('ix_cache_job_source_posted', 'source', 'posted_at'),
+        Index('ix_cache_job_location_posted', 'location_normalized', 'posted_at'),
+    )
+
     def __init__(self, job_title: str, job_description: str, job_url: str = None,
-                 company_name: str = None, location: str = None, date_posted: str = None, is_remote: bool = True):
+                 company_name: str = None, location: str = None, date_posted: str = None, is_remote: bool = None,
+                 fetch_timestamp: datetime = None, source: str = None, posted_at: datetime = None,
+                 location_normalized: str = None):
         """Initializes the CacheJobData instance"""
         self.job_url = job_url
         self.job_description = job_description
@@ -32,6 +48,11 @@ class CacheJobData(Base):
         self.location = location
         self.date_posted = date_posted
         self.is_remote = is_remote
+        self.source = source
+        self.posted_at = posted_at
+        self.location_normalized = location_normalized
+        if fetch_timestamp is not None:
+            self.fetch_timestamp = fetch_timestamp
 
     def to_dict(self):
         """Converts the CacheJobData instance to a dictionary"""
@@ -44,5 +65,8 @@ class CacheJobData(Base):
             'location': self.location,
             'date_posted': self.date_posted,
             'is_remote': self.is_remote,
+            'source': self.source,
+            'posted_at': self.posted_at.isoformat() if self.posted_at else None,
+            'location_normalized': self.location_normalized,
             'fetch_timestamp': self.fetch_timestamp.isoformat()
         }
\ No newline at end of file
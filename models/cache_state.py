@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""Database model tracking the state of the job cache snapshot"""
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from models.cache_job_data import Base
+
+
+class CacheState(Base):
+    """Single-row table holding the current cache generation and the refresh lease"""
+    __tablename__ = 'cache_state'
+
+    SINGLETON_ID = 1
+
+    # Refresh statuses
+    IDLE = 'idle'
+    FETCHING = 'fetching'
+    STORING = 'storing'
+    INDEXING = 'indexing'
+    TOPPING_UP = 'topping_up'  # A targeted fetch is adding jobs (services/miss_runner.py)
+    FAILED = 'failed'
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    generation = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=True)
+
+    # Whoever holds an unexpired lease is the only process allowed to refresh
+    refresh_owner = Column(String(255), nullable=True)
+    refresh_lease_until = Column(DateTime, nullable=True)
+    refresh_started_at = Column(DateTime, nullable=True)
+    refresh_status = Column(String(20), nullable=False, default=IDLE)
+    refresh_jobs = Column(Integer, nullable=True)  # Jobs fetched by the refresh in progress
+    refresh_error = Column(Text, nullable=True)  # Why the last refresh failed
+
+    def __init__(self, generation: int = 0, refreshed_at=None):
+        """Initializes the CacheState instance"""
+        self.id = self.SINGLETON_ID
+        self.generation = generation
+        self.refreshed_at = refreshed_at
+        self.refresh_status = self.IDLE
+
+    def to_dict(self):
+        """Converts the CacheState instance to a dictionary (the refresh status endpoint body)"""
+        def isoformat(value):
+            return value.isoformat() if value else None
+
+        return {
+            'generation': self.generation,
+            'refreshed_at': isoformat(self.refreshed_at),
+            'refresh': {
+                'status': self.refresh_status,
+                'owner': self.refresh_owner,
+                'started_at': isoformat(self.refresh_started_at),
+                'lease_until': isoformat(self.refresh_lease_until),
+                'jobs': self.refresh_jobs,
+                'error': self.refresh_error,
+            },
+        }
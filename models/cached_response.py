@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""Database model for formatted search responses shared between workers"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from models.cache_job_data import Base
+
+
+class CachedResponse(Base):
+    """Defines table for caching fully formatted search responses"""
+    __tablename__ = 'cached_response'
+
+    cache_key = Column(String(512), primary_key=True, nullable=False)
+    generation = Column(Integer, nullable=False, index=True)
+    response_text = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+    def __init__(self, cache_key: str, generation: int, response_text: str):
+        """Initializes the CachedResponse instance"""
+        self.cache_key = cache_key
+        self.generation = generation
+        self.response_text = response_text
+        self.created_at = datetime.now()
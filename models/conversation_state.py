@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+"""Database model for conversation states shared between workers"""
+from sqlalchemy import Column, String, Text, DateTime
+
+from models.cache_job_data import Base
+
+
+class ConversationState(Base):
+    """Defines table for the last result set of each A2A conversation (see services/conversation_store.py)"""
+    __tablename__ = 'conversation_state'
+
+    context_id = Column(String(255), primary_key=True, nullable=False)
+    state = Column(Text, nullable=False)  # JSON
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __init__(self, context_id: str, state: str, expires_at):
+        """Initializes the ConversationState instance"""
+        self.context_id = context_id
+        self.state = state
+        self.expires_at = expires_at
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""
+Read-only job record shared by the adapters, the ingest path, searches and the formatters.
+One slotted, frozen object per job instead of a parsed dict, an ORM entity and a to_dict() copy.
+"""
+from dataclasses import dataclass, asdict, fields, replace
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class JobRecord:
+    """
+    A job posting. Adapters fill in the source fields; ingest adds the typed fields;
+    rows read back from the cache also carry their id and fetch time.
+    """
+    job_title: Optional[str]
+    job_description: Optional[str] = None
+    job_url: Optional[str] = None
+    company_name: Optional[str] = None
+    location: Optional[str] = None
+    date_posted: Optional[str] = None  # As the source wrote it, for display
+    is_remote: Optional[bool] = None
+    source: Optional[str] = None
+    posted_at: Optional[datetime] = None  # UTC, see utils/job_fields.py
+    location_normalized: Optional[str] = None
+    fetch_timestamp: Optional[datetime] = None
+    id: Optional[int] = None
+    tags: Tuple[str, ...] = ()  # Only present before ingest (skills are indexed from them)
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a record from a row selected in JOB_COLUMNS order"""
+        return cls(*row)
+
+    def with_id(self, job_id):
+        """A copy of the record carrying its cache id"""
+        return replace(self, id=job_id)
+
+    def column_values(self):
+        """{column: value} of the stored fields, for inserts (the id is assigned by the database)"""
+        return {name: getattr(self, name) for name in JOB_COLUMNS if name != 'id'}
+
+    def to_dict(self):
+        """The record as a JSON-serializable dict (for LLM prompts)"""
+        data = asdict(self)
+        del data['tags']
+        for name in ('posted_at', 'fetch_timestamp'):
+            if data[name] is not None:
+                data[name] = data[name].isoformat()
+        return data
+
+
+# Fields stored as cache_job_data columns, in the order search rows are selected
+JOB_COLUMNS = tuple(field.name for field in fields(JobRecord) if field.name != 'tags')
@@ -0,0 +1,22 @@
+#!/usr/bin/env python
+"""Database model for the job -> skill inverted index"""
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from models.cache_job_data import Base
+
+
+class JobSkill(Base):
+    """Defines table linking cached jobs to the skills extracted from them"""
+    __tablename__ = 'job_skill'
+    __table_args__ = (
+        # skill -> jobs lookups (and intersections) never touch the jobs table
+        Index('ix_job_skill_skill_job', 'skill', 'job_id'),
+    )
+
+    job_id = Column(Integer, ForeignKey('cache_job_data.id', ondelete='CASCADE'), primary_key=True, nullable=False)
+    skill = Column(String(64), primary_key=True, nullable=False)
+
+    def __init__(self, job_id: int, skill: str):
+        """Initializes the JobSkill instance"""
+        self.job_id = job_id
+        self.skill = skill
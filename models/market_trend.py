@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""Database models for market-trend aggregates maintained at each cache refresh"""
+import json
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime
+
+from models.cache_job_data import Base
+
+
+class TitleSkillWeekly(Base):
+    """Postings per (canonical title, skill, ISO week)"""
+    __tablename__ = 'title_skill_weekly'
+
+    canonical_title = Column(String(255), primary_key=True, nullable=False)
+    week = Column(String(8), primary_key=True, nullable=False)  # e.g. '2026-W42'
+    skill = Column(String(64), primary_key=True, nullable=False)
+    postings = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, canonical_title: str, week: str, skill: str, postings: int):
+        """Initializes the TitleSkillWeekly instance"""
+        self.canonical_title = canonical_title
+        self.week = week
+        self.skill = skill
+        self.postings = postings
+
+
+class TitleWeekly(Base):
+    """Postings per (canonical title, ISO week)"""
+    __tablename__ = 'title_weekly'
+
+    canonical_title = Column(String(255), primary_key=True, nullable=False)
+    week = Column(String(8), primary_key=True, nullable=False)
+    postings = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, canonical_title: str, week: str, postings: int):
+        """Initializes the TitleWeekly instance"""
+        self.canonical_title = canonical_title
+        self.week = week
+        self.postings = postings
+
+
+class SourceWeekly(Base):
+    """Postings per (job source, ISO week)"""
+    __tablename__ = 'source_weekly'
+
+    source = Column(String(20), primary_key=True, nullable=False)
+    week = Column(String(8), primary_key=True, nullable=False)
+    postings = Column(Integer, nullable=False, default=0)
+
+    def __init__(self, source: str, week: str, postings: int):
+        """Initializes the SourceWeekly instance"""
+        self.source = source
+        self.week = week
+        self.postings = postings
+
+
+class TitleTrend(Base):
+    """Materialized per-title summary: one primary-key lookup answers 'what is in demand for X'"""
+    __tablename__ = 'title_trend'
+
+    canonical_title = Column(String(255), primary_key=True, nullable=False)
+    week = Column(String(8), nullable=False)
+    postings = Column(Integer, nullable=False, default=0)
+    postings_delta = Column(Integer, nullable=True)  # None when the previous week is unknown
+    top_skills = Column(Text, nullable=False, default='[]')  # JSON list, see skills()
+    updated_at = Column(DateTime, nullable=False)
+
+    def __init__(self, canonical_title: str, week: str, postings: int, postings_delta: int, top_skills: list):
+        """Initializes the TitleTrend instance"""
+        self.canonical_title = canonical_title
+        self.week = week
+        self.postings = postings
+        self.postings_delta = postings_delta
+        self.top_skills = json.dumps(top_skills)
+        self.updated_at = datetime.now()
+
+    def skills(self):
+        """Top skills as [{'skill', 'postings', 'share', 'delta'}], most demanded first"""
+        return json.loads(self.top_skills)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""Database model for searches the cache could not answer"""
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime
+
+from models.cache_job_data import Base
+
+
+class SearchMiss(Base):
+    """One row per normalized job title that returned no cached jobs"""
+    __tablename__ = 'search_miss'
+
+    query_key = Column(String(255), primary_key=True, nullable=False)  # normalize_for_storage(job_title)
+    job_title = Column(String(255), nullable=False)  # As the user asked for it, used for targeted searches
+    misses = Column(Integer, nullable=False, default=1, index=True)
+    last_missed_at = Column(DateTime, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)  # Targeted fetches that found nothing new
+    last_attempted_at = Column(DateTime, nullable=True)
+
+    def __init__(self, query_key: str, job_title: str):
+        """Initializes the SearchMiss instance"""
+        self.query_key = query_key
+        self.job_title = job_title
+        self.misses = 1
+        self.last_missed_at = datetime.now()
+        self.attempts = 0
+        self.last_attempted_at = None
@@ -1,11 +1,33 @@
 #!/usr/bin/env python
 """Database Storage Operations using SQLite and SQLAlchemy"""
 import re
+from datetime import datetime, timedelta
 
-from sqlalchemy import create_engine, Integer, func, cast, and_, or_, case
+from sqlalchemy import (create_engine, inspect, Integer, func, cast, and_, or_, case, update, select, insert, delete,
+                        literal, text)
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 from models.cache_job_data import Base, CacheJobData
+from models.a2a_task import A2ATask
+from models.cache_state import CacheState
+from models.cached_response import CachedResponse
+from models.conversation_state import ConversationState
+from models.job_record import JobRecord, JOB_COLUMNS
+from models.job_skill import JobSkill
+from models.search_miss import SearchMiss
+from models.market_trend import TitleSkillWeekly, TitleWeekly, SourceWeekly, TitleTrend
+from config import Config
+from utils.job_fields import expand_location
+from utils.metrics import timed
+
+# One engine per database URL and process; building it (and create_all) is the slow part
+_engines = {}
+# One thread-local session registry per engine, shared by every DBStorage of a thread
+_sessions = {}
+# Tables holding only re-fetched or recomputed job data: an outdated one is dropped and rebuilt.
+# Every other table (tasks, conversations, cache state, miss log, market trends) is migrated in place.
+REBUILDABLE_TABLES = {'cache_job_data', 'job_skill', 'cached_response'}
+
 
 class DBStorage:
     """Manages storage of SQLAlchemy database operations"""
@@ -13,12 +35,94 @@ class DBStorage:
     __session = None
 
     def __init__(self):
-        """Creates the engine and session"""
-        self.__engine = create_engine('sqlite:///cache_job_data.db', pool_pre_ping=True)
-        Base.metadata.create_all(self.__engine)
-        session_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
-        Session = scoped_session(session_factory)
-        self.__session = Session
+        """Uses this thread's session for the configured database"""
+        self.__engine = self.get_engine()
+        self.__session = _sessions[Config.DATABASE_URL]
+
+    @staticmethod
+    def get_engine(url=None):
+        """Returns this process' engine for the database, creating the tables on first use"""
+        url = url or Config.DATABASE_URL
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, pool_pre_ping=True)
+            DBStorage._migrate_tables(engine)
+            Base.metadata.create_all(engine)
+            _sessions[url] = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+            _engines[url] = engine
+        return engine
+
+    @staticmethod
+    def remove_sessions():
+        """
+        Closes this thread's sessions, returning their connections to the pool.
+        Call it when a request, task or runner job is done.
+        """
+        for session in list(_sessions.values()):
+            session.remove()
+
+    @staticmethod
+    def _migrate_tables(engine):
+        """
+        Brings existing tables up to the models before create_all: outdated REBUILDABLE_TABLES
+        (and the tables referencing them) are dropped so create_all rebuilds them, other
+        tables get their missing columns added and keep their rows.
+        """
+        inspector = inspect(engine)
+        existing = set(inspector.get_table_names())
+        outdated = set()
+        missing_columns = {}
+        for table in Base.metadata.sorted_tables:
+            if table.name in existing:
+                columns = {column['name'] for column in inspector.get_columns(table.name)}
+                missing = [column for column in table.columns if column.name not in columns]
+                if not missing:
+                    continue
+                if table.name in REBUILDABLE_TABLES:
+                    outdated.add(table)
+                else:
+                    missing_columns[table] = missing
+
+        for table, missing in missing_columns.items():
+            DBStorage._add_columns(engine, table, missing)
+        if not outdated:
+            return
+        # sorted_tables lists referenced tables before the tables that point at them
+        for table in Base.metadata.sorted_tables:
+            if any(fk.column.table in outdated for fk in table.foreign_keys):
+                if table.name not in REBUILDABLE_TABLES:
+                    raise RuntimeError(f"Table {table.name} references rebuilt table(s); migrate it by hand")
+                outdated.add(table)
+        tables = [table for table in Base.metadata.sorted_tables if table in outdated and table.name in existing]
+        print(f"Rebuilding outdated tables: {', '.join(table.name for table in tables)}")
+        Base.metadata.drop_all(engine, tables=tables)
+
+    @staticmethod
+    def _add_columns(engine, table, columns):
+        """
+        Adds columns to an existing table. Scalar defaults fill the existing rows; a required
+        column without one is added as nullable (existing rows hold NULL, new rows are complete).
+        """
+        preparer = engine.dialect.identifier_preparer
+        print(f"Adding columns to {table.name}: {', '.join(column.name for column in columns)}")
+        with engine.begin() as connection:
+            for column in columns:
+                ddl = (f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} "
+                       f"{column.type.compile(engine.dialect)}")
+                default = column.default.arg if column.default is not None and column.default.is_scalar else None
+                if default is not None:
+                    rendered = literal(default, column.type).compile(dialect=engine.dialect,
+                                                                     compile_kwargs={"literal_binds": True})
+                    ddl += f" DEFAULT {rendered}"
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+                connection.execute(text(ddl))
+
+    @staticmethod
+    def dispose_engines():
+        """Drops pooled connections inherited from a parent process (call after fork)"""
+        for engine in _engines.values():
+            engine.dispose(close=False)
 
     def save(self, obj):
         """Saves an object to the database"""
@@ -29,12 +133,421 @@ class DBStorage:
             self.__session.rollback()
             raise e
 
+    def save_jobs(self, jobs_with_skills, replace=False):
+        """
+        Saves (JobRecord, skills) pairs with their skill index entries in one transaction.
+        With replace every cached job is deleted in the same transaction, so readers see
+        either the old snapshot or the new one, never a mix or an empty cache.
+        :return: The records with the ids they were stored under, in the given order
+        """
+        table = CacheJobData.__table__
+        try:
+            if replace:
+                self.__session.query(JobSkill).delete()
+                self.__session.query(CacheJobData).delete()
+            saved = []
+            if jobs_with_skills:
+                # One bulk insert; no ORM entity is built per job
+                job_ids = self.__session.scalars(
+                    insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                    [job.column_values() for job, _ in jobs_with_skills]
+                ).all()
+                saved = [job.with_id(job_id) for (job, _), job_id in zip(jobs_with_skills, job_ids)]
+                skill_rows = [{'job_id': job.id, 'skill': skill}
+                              for job, (_, skills) in zip(saved, jobs_with_skills) for skill in skills]
+                if skill_rows:
+                    self.__session.execute(insert(JobSkill.__table__), skill_rows)
+            self.__session.commit()
+            return saved
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_by_skills(self, skills, job_title=None, limit=None, remote=None, posted_after=None, source=None,
+                      location=None):
+        """
+        Retrieves jobs requiring every one of the given skills.
+        The skill index is intersected first; the title (if any) only filters that small set.
+        The remaining parameters are the structured filters of get_by_title.
+        """
+        skills = list(dict.fromkeys(skills))
+        if not skills:
+            return []
+        matching_ids = (
+            self.__session.query(JobSkill.job_id)
+            .filter(JobSkill.skill.in_(skills))
+            .group_by(JobSkill.job_id)
+            .having(func.count(JobSkill.skill) == len(skills))
+        )
+        query = self.__session.query(*self._record_columns()).filter(
+            CacheJobData.id.in_(matching_ids),
+            *self._filter_conditions(remote, posted_after, source, location)
+        )
+
+        normalized_title = self.normalize_for_storage(job_title) if job_title else None
+        if normalized_title:
+            search_terms = normalized_title.split()
+            base_filter, relevance_score = self._build_title_search(normalized_title, search_terms)
+            query = query.filter(base_filter).order_by(*self._title_search_order(relevance_score))
+        else:
+            query = query.order_by(CacheJobData.id)
+        if limit:
+            query = query.limit(limit)
+        return [JobRecord.from_row(row) for row in query]
+
+    def get_skills_for_jobs(self, job_ids):
+        """Returns {job id: [skills]} for the given jobs"""
+        skills_by_job = {job_id: [] for job_id in job_ids}
+        if not job_ids:
+            return skills_by_job
+        rows = (
+            self.__session.query(JobSkill.job_id, JobSkill.skill)
+            .filter(JobSkill.job_id.in_(list(job_ids)))
+            .all()
+        )
+        for job_id, skill in rows:
+            skills_by_job[job_id].append(skill)
+        return skills_by_job
+
+    def export_rows(self, model):
+        """Every row of a model's table as {column: value} dicts, in primary-key order"""
+        table = model.__table__
+        query = select(table).order_by(*table.primary_key.columns)
+        return [dict(row._mapping) for row in self.__session.execute(query)]
+
+    def load_rows(self, rows_by_model, refreshed_at=None):
+        """
+        Replaces the rows of the given tables in one transaction (bulk inserts, ids kept)
+        and starts a new cache generation
+        :param rows_by_model: [(model, [{column: value}])] with referenced tables first
+        :return: The new generation id
+        """
+        self.get_cache_state()
+        try:
+            for model, _ in reversed(rows_by_model):
+                self.__session.execute(delete(model.__table__))
+            for model, rows in rows_by_model:
+                if rows:
+                    self.__session.execute(insert(model.__table__), rows)
+            self.__session.execute(
+                update(CacheState)
+                .where(CacheState.id == CacheState.SINGLETON_ID)
+                .values(generation=CacheState.generation + 1, refreshed_at=refreshed_at)
+            )
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+        return self.get_cache_state().generation
+
+    def get_by_ids(self, job_ids):
+        """Retrieves JobRecords by id, in the order of the given ids (missing ids are skipped)"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+        rows = self.__session.query(*self._record_columns()).filter(CacheJobData.id.in_(job_ids))
+        jobs = {job.id: job for job in map(JobRecord.from_row, rows)}
+        return [jobs[job_id] for job_id in job_ids if job_id in jobs]
+
+    def get_search_documents(self):
+        """Returns (id, job_title, job_description) of every cached job, for the semantic index"""
+        return (
+            self.__session.query(CacheJobData.id, CacheJobData.job_title, CacheJobData.job_description)
+            .order_by(CacheJobData.id)
+            .all()
+        )
+
+    def get_task(self, task_id):
+        """Retrieves an A2ATask by its id"""
+        return self.__session.get(A2ATask, task_id, populate_existing=True)
+
+    def delete_tasks_before(self, updated_before):
+        """Deletes the A2ATasks last updated before a time; returns how many"""
+        try:
+            deleted = self.__session.query(A2ATask).filter(A2ATask.updated_at < updated_before).delete()
+            self.__session.commit()
+            return deleted
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_cache_state(self):
+        """Retrieves the CacheState row, creating it on first use"""
+        state = self.__session.get(CacheState, CacheState.SINGLETON_ID, populate_existing=True)
+        if state is None:
+            state = CacheState()
+            try:
+                self.save(state)
+            except Exception:
+                # Another worker created it first
+                state = self.__session.get(CacheState, CacheState.SINGLETON_ID, populate_existing=True)
+        return state
+
+    def bump_generation(self, refreshed_at=None):
+        """Starts a new cache generation and returns its id (refreshed_at is kept unless given)"""
+        self.get_cache_state()
+        values = {'generation': CacheState.generation + 1}
+        if refreshed_at is not None:
+            values['refreshed_at'] = refreshed_at
+        try:
+            self.__session.execute(
+                update(CacheState)
+                .where(CacheState.id == CacheState.SINGLETON_ID)
+                .values(**values)
+            )
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+        return self.get_cache_state().generation
+
+    def get_title_trend(self, canonical_title):
+        """Retrieves the market trend of a canonical title (a primary-key lookup)"""
+        if not canonical_title:
+            return None
+        return self.__session.get(TitleTrend, canonical_title)
+
+    def get_title_week_counts(self, week, titles):
+        """Returns ({title: postings}, {(title, skill): postings}) for the given titles in an ISO week"""
+        titles = list(titles)
+        if not titles:
+            return {}, {}
+        title_rows = (
+            self.__session.query(TitleWeekly.canonical_title, TitleWeekly.postings)
+            .filter(TitleWeekly.week == week, TitleWeekly.canonical_title.in_(titles))
+            .all()
+        )
+        skill_rows = (
+            self.__session.query(TitleSkillWeekly.canonical_title, TitleSkillWeekly.skill,
+                                 TitleSkillWeekly.postings)
+            .filter(TitleSkillWeekly.week == week, TitleSkillWeekly.canonical_title.in_(titles))
+            .all()
+        )
+        return dict(title_rows), {(title, skill): postings for title, skill, postings in skill_rows}
+
+    def get_source_week_counts(self, week, sources):
+        """Returns {source: postings} for the given sources in an ISO week"""
+        sources = list(sources)
+        if not sources:
+            return {}
+        rows = (
+            self.__session.query(SourceWeekly.source, SourceWeekly.postings)
+            .filter(SourceWeekly.week == week, SourceWeekly.source.in_(sources))
+            .all()
+        )
+        return dict(rows)
+
+    def save_market_trends(self, week, title_counts, title_skill_counts, source_counts, trends, replace=True):
+        """
+        Writes one week's aggregates and the rebuilt per-title trends in a single transaction.
+        With replace the week's rows (and every trend) are swapped for the given ones,
+        otherwise the given rows are upserted.
+        """
+        try:
+            if replace:
+                for model in (TitleSkillWeekly, TitleWeekly, SourceWeekly):
+                    self.__session.query(model).filter(model.week == week).delete()
+                self.__session.query(TitleTrend).delete()
+            rows = [TitleWeekly(title, week, postings) for title, postings in title_counts.items()]
+            rows += [TitleSkillWeekly(title, week, skill, postings)
+                     for (title, skill), postings in title_skill_counts.items()]
+            rows += [SourceWeekly(source, week, postings) for source, postings in source_counts.items()]
+            rows += trends
+            if replace:
+                self.__session.add_all(rows)
+            else:
+                for row in rows:
+                    self.__session.merge(row)
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def record_search_miss(self, job_title):
+        """Counts a search that returned no cached jobs"""
+        query_key = self.normalize_for_storage(job_title)
+        if not query_key:
+            return
+        try:
+            updated = self.__session.execute(
+                update(SearchMiss)
+                .where(SearchMiss.query_key == query_key)
+                .values(misses=SearchMiss.misses + 1, last_missed_at=datetime.now())
+            ).rowcount
+            if not updated:
+                self.__session.add(SearchMiss(query_key, job_title))
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_top_misses(self, limit, min_misses=1, attempted_before=None):
+        """Most frequent misses not attempted since attempted_before, most missed first"""
+        query = self.__session.query(SearchMiss).filter(SearchMiss.misses >= min_misses)
+        if attempted_before is not None:
+            query = query.filter(or_(SearchMiss.last_attempted_at.is_(None),
+                                     SearchMiss.last_attempted_at < attempted_before))
+        return query.order_by(SearchMiss.misses.desc(), SearchMiss.query_key).limit(limit).all()
+
+    def resolve_search_miss(self, query_key, found):
+        """Records a targeted fetch: the miss is dropped once it found jobs, otherwise retried later"""
+        try:
+            miss = self.__session.get(SearchMiss, query_key)
+            if miss is not None:
+                if found:
+                    self.__session.delete(miss)
+                else:
+                    miss.attempts += 1
+                    miss.last_attempted_at = datetime.now()
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_cached_urls(self, job_urls):
+        """Returns the subset of the given job URLs that are already cached"""
+        job_urls = [url for url in job_urls if url]
+        if not job_urls:
+            return set()
+        rows = self.__session.query(CacheJobData.job_url).filter(CacheJobData.job_url.in_(job_urls)).all()
+        return {job_url for job_url, in rows}
+
+    def acquire_refresh_lease(self, owner, lease_seconds, status=CacheState.FETCHING):
+        """
+        Takes the refresh lease when nobody holds an unexpired one (a single conditional UPDATE,
+        so exactly one process wins)
+        :param status: What the owner is doing (published on the status endpoint)
+        :return: True when the caller now owns the lease
+        """
+        self.get_cache_state()
+        now = datetime.now()
+        try:
+            acquired = self.__session.execute(
+                update(CacheState)
+                .where(CacheState.id == CacheState.SINGLETON_ID,
+                       or_(CacheState.refresh_lease_until.is_(None), CacheState.refresh_lease_until < now))
+                .values(refresh_owner=owner, refresh_lease_until=now + timedelta(seconds=lease_seconds),
+                        refresh_started_at=now, refresh_status=status, refresh_jobs=None)
+            ).rowcount == 1
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+        return acquired
+
+    def renew_refresh_lease(self, owner, lease_seconds, status, jobs=None):
+        """
+        Extends the lease and publishes refresh progress
+        :return: False when the lease was lost (expired and taken over)
+        """
+        values = {'refresh_lease_until': datetime.now() + timedelta(seconds=lease_seconds), 'refresh_status': status}
+        if jobs is not None:
+            values['refresh_jobs'] = jobs
+        try:
+            renewed = self.__session.execute(
+                update(CacheState)
+                .where(CacheState.id == CacheState.SINGLETON_ID, CacheState.refresh_owner == owner)
+                .values(**values)
+            ).rowcount == 1
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+        return renewed
+
+    def release_refresh_lease(self, owner, error=None):
+        """Gives the lease back, recording whether the refresh failed"""
+        try:
+            self.__session.execute(
+                update(CacheState)
+                .where(CacheState.id == CacheState.SINGLETON_ID, CacheState.refresh_owner == owner)
+                .values(refresh_owner=None, refresh_lease_until=None,
+                        refresh_status=CacheState.FAILED if error else CacheState.IDLE,
+                        refresh_error=str(error)[:2000] if error else None)
+            )
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_cached_response(self, cache_key, generation):
+        """Retrieves a shared formatted response for the given generation"""
+        cached = self.__session.get(CachedResponse, cache_key)
+        if cached is None or cached.generation != generation:
+            return None
+        return cached.response_text
+
+    def save_cached_response(self, cache_key, generation, response_text):
+        """Stores (or replaces) a shared formatted response"""
+        try:
+            self.__session.merge(CachedResponse(cache_key, generation, response_text))
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def delete_cached_responses(self, before_generation):
+        """Deletes shared responses built from older cache generations"""
+        try:
+            num_rows_deleted = (
+                self.__session.query(CachedResponse)
+                .filter(CachedResponse.generation < before_generation)
+                .delete()
+            )
+            self.__session.commit()
+            return num_rows_deleted
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_conversation(self, context_id):
+        """Retrieves the JSON state of an unexpired conversation, or None"""
+        conversation = self.__session.get(ConversationState, context_id, populate_existing=True)
+        if conversation is None or conversation.expires_at < datetime.now():
+            return None
+        return conversation.state
+
+    def save_conversation(self, context_id, state, expires_at):
+        """Stores (or replaces) a conversation's JSON state and drops expired conversations"""
+        try:
+            self.__session.merge(ConversationState(context_id, state, expires_at))
+            self.__session.query(ConversationState).filter(ConversationState.expires_at < datetime.now()).delete()
+            self.__session.commit()
+        except Exception as e:
+            self.__session.rollback()
+            raise e
+
+    def get_ranked_ids_by_title(self, job_title, limit, remote=None, posted_after=None, source=None, location=None):
+        """Ids of the first `limit` get_by_title results (same ranking and filters), without loading the jobs"""
+        normalized_title = self.normalize_for_storage(job_title)
+        if not normalized_title:
+            return []
+        search_terms = normalized_title.split()
+        conditions = self._filter_conditions(remote, posted_after, source, location)
+        base_filter, relevance_score = self._build_title_search(normalized_title, search_terms)
+        rows = (
+            self.__session.query(CacheJobData.id)
+            .filter(base_filter, *conditions)
+            .order_by(*self._title_search_order(relevance_score))
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            return [job_id for job_id, in rows]
+        return [job_id for job_id, _ in self._fuzzy_scored(normalized_title, conditions)[:limit]]
+
     def exists(self, job_title):
         """Checks if a CacheJobData with the given job title exists"""
         return self.__session.query(CacheJobData).filter_by(job_title=job_title).first()
 
-    def get_by_title(self, job_title):
-        """Retrieves a CacheJobData by its job title"""
+    def get_by_title(self, job_title, remote=None, posted_after=None, source=None, location=None):
+        """
+        Retrieves the JobRecords matching a job title, best match first
+        :param remote: Only remote (True) or only on-site (False) jobs
+        :param posted_after: Only jobs posted at or after this naive UTC datetime
+        :param source: Only jobs from this job board (see JOB_SOURCES)
+        :param location: Only jobs in this canonical region (see utils/job_fields.py)
+        """
         """
         1. Normalize the text
         2. Partial Matching
@@ -56,6 +569,98 @@ class DBStorage:
 
         # Split into individual words
         search_terms = normalized_title.split()
+        conditions = self._filter_conditions(remote, posted_after, source, location)
+        base_filter, relevance_score = self._build_title_search(normalized_title, search_terms)
+        results = [
+            JobRecord.from_row(row) for row in
+            self.__session.query(*self._record_columns())
+            .filter(base_filter, *conditions)
+            .order_by(*self._title_search_order(relevance_score))
+        ]
+
+        # TODO: Add fuzzy matching logic here (e.g., using Levenshtein distance or similar)
+        if not results:
+            with timed("fuzzy_fallback"):
+                results = self._fuzzy_search(normalized_title, search_terms, conditions)
+        return results
+
+    def get_page_by_title(self, job_title, page_size, after=None, remote=None, posted_after=None, source=None,
+                          location=None):
+        """
+        Retrieves one page of get_by_title results (with the same filters) using keyset pagination.
+        :param after: Position returned with the previous page (None for the first page)
+        :return: (jobs, position after the last job or None when there are no more)
+        """
+        normalized_title = self.normalize_for_storage(job_title)
+        if not normalized_title:
+            return [], None
+
+        search_terms = normalized_title.split()
+        conditions = self._filter_conditions(remote, posted_after, source, location)
+        mode, key = (after or {}).get('mode', 'sql'), (after or {}).get('key')
+
+        if mode == 'sql':
+            base_filter, relevance_score = self._build_title_search(normalized_title, search_terms)
+            title_length = func.length(CacheJobData.job_title)
+            query = (
+                self.__session.query(*self._record_columns(), relevance_score, title_length)
+                .filter(base_filter, *conditions)
+            )
+            if key:
+                # Rows strictly after (score desc, length asc, title asc, id asc) of the last row served
+                score, length, title, job_id = key
+                query = query.filter(or_(
+                    relevance_score < score,
+                    and_(relevance_score == score, or_(
+                        title_length > length,
+                        and_(title_length == length, or_(
+                            CacheJobData.job_title > title,
+                            and_(CacheJobData.job_title == title, CacheJobData.id > job_id)
+                        ))
+                    ))
+                ))
+            rows = query.order_by(*self._title_search_order(relevance_score)).limit(page_size + 1).all()
+            if rows or key:
+                jobs = [JobRecord.from_row(row[:-2]) for row in rows[:page_size]]
+                if len(rows) <= page_size:
+                    return jobs, None
+                last_job, (last_score, last_length) = jobs[-1], rows[page_size - 1][-2:]
+                return jobs, {'mode': 'sql', 'key': [last_score, last_length, last_job.job_title, last_job.id]}
+
+        # Nothing matched the LIKE search: page through the fuzzy fallback instead
+        with timed("fuzzy_fallback"):
+            scored_jobs = self._fuzzy_scored(normalized_title, conditions)
+        if mode == 'fuzzy' and key:
+            similarity, last_id = key
+            scored_jobs = [(job_id, score) for job_id, score in scored_jobs
+                           if (-score, job_id) > (-similarity, last_id)]
+        jobs = self.get_by_ids([job_id for job_id, _ in scored_jobs[:page_size]])
+        if len(scored_jobs) <= page_size:
+            return jobs, None
+        last_id, last_score = scored_jobs[page_size - 1]
+        return jobs, {'mode': 'fuzzy', 'key': [last_score, last_id]}
+
+    @staticmethod
+    def _record_columns():
+        """The cache_job_data columns of a JobRecord, in JobRecord.from_row order"""
+        return [getattr(CacheJobData, name) for name in JOB_COLUMNS]
+
+    @staticmethod
+    def _filter_conditions(remote=None, posted_after=None, source=None, location=None):
+        """WHERE conditions for the structured filters (served by the composite indexes)"""
+        conditions = []
+        if remote is not None:
+            conditions.append(CacheJobData.is_remote == remote)
+        if source:
+            conditions.append(CacheJobData.source == source)
+        if location:
+            conditions.append(CacheJobData.location_normalized.in_(sorted(expand_location(location))))
+        if posted_after is not None:
+            conditions.append(CacheJobData.posted_at >= posted_after)
+        return conditions
+
+    def _build_title_search(self, normalized_title, search_terms):
+        """Builds the WHERE clause and relevance score used by the title searches"""
         if len(search_terms) > 1:
             word_conditions = [
                 func.lower(CacheJobData.job_title).like(f'%{term}%')
@@ -79,43 +684,33 @@ class DBStorage:
             # Otherwise = 0 (won't match WHERE clause anyway)
             else_=0
         )
-        results = (
-            self.__session.query(CacheJobData)
-            .filter(base_filter)
-            .order_by(
-                relevance_score.desc(),
-                func.length(CacheJobData.job_title),  # Shorter titles rank higher
-                CacheJobData.job_title  # Alphabetical order as tiebreaker
-            ).all()
-        )
-
-        # TODO: Add fuzzy matching logic here (e.g., using Levenshtein distance or similar)
-        if not results:
-            results = self._fuzzy_search(normalized_title, search_terms)
-        return results
-
+        return base_filter, relevance_score
 
-
-
-    def delete_all(self):
-        """Deletes all records from the CacheJobData table"""
-        try:
-            num_rows_deleted = self.__session.query(CacheJobData).delete()
-            self.__session.commit()
-            return num_rows_deleted
-        except Exception as e:
-            self.__session.rollback()
-            raise e
+    @staticmethod
+    def _title_search_order(relevance_score):
+        """Ranking of title search results; the id makes it a total order for pagination"""
+        return (
+            relevance_score.desc(),
+            func.length(CacheJobData.job_title),  # Shorter titles rank higher
+            CacheJobData.job_title,  # Alphabetical order as tiebreaker
+            CacheJobData.id
+        )
 
     def check_for_data(self):
         """Checks if there is any data in the CacheJobData table"""
-        return self.__session.query(CacheJobData).first() is not None
+        return self.__session.query(CacheJobData.id).first() is not None
+
+    def get_title_counts(self):
+        """Returns (job_title, number of postings) pairs for every cached title"""
+        return (
+            self.__session.query(CacheJobData.job_title, func.count(CacheJobData.id))
+            .group_by(CacheJobData.job_title)
+            .all()
+        )
 
     def fetch_last_refreshed(self):
         """Fetches the timestamp of one of the entries"""
-        last_refreshed = self.__session.query(CacheJobData).order_by(CacheJobData.fetch_timestamp.desc()).first()
-        fetch_last_timestamp = last_refreshed.fetch_timestamp if last_refreshed else None
-        return fetch_last_timestamp
+        return self.__session.query(func.max(CacheJobData.fetch_timestamp)).scalar()
 
     # @staticmethod
     def _build_word_order_conditions(self, search_terms, score):
@@ -128,28 +723,34 @@ class DBStorage:
         pattern = f'%{pattern}%'
         return [(func.lower(CacheJobData.job_title).like(pattern), score)]
 
-    def _fuzzy_search(self, normalized_title, search_terms):
+    def _fuzzy_search(self, normalized_title, search_terms, conditions=()):
         """Fallback fuzzy search when exact matching fails"""
+        # Return just the jobs (without scores)
+        return self.get_by_ids([job_id for job_id, score in self._fuzzy_scored(normalized_title, conditions)])
+
+    def _fuzzy_scored(self, normalized_title, conditions=()):
+        """
+        Scores every cached job passing the conditions against the title; returns (job id, similarity) best first.
+        Only (id, title) pairs are loaded; callers fetch the records they actually serve.
+        """
         from fuzzywuzzy import fuzz
-        all_jobs = self.__session.query(CacheJobData).all()
+        all_titles = self.__session.query(CacheJobData.id, CacheJobData.job_title).filter(*conditions)
 
         # Calculate fuzzy score for each job
         scored_jobs = []
-        for job in all_jobs:
-            job_title_lower = job.job_title.lower()
+        for job_id, job_title in all_titles:
+            job_title_lower = job_title.lower()
 
             # Calculate similarity score (0-100)
             similarity = fuzz.partial_ratio(normalized_title, job_title_lower)
 
             # Only include if similarity is above threshold (e.g., 70)
             if similarity >= 70:
-                scored_jobs.append((job, similarity))
-
-        # Sort by similarity score (highest first
-        scored_jobs.sort(key=lambda x: x[1], reverse=True)
+                scored_jobs.append((job_id, similarity))
 
-        # Return just the job objects (without scores)
-        return  [job for job, score in scored_jobs]
+        # Sort by similarity score (highest first), id keeps the order stable between pages
+        scored_jobs.sort(key=lambda x: (-x[1], x[0]))
+        return scored_jobs
 
 
 
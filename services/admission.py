@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""
+ -- admission.py --
+    Admission control for LLM-bound work
+    1. At most LLM_MAX_CONCURRENCY LLM calls run at once in a process
+    2. Callers waiting for a slot are served by priority (title extraction before
+       recommendations), first come first served within a priority
+    3. When the expected wait exceeds LLM_QUEUE_LATENCY_BUDGET the call is shed and the
+       caller degrades (e.g. jobs are returned without recommendations)
+    Cache-served responses never reach this queue, so they are never held up by it.
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+from utils.metrics import inc_counter, set_gauge
+
+# Lower value = served first
+PRIORITY_TITLE = 0
+PRIORITY_RECOMMENDATIONS = 1
+
+
+class AdmissionController:
+    """Caps concurrent LLM calls and hands free slots to waiting callers by priority"""
+
+    def __init__(self, max_concurrent: int, latency_budget: float, initial_call_seconds: float = 5.0):
+        self.max_concurrent = max_concurrent
+        self.latency_budget = latency_budget
+        self._condition = threading.Condition()
+        self._active = 0
+        self._waiting = []  # Heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._avg_call_seconds = initial_call_seconds
+
+    @property
+    def queue_depth(self):
+        return len(self._waiting)
+
+    def _estimated_wait(self, ahead: int) -> float:
+        """Expected seconds until a slot frees up for a caller with `ahead` callers in front"""
+        if self._active < self.max_concurrent and ahead == 0:
+            return 0.0
+        rounds = (ahead // self.max_concurrent) + 1
+        return rounds * self._avg_call_seconds
+
+    def _report(self):
+        set_gauge("jobsearchai_llm_queue_depth", len(self._waiting))
+        set_gauge("jobsearchai_llm_active_calls", self._active)
+
+    def acquire(self, priority: int) -> bool:
+        """Waits for an LLM slot; returns False when the call should be shed instead"""
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            ahead = sum(1 for waiting in self._waiting if waiting < entry)
+            if self._estimated_wait(ahead) > self.latency_budget:
+                inc_counter("jobsearchai_llm_admissions_total", priority=str(priority), outcome="shed")
+                return False
+
+            heapq.heappush(self._waiting, entry)
+            self._report()
+            deadline = time.monotonic() + self.latency_budget
+            while not (self._waiting[0] == entry and self._active < self.max_concurrent):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._report()
+                    self._condition.notify_all()
+                    inc_counter("jobsearchai_llm_admissions_total", priority=str(priority), outcome="timeout")
+                    return False
+                self._condition.wait(remaining)
+
+            heapq.heappop(self._waiting)
+            self._active += 1
+            self._report()
+            # The next waiter may also fit if more than one slot is free
+            self._condition.notify_all()
+            inc_counter("jobsearchai_llm_admissions_total", priority=str(priority), outcome="admitted")
+            return True
+
+    def release(self, call_seconds: float):
+        """Frees a slot and updates the moving average call duration"""
+        with self._condition:
+            self._active -= 1
+            self._avg_call_seconds = 0.8 * self._avg_call_seconds + 0.2 * call_seconds
+            self._report()
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int):
+        """Context manager yielding True when admitted, False when the work should degrade"""
+        if not self.acquire(priority):
+            yield False
+            return
+        start = time.monotonic()
+        try:
+            yield True
+        finally:
+            self.release(time.monotonic() - start)
+
+
+llm_admission = AdmissionController(Config.LLM_MAX_CONCURRENCY, Config.LLM_QUEUE_LATENCY_BUDGET)
@@ -5,60 +5,352 @@
     1. Check if there is data in the cache
     2. If not, fetch from external APIs and store in cache
     3. If there is data, check if it's stale
-    4. If stale, refresh the cache
+    4. If stale, refresh the cache (one process at a time, see refresh_cache)
     5. If not stale, return the cached data by the value demanded
 """
-
+import os
+import socket
+import time
+import uuid
+from dataclasses import replace as replace_fields
 from datetime import datetime, timedelta, timezone
 
 from adapters.adapter_logic import aggregate_job_listings
+from config import Config
 from schemas.dbStorage import DBStorage
-from models.cache_job_data import CacheJobData
+from models.cache_state import CacheState
+from services.response_cache import invalidate_responses
+from services.market_trends import canonical_title, update_market_trends
+from services.semantic_search import build_semantic_index, append_to_semantic_index, search_similar
+from utils.gazetteer import TitleGazetteer
+from utils.skills import extract_job_skills
+from utils.job_fields import parse_remote, parse_posted_at, normalize_location, expand_location
+from utils.metrics import inc_counter, timed_metric
+
+# Known-title gazetteer, rebuilt whenever the cache generation changes
+_title_gazetteer = None
+_title_gazetteer_generation = None
+# (generation, time.monotonic() of the check) from the last caching_logic() in this process
+_checked_generation = None
+
+def save_to_cache(progress=None):
+    """
+    Fetches every source and swaps the jobs in as a new cache generation
+    :param progress: Called as progress(status, jobs=None) between stages (see refresh_cache)
+    """
+    with timed_metric("jobsearchai_cache_refresh_duration_seconds"):
+        return _save_to_cache(progress or (lambda status, jobs=None: None))
 
-def save_to_cache():
-    """Saves new job data to the cache"""
+
+def _save_to_cache(progress):
+    """Fetches every source and stores the jobs (see save_to_cache)"""
     db_storage = DBStorage()
+    refreshed_at = datetime.now()
     new_jobs = aggregate_job_listings()
-    for job in new_jobs:
-        job_title = db_storage.normalize_for_storage(job.get('job_title'))
-        job_entry = CacheJobData(
-            job_title=job_title,
-            job_description=job.get('job_description'),
-            job_url=job.get('job_url'),
-            company_name=job.get('company_name'),
-            location=job.get('location'),
-            date_posted=job.get('date_posted'),
-            is_remote=job.get('is_remote', True)
+    if not new_jobs:
+        # Keep serving the current snapshot rather than swapping in an empty one
+        raise RuntimeError("No jobs fetched from any source")
+
+    progress(CacheState.STORING, len(new_jobs))
+    ingested = ingest_jobs(db_storage, new_jobs, refreshed_at, replace=True)
+    generation = db_storage.bump_generation(refreshed_at)
+    forget_checked_generation()
+    invalidate_responses(generation, db_storage)
+
+    progress(CacheState.INDEXING)
+    _update_derived_data(db_storage, ingested, refreshed_at, replace=True)
+    return generation
+
+
+def ingest_jobs(db_storage, jobs, fetched_at, replace=False):
+    """
+    Stores parsed JobRecords with their skill index entries in one transaction
+    :param replace: the jobs replace every cached job (atomically)
+    :return: (stored JobRecord, canonical title, skills) of each job
+    """
+    ingested = []
+    for job in jobs:
+        # Ingest stage: index the posting's skills from its tags and description
+        skills = extract_job_skills(job.tags, job.job_description)
+        job_entry = replace_fields(
+            job,
+            job_title=db_storage.normalize_for_storage(job.job_title),
+            is_remote=parse_remote(job.is_remote, job.source),
+            posted_at=parse_posted_at(job.date_posted),
+            location_normalized=normalize_location(job.location),
+            fetch_timestamp=fetched_at,
+            tags=()
         )
-        db_storage.save(job_entry)
+        ingested.append((job_entry, canonical_title(job.job_title), skills))
+    saved = db_storage.save_jobs([(job_entry, skills) for job_entry, _, skills in ingested], replace=replace)
+    return [(job_entry, title, skills) for job_entry, (_, title, skills) in zip(saved, ingested)]
+
+
+def _update_derived_data(db_storage, ingested, fetched_at, replace):
+    """
+    Folds freshly ingested jobs into the market-trend aggregates and the semantic index
+    :param replace: the jobs are the whole cache (full refresh) rather than a top-up
+    """
+    try:
+        trend_rows = [(title, job.source, skills) for job, title, skills in ingested]
+        update_market_trends(db_storage, trend_rows, fetched_at, replace=replace)
+    except Exception as e:
+        print(f"Error updating market trends: {e}")
+
+    try:
+        documents = [(job.id, job.job_title, job.job_description) for job, _, _ in ingested]
+        if replace:
+            build_semantic_index(documents)
+        else:
+            append_to_semantic_index(documents)
+    except Exception as e:
+        print(f"Error updating semantic index: {e}")
+
+
+def add_to_cache(jobs, db_storage=None):
+    """
+    Adds jobs from a targeted fetch to the current cache without a full refresh.
+    Jobs already cached (same URL) are skipped; a new generation is started when anything was added.
+    The write holds the refresh lease, so a full refresh running at the same time can't replace
+    the rows or the semantic index under it.
+    :return: Number of jobs added, or None when a refresh holds the lease and nothing was written
+    """
+    db_storage = db_storage or DBStorage()
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    if not db_storage.acquire_refresh_lease(owner, Config.REFRESH_LEASE_SECONDS, CacheState.TOPPING_UP):
+        return None
+
+    try:
+        cached_urls = db_storage.get_cached_urls([job.job_url for job in jobs])
+        new_jobs = []
+        for job in jobs:
+            if job.job_url not in cached_urls:
+                cached_urls.add(job.job_url)
+                new_jobs.append(job)
+        if new_jobs:
+            fetched_at = datetime.now()
+            ingested = ingest_jobs(db_storage, new_jobs, fetched_at)
+            _update_derived_data(db_storage, ingested, fetched_at, replace=False)
+            # The full-refresh clock is left alone: these rows top up the cache, they don't renew it
+            generation = db_storage.bump_generation()
+            forget_checked_generation()
+            invalidate_responses(generation, db_storage)
+    finally:
+        db_storage.release_refresh_lease(owner)
+    return len(new_jobs)
+
+
+def record_search_miss(job_title):
+    """Remembers a search the cache could not answer so the miss runner can fetch for it"""
+    inc_counter("jobsearchai_search_misses_total")
+    try:
+        DBStorage().record_search_miss(job_title)
+    except Exception as e:
+        print(f"Error recording search miss: {e}")
+
+
+def current_generation():
+    """
+    The cache generation without a database round-trip when caching_logic() ran in the
+    last GENERATION_CHECK_SECONDS, so response-cache hits stay in memory. Another worker's
+    refresh is picked up within that window.
+    """
+    checked = _checked_generation
+    if checked is not None and time.monotonic() - checked[1] < Config.GENERATION_CHECK_SECONDS:
+        return checked[0]
+    return caching_logic()
+
+
+def forget_checked_generation():
+    """Makes the next current_generation() check the database (this process changed the generation)"""
+    global _checked_generation
+    _checked_generation = None
 
 
 def caching_logic():
-    """Logic to manage caching of job data"""
+    """
+    Logic to manage caching of job data
+    :return: The current cache generation id
+    """
+    global _checked_generation
     db_storage = DBStorage()
-    now = datetime.now()
 
     # Check if there is any data in the cache
     if not db_storage.check_for_data():
-        # Fetch data from external APIs and store in cache
+        # Fetch data from external APIs and store in cache (or wait for whoever is already doing it)
         print("No cache data found. Fetching new data...")
-        save_to_cache()
+        refresh_cache(db_storage, wait=True)
     # There is data, check if it's stale
     else:
-        # Get the timestamp of the most recent cache entry
         print("Cache data found. Checking freshness...")
-        last_entry = db_storage.fetch_last_refreshed()
-        if now - last_entry > timedelta(hours=24):
-            db_storage.delete_all()
-            save_to_cache()
+        if is_cache_stale(db_storage):
+            if Config.REFRESH_IN_WORKERS:
+                # One process refreshes; everyone else keeps serving the current snapshot
+                refresh_cache(db_storage)
+            else:
+                print("Cache is stale. Waiting for the refresh runner.")
+
+    generation = db_storage.get_cache_state().generation
+
+    # Keep the known-title gazetteer in step with the snapshot (other workers may have refreshed it)
+    if _title_gazetteer is None or _title_gazetteer_generation != generation:
+        refresh_title_gazetteer(db_storage, generation)
+    _checked_generation = (generation, time.monotonic())
+    return generation
+
+
+def is_cache_stale(db_storage=None):
+    """True when the snapshot is older than CACHE_MAX_AGE_HOURS"""
+    db_storage = db_storage or DBStorage()
+    # Get the timestamp of the most recent refresh
+    last_entry = db_storage.get_cache_state().refreshed_at or db_storage.fetch_last_refreshed()
+    return last_entry is None or datetime.now() - last_entry > timedelta(hours=Config.CACHE_MAX_AGE_HOURS)
 
 
-def get_cached_jobs_by_title(job_title):
-    """Retrieves cached job data by job title"""
+def refresh_cache(db_storage=None, wait=False, force=False):
+    """
+    Refreshes the cache if this process wins the refresh lease
+    The lease is a conditional update of the cache_state row, so across workers (and the
+    refresh runner) exactly one refresh runs at a time; it expires after REFRESH_LEASE_SECONDS
+    without renewal so a crashed refresher can't block the next one.
+    :param wait: When another process holds the lease, wait (up to REFRESH_WAIT_SECONDS) for it to finish
+    :param force: Refresh even if the cache became fresh in the meantime
+    :return: True when this call refreshed the cache
+    """
+    db_storage = db_storage or DBStorage()
+    state = db_storage.get_cache_state()
+    if not force and not wait and state.refresh_status == CacheState.FAILED and state.refresh_started_at and \
+            datetime.now() - state.refresh_started_at < timedelta(seconds=Config.REFRESH_RETRY_SECONDS):
+        # The last attempt failed moments ago; don't hammer the sources from every request
+        return False
+
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    if not db_storage.acquire_refresh_lease(owner, Config.REFRESH_LEASE_SECONDS):
+        state = db_storage.get_cache_state()
+        print(f"Refresh in progress by {state.refresh_owner} ({state.refresh_status}). Serving the current snapshot.")
+        if wait:
+            _wait_for_refresh(db_storage)
+        return False
+
+    try:
+        # Someone may have finished a refresh between our staleness check and taking the lease
+        if not force and db_storage.check_for_data() and not is_cache_stale(db_storage):
+            db_storage.release_refresh_lease(owner)
+            return False
+
+        def progress(status, jobs=None):
+            if not db_storage.renew_refresh_lease(owner, Config.REFRESH_LEASE_SECONDS, status, jobs):
+                raise RuntimeError("Refresh lease lost to another process")
+
+        generation = save_to_cache(progress)
+    except Exception as e:
+        print(f"Cache refresh failed: {e}")
+        db_storage.release_refresh_lease(owner, error=e)
+        return False
+    db_storage.release_refresh_lease(owner)
+    print(f"Cache refreshed. Generation {generation}.")
+    return True
+
+
+def _wait_for_refresh(db_storage):
+    """Blocks until the refresh in progress releases its lease (or REFRESH_WAIT_SECONDS pass)"""
+    deadline = time.monotonic() + Config.REFRESH_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        state = db_storage.get_cache_state()
+        if state.refresh_lease_until is None or state.refresh_lease_until < datetime.now():
+            return
+        time.sleep(0.5)
+
+
+def get_refresh_status(db_storage=None):
+    """The cache generation and the progress of any refresh, for the status endpoint"""
+    db_storage = db_storage or DBStorage()
+    status = db_storage.get_cache_state().to_dict()
+    status['stale'] = is_cache_stale(db_storage)
+    return status
+
+
+def refresh_title_gazetteer(db_storage=None, generation=None):
+    """Rebuilds the known-title gazetteer from the titles currently in the cache"""
+    global _title_gazetteer, _title_gazetteer_generation
+    db_storage = db_storage or DBStorage()
+    _title_gazetteer = TitleGazetteer.from_titles(
+        db_storage.get_title_counts(),
+        normalizer=DBStorage.normalize_for_storage
+    )
+    _title_gazetteer_generation = generation
+    print(f"Title gazetteer rebuilt with {len(_title_gazetteer)} known phrases")
+    return _title_gazetteer
+
+
+def find_known_title(message):
+    """Finds the longest cached job title mentioned in a free-text message"""
+    gazetteer = _title_gazetteer or refresh_title_gazetteer()
+    return gazetteer.find_longest(message)
+
+
+def get_cached_jobs_by_skills(skills, job_title=None, limit=None, filters=None):
+    """Retrieves cached jobs requiring every one of the given skills"""
+    db_storage = DBStorage()
+    return db_storage.get_by_skills(skills, job_title, limit or Config.RESULTS_PAGE_SIZE, **filter_arguments(filters))
+
+
+def filter_arguments(filters):
+    """DBStorage search arguments for filters parsed from a message (see parse_search_filters)"""
+    if not filters:
+        return {}
+    arguments = {name: filters[name] for name in ('remote', 'source', 'location') if name in filters}
+    if filters.get('days'):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        arguments['posted_after'] = now - timedelta(days=filters['days'])
+    return arguments
+
+
+def matches_filters(job, filters):
+    """True when a JobRecord passes filters parsed from a message (the in-memory twin of filter_arguments)"""
+    arguments = filter_arguments(filters)
+    if 'remote' in arguments and job.is_remote != arguments['remote']:
+        return False
+    if arguments.get('source') and job.source != arguments['source']:
+        return False
+    if arguments.get('location') and job.location_normalized not in expand_location(arguments['location']):
+        return False
+    if 'posted_after' in arguments and (job.posted_at is None or job.posted_at < arguments['posted_after']):
+        return False
+    return True
+
+
+def get_ranked_job_ids(job_title, limit, filters=None, db_storage=None):
+    """Ids of the first `limit` jobs a (filtered) title search ranks, without loading the jobs"""
+    db_storage = db_storage or DBStorage()
+    return db_storage.get_ranked_ids_by_title(job_title, limit, **filter_arguments(filters))
+
+
+def get_top_skills(jobs, limit=8):
+    """Most common indexed skills across the given jobs, most frequent first"""
     db_storage = DBStorage()
-    cached_jobs = db_storage.get_by_title(job_title)
-    # print(f"Found {len(cached_jobs)} cached jobs for title: {job_title}")
-    return cached_jobs
+    skills_by_job = db_storage.get_skills_for_jobs([job.id for job in jobs])
+    counts = {}
+    for skills in skills_by_job.values():
+        for skill in skills:
+            counts[skill] = counts.get(skill, 0) + 1
+    return sorted(counts, key=lambda skill: (-counts[skill], skill))[:limit]
+
 
+def find_similar_jobs(text, k=None, db_storage=None):
+    """Retrieves the cached jobs whose descriptions are most similar to a text, best first"""
+    matches = search_similar(text, k)
+    if not matches:
+        return []
+    db_storage = db_storage or DBStorage()
+    return db_storage.get_by_ids([job_id for job_id, _ in matches])
 
 
+def get_cached_jobs_page(job_title, after=None, page_size=None, db_storage=None, filters=None):
+    """
+    Retrieves one page of cached jobs by job title, optionally filtered (see filter_arguments)
+    :return: (jobs, position of the next page or None)
+    """
+    db_storage = db_storage or DBStorage()
+    return db_storage.get_page_by_title(job_title, page_size or Config.RESULTS_PAGE_SIZE, after=after,
+                                        **filter_arguments(filters))
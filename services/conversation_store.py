@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+ -- conversation_store.py --
+    Last result set of each A2A conversation, so follow-ups ("more", "only remote",
+    "recommend for job 3") are answered from it instead of re-running the pipeline
+    1. Keyed by the A2A contextId (or taskId); a state holds the search, its filters, the ranked
+       result ids (at most CONVERSATION_MAX_RESULTS), how many were shown and the jobs that
+       have cached recommendations
+    2. Size-bounded LRU in each process with a CONVERSATION_TTL_SECONDS expiry, optionally
+       backed by the database so any worker can answer a follow-up
+    3. A state is only valid for the cache generation it was built from (job ids change on refresh)
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from config import Config
+from schemas.dbStorage import DBStorage
+
+
+class TTLCache:
+    """Thread-safe, size-bounded least-recently-used cache whose entries expire"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires at (monotonic), value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the unexpired value (marking it recently used) or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        """Stores a value, evicting expired entries, then the least recently used ones when full"""
+        if self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            # Entries are in last-use order, so expired ones cluster at the front
+            while self._entries and next(iter(self._entries.values()))[0] < now:
+                self._entries.popitem(last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+_conversations = TTLCache(Config.CONVERSATION_CACHE_SIZE, Config.CONVERSATION_TTL_SECONDS)
+
+
+def get_conversation(context_id, generation):
+    """
+    The state of a conversation, or None when there is none, it expired or it was built
+    from another cache generation
+    :return: {'kind', 'q', 'label', 'f', 'g', 'ids', 'n', 'recs'}
+    """
+    if not context_id:
+        return None
+    state = _conversations.get(context_id)
+    if state is None and Config.CONVERSATION_SHARED:
+        try:
+            state_json = DBStorage().get_conversation(context_id)
+        except Exception as e:
+            print(f"Error reading conversation state: {e}")
+            state_json = None
+        if state_json:
+            state = json.loads(state_json)
+            _conversations.put(context_id, state)
+    if state is None or state.get('g') != generation:
+        return None
+    return state
+
+
+def save_conversation(context_id, state):
+    """Stores a conversation's state (a JSON-serializable dict) for CONVERSATION_TTL_SECONDS"""
+    if not context_id:
+        return
+    _conversations.put(context_id, state)
+    if Config.CONVERSATION_SHARED:
+        try:
+            expires_at = datetime.now() + timedelta(seconds=Config.CONVERSATION_TTL_SECONDS)
+            DBStorage().save_conversation(context_id, json.dumps(state), expires_at)
+        except Exception as e:
+            print(f"Error sharing conversation state: {e}")
+
+
+def new_conversation(kind, job_title, filters, generation, job_ids, shown, recommended=(), label=None):
+    """
+    Builds the state of a fresh search
+    :param kind: 'title', 'skills' or 'description'
+    :param label: How the search is described when it isn't just the job title
+    """
+    return {
+        'kind': kind,
+        'q': job_title,
+        'label': label,
+        'f': filters or {},
+        'g': generation,
+        'ids': list(job_ids)[:Config.CONVERSATION_MAX_RESULTS],
+        'n': shown,
+        'recs': list(recommended),
+    }
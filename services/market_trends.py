@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+ -- market_trends.py --
+    Market-demand aggregates maintained at each cache refresh
+    1. Postings per canonical title, per (title, skill) and per source, for each ISO week
+    2. Built from the skills already extracted at ingest, so a refresh costs O(batch) and
+       never rescans descriptions
+    3. A TitleTrend row (top skills, shares and week-over-week deltas) is rebuilt only for
+       the titles a batch touched and read back with one primary-key lookup
+"""
+import re
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from models.market_trend import TitleTrend
+from schemas.dbStorage import DBStorage
+
+TOP_SKILLS = 8
+MAX_TITLE_WORDS = 4
+SENIORITY_WORDS = {'senior', 'sr', 'junior', 'jr', 'lead', 'staff', 'principal', 'mid', 'entry',
+                   'level', 'intern', 'i', 'ii', 'iii', 'iv'}
+
+
+def canonical_title(title):
+    """
+    Title postings are grouped under for trends: seniority and company/team suffixes removed
+    e.g. "Senior Software Engineer (Backend) - Acme" -> "software engineer"
+    """
+    if not title:
+        return None
+    # Whatever follows " - ", "|", "(" or "," is usually the team, company or location
+    title = re.split(r'\s[-–|]\s|[(,|]', title)[0]
+    normalized = DBStorage.normalize_for_storage(title)
+    if not normalized:
+        return None
+    words = normalized.replace('-', ' ').split()
+    core_words = [word for word in words if word not in SENIORITY_WORDS] or words
+    return ' '.join(core_words[:MAX_TITLE_WORDS])
+
+
+def iso_week(moment):
+    """ISO week label of a datetime, e.g. '2026-W42'"""
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def update_market_trends(db_storage, ingested, refreshed_at, replace=True):
+    """
+    Folds a batch of ingested postings into the weekly aggregates and rebuilds the
+    trends of the titles it touched.
+    :param ingested: (canonical title, source, skills) of each posting
+    :param replace: the batch is a full snapshot of the cache and replaces this week's numbers;
+                    otherwise it is added to them (e.g. a targeted top-up)
+    :return: Number of titles whose trend was rebuilt
+    """
+    week = iso_week(refreshed_at)
+    previous_week = iso_week(refreshed_at - timedelta(weeks=1))
+
+    title_counts = Counter()
+    title_skill_counts = Counter()
+    source_counts = Counter()
+    for title, source, skills in ingested:
+        if title:
+            title_counts[title] += 1
+            for skill in skills:
+                title_skill_counts[(title, skill)] += 1
+        if source:
+            source_counts[source] += 1
+
+    if not replace:
+        current_titles, current_skills = db_storage.get_title_week_counts(week, title_counts)
+        title_counts.update(current_titles)
+        title_skill_counts.update(current_skills)
+        source_counts.update(db_storage.get_source_week_counts(week, source_counts))
+
+    previous_titles, previous_skills = db_storage.get_title_week_counts(previous_week, title_counts)
+
+    skills_by_title = defaultdict(dict)
+    for (title, skill), postings in title_skill_counts.items():
+        skills_by_title[title][skill] = postings
+
+    trends = []
+    for title, postings in title_counts.items():
+        known_before = title in previous_titles
+        ranked = sorted(skills_by_title[title].items(), key=lambda item: (-item[1], item[0]))[:TOP_SKILLS]
+        top_skills = [{
+            'skill': skill,
+            'postings': count,
+            'share': round(count / postings, 2),
+            'delta': count - previous_skills.get((title, skill), 0) if known_before else None,
+        } for skill, count in ranked]
+        postings_delta = postings - previous_titles[title] if known_before else None
+        trends.append(TitleTrend(title, week, postings, postings_delta, top_skills))
+
+    db_storage.save_market_trends(week, dict(title_counts), dict(title_skill_counts), dict(source_counts),
+                                  trends, replace=replace)
+    return len(trends)
+
+
+def get_market_skills(job_title, fallback_title=None, db_storage=None):
+    """
+    Top demanded skills for a title this week, for prompts: [{'skill', 'share', 'delta', ...}]
+    Falls back to the canonical title of fallback_title (e.g. the best matching posting).
+    """
+    db_storage = db_storage or DBStorage()
+    for title in (job_title, fallback_title):
+        trend = db_storage.get_title_trend(canonical_title(title))
+        if trend is not None:
+            return trend.skills()
+    return []
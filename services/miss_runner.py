@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+ -- miss_runner.py --
+    Targeted refresh driven by search misses
+    1. Searches that found no cached jobs are counted in the search_miss table
+    2. Each run takes the most frequent misses and asks every source that supports a
+       search parameter (see adapters.adapter_logic.SEARCHABLE_SOURCES) for matching jobs
+    3. Calls to one source are at least MISS_RUNNER_SOURCE_INTERVAL seconds apart; the last
+       call per source and the title in progress live in MISS_RUNNER_STATE_FILE, so a
+       restarted runner resumes where it stopped without calling a source early; sources
+       whose circuit is open are skipped
+    4. A miss that brought in new jobs is dropped, one that didn't is retried after
+       MISS_RUNNER_RETRY_HOURS
+    5. New jobs are written under the refresh lease; while a full refresh holds it the run
+       stops and the title in progress is resumed by the next run
+
+    Usage (from the repository root):
+        python -m services.miss_runner [--once] [--interval 900] [--limit 10]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from adapters.adapter_logic import SEARCHABLE_SOURCES, search_job_listings
+from adapters.registry import adapter_registry
+from config import Config
+from schemas.dbStorage import DBStorage
+from services.cache_logic import add_to_cache
+from utils.metrics import inc_counter
+
+
+def load_state(path=None):
+    """Reads the runner state: {'last_call': {source: epoch seconds}, 'current': {...} or None}"""
+    path = path or Config.MISS_RUNNER_STATE_FILE
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    state.setdefault('last_call', {})
+    state.setdefault('current', None)
+    return state
+
+
+def save_state(state, path=None):
+    """Writes the runner state atomically"""
+    path = path or Config.MISS_RUNNER_STATE_FILE
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def _wait_for_source(state, source):
+    """Sleeps until the source may be called again"""
+    elapsed = time.time() - state['last_call'].get(source, 0)
+    if elapsed < Config.MISS_RUNNER_SOURCE_INTERVAL:
+        time.sleep(Config.MISS_RUNNER_SOURCE_INTERVAL - elapsed)
+
+
+def refresh_miss(miss_key, job_title, state, db_storage):
+    """
+    Searches every searchable source for one missed title, skipping sources this title
+    already got an answer from before an interruption
+    :return: Number of new jobs added to the cache, or None when a refresh holds the lease
+    """
+    current = state['current']
+    if not current or current.get('key') != miss_key:
+        current = state['current'] = {'key': miss_key, 'done': [], 'added': 0}
+        save_state(state)
+
+    for source in SEARCHABLE_SOURCES:
+        if source in current['done']:
+            continue
+        if not adapter_registry.is_available(source):
+            print(f"Miss runner: {source} circuit is open, skipping it for '{job_title}'")
+            continue
+        _wait_for_source(state, source)
+        try:
+            jobs = search_job_listings(source, job_title)
+        except Exception as e:
+            print(f"Error searching {source} for '{job_title}': {e}")
+            jobs = []
+        state['last_call'][source] = time.time()
+        added = add_to_cache(jobs, db_storage) if jobs else 0
+        if added is None:
+            # The source is asked again next run, once the refresh has finished
+            print(f"Miss runner: cache refresh in progress, '{job_title}' resumes next run")
+            save_state(state)
+            return None
+        print(f"Miss runner: {source} returned {len(jobs)} jobs for '{job_title}', {added} new")
+        current['done'].append(source)
+        current['added'] += added
+        save_state(state)
+
+    added = current['added']
+    db_storage.resolve_search_miss(miss_key, found=added > 0)
+    inc_counter("jobsearchai_miss_refreshes_total", outcome="found" if added else "empty")
+    state['current'] = None
+    save_state(state)
+    return added
+
+
+def run_once(limit=None):
+    """
+    Handles the most frequent misses that are due
+    :return: Number of new jobs added to the cache
+    """
+    db_storage = DBStorage()
+    state = load_state()
+    retry_before = datetime.now() - timedelta(hours=Config.MISS_RUNNER_RETRY_HOURS)
+    misses = [(miss.query_key, miss.job_title) for miss in db_storage.get_top_misses(
+        limit or Config.MISS_RUNNER_BATCH, Config.MISS_RUNNER_MIN_MISSES, retry_before)]
+
+    # An interrupted title is finished first
+    current = state['current']
+    if current:
+        interrupted = [miss for miss in misses if miss[0] == current['key']]
+        misses = interrupted + [miss for miss in misses if miss[0] != current['key']]
+
+    total_added = 0
+    for miss_key, job_title in misses:
+        added = refresh_miss(miss_key, job_title, state, db_storage)
+        if added is None:
+            break
+        total_added += added
+    print(f"Miss runner: {len(misses)} missed titles searched, {total_added} new jobs cached")
+    return total_added
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Handle one batch of misses and exit")
+    parser.add_argument("--interval", type=float, default=900, help="Seconds between runs")
+    parser.add_argument("--limit", type=int, help="Misses handled per run")
+    args = parser.parse_args()
+
+    while True:
+        try:
+            run_once(args.limit)
+        except Exception as e:
+            print(f"Miss runner error: {e}")
+        finally:
+            DBStorage.remove_sessions()
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+ -- refresh_runner.py --
+    Refreshes the job cache outside the web workers
+    Takes the same refresh lease as the workers (see cache_logic.refresh_cache), so it never
+    races them. Run it from a scheduler with REFRESH_IN_WORKERS=false on the web process to
+    keep fetches off the request path entirely.
+
+    Usage (from the repository root):
+        python -m services.refresh_runner [--force] [--interval 3600]
+"""
+import argparse
+import json
+import time
+
+from schemas.dbStorage import DBStorage
+from services.cache_logic import get_refresh_status, is_cache_stale, refresh_cache
+from services.semantic_search import ensure_semantic_index
+
+
+def run_once(force=False):
+    """Refreshes the cache when it is stale (or always with force); returns True when it refreshed"""
+    if not force and not is_cache_stale():
+        if ensure_semantic_index() is not None:
+            print("Cache is fresh. Built the missing semantic index.")
+        else:
+            print("Cache is fresh. Nothing to do.")
+        return False
+    return refresh_cache(wait=False, force=force)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="Refresh even if the cache is fresh")
+    parser.add_argument("--interval", type=float, help="Keep running, checking every this many seconds")
+    args = parser.parse_args()
+
+    while True:
+        try:
+            run_once(args.force)
+        except Exception as e:
+            print(f"Refresh runner error: {e}")
+        print(json.dumps(get_refresh_status(), indent=2))
+        DBStorage.remove_sessions()
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+ -- response_cache.py --
+    Cache of fully formatted search responses (jobs + recommendations)
+    1. Keyed by cache generation, canonical job title and search filters (or by
+       generation and job id for the recommendations of a single job)
+    2. Size-bounded LRU in each process, optionally backed by the database
+       so every worker can reuse a response
+    3. A refresh starts a new generation, so older responses can never be served
+"""
+import json
+import threading
+from collections import OrderedDict
+
+from config import Config
+from schemas.dbStorage import DBStorage
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used cache"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached value (marking it recently used) or None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Stores a value, evicting the least recently used entry when full"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+_responses = LRUCache(Config.RESPONSE_CACHE_SIZE)
+_responses_generation = None
+
+
+def make_response_key(job_title, generation, filters=None):
+    """Builds the cache key for a (filtered) job title search in a cache generation"""
+    canonical_title = DBStorage.normalize_for_storage(job_title) or ""
+    key = f"{generation}:{canonical_title}"
+    if filters:
+        key += f"|{json.dumps(filters, sort_keys=True)}"
+    return key
+
+
+def _sync_generation(generation):
+    """Drops in-process responses as soon as a newer generation is seen"""
+    global _responses_generation
+    if generation != _responses_generation:
+        _responses.clear()
+        _responses_generation = generation
+
+
+def get_cached_response(job_title, generation, filters=None):
+    """Returns the formatted response for the title (and filters) in this generation, or None"""
+    _sync_generation(generation)
+    key = make_response_key(job_title, generation, filters)
+    response = _responses.get(key)
+    if response is None and Config.RESPONSE_CACHE_SHARED:
+        response = DBStorage().get_cached_response(key, generation)
+        if response is not None:
+            _responses.put(key, response)
+    return response
+
+
+def store_response(job_title, generation, response, filters=None):
+    """Caches the formatted response for the title (and filters) in this generation"""
+    _sync_generation(generation)
+    key = make_response_key(job_title, generation, filters)
+    _responses.put(key, response)
+    if Config.RESPONSE_CACHE_SHARED:
+        try:
+            DBStorage().save_cached_response(key, generation, response)
+        except Exception as e:
+            print(f"Error sharing cached response: {e}")
+
+
+def _recommendations_key(job_id, generation):
+    return f"{generation}:job:{job_id}"
+
+
+def get_cached_recommendations(job_id, generation):
+    """Returns the recommendations generated for a cached job in this generation, or None"""
+    _sync_generation(generation)
+    key = _recommendations_key(job_id, generation)
+    cached = _responses.get(key)
+    if cached is None and Config.RESPONSE_CACHE_SHARED:
+        cached = DBStorage().get_cached_response(key, generation)
+        if cached is not None:
+            _responses.put(key, cached)
+    return json.loads(cached) if cached is not None else None
+
+
+def store_recommendations(job_id, generation, recommendations):
+    """Caches the recommendations generated for a cached job in this generation"""
+    _sync_generation(generation)
+    key = _recommendations_key(job_id, generation)
+    cached = json.dumps(recommendations)
+    _responses.put(key, cached)
+    if Config.RESPONSE_CACHE_SHARED:
+        try:
+            DBStorage().save_cached_response(key, generation, cached)
+        except Exception as e:
+            print(f"Error sharing cached recommendations: {e}")
+
+
+def invalidate_responses(generation, db_storage=None):
+    """Drops every response built before the given generation"""
+    _sync_generation(generation)
+    if Config.RESPONSE_CACHE_SHARED:
+        db_storage = db_storage or DBStorage()
+        db_storage.delete_cached_responses(generation)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+ -- semantic_search.py --
+    Semantic matching of pasted job descriptions and free-text queries against the cache
+    1. At ingest every cached job (title + description) becomes a hashed TF-IDF vector
+       (see utils/text_vectors.py)
+    2. The vectors are written as one float32 .npy matrix next to the job ids and IDF
+       weights; every process memory-maps it read-only, so workers share a single copy
+       through the OS page cache
+    3. A query is vectorized the same way and scored against every job with one
+       matrix-vector product; the top k come from argpartition
+    A new index version is written beside the old one and published by replacing
+    index.json, so readers never see a half-written matrix. The index is only built by
+    refreshes, warm-up and the refresh runner; until one exists searches find nothing.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+from schemas.dbStorage import DBStorage
+from utils.text_vectors import hashed_features, inverse_document_frequencies, weighted_vector
+
+MANIFEST_NAME = "index.json"
+_ARRAYS = ("vectors", "ids", "idf")
+
+# (manifest mtime, manifest, vectors memmap, ids, idf) of the index this process has mapped
+_loaded = None
+_load_lock = threading.Lock()
+
+
+def _job_text(job_title, job_description):
+    """Text a job is matched on; the title counts twice"""
+    return f"{job_title or ''} {job_title or ''} {job_description or ''}"
+
+
+def _manifest_path(index_dir):
+    return os.path.join(index_dir, MANIFEST_NAME)
+
+
+def _array_path(index_dir, version, name):
+    return os.path.join(index_dir, f"{name}_{version}.npy")
+
+
+@contextmanager
+def _build_lock(index_dir):
+    """Serializes index writers across processes (web workers and the miss runner)"""
+    os.makedirs(index_dir, exist_ok=True)
+    with open(os.path.join(index_dir, ".lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_manifest(index_dir):
+    try:
+        with open(_manifest_path(index_dir)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _publish(index_dir, ids, idf, write_rows):
+    """
+    Writes a new index version and points index.json at it
+    :param write_rows: Callback filling the (len(ids), dimensions) memory-mapped matrix
+    """
+    import numpy as np
+    version = str(time.time_ns())
+    vectors = np.lib.format.open_memmap(_array_path(index_dir, version, "vectors"), mode="w+",
+                                        dtype=np.float32, shape=(len(ids), len(idf)))
+    write_rows(vectors)
+    vectors.flush()
+    del vectors
+    np.save(_array_path(index_dir, version, "ids"), ids)
+    np.save(_array_path(index_dir, version, "idf"), idf)
+
+    previous = _read_manifest(index_dir)
+    manifest_path = _manifest_path(index_dir)
+    with open(f"{manifest_path}.tmp", "w") as f:
+        json.dump({"version": version, "rows": len(ids), "dimensions": len(idf)}, f)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    # Processes still mapping the old version keep reading it until they reload
+    if previous:
+        for name in _ARRAYS:
+            try:
+                os.remove(_array_path(index_dir, previous["version"], name))
+            except OSError:
+                pass
+    return len(ids)
+
+
+def build_semantic_index(documents, index_dir=None):
+    """
+    Replaces the index with one built from the given jobs
+    :param documents: (job id, job title, job description) of every cached job
+    :return: Number of indexed jobs
+    """
+    import numpy as np
+    index_dir = index_dir or Config.SEMANTIC_INDEX_DIR
+    dimensions = Config.SEMANTIC_DIMENSIONS
+    feature_sets = [hashed_features(_job_text(title, description), dimensions) for _, title, description in documents]
+    idf = inverse_document_frequencies(feature_sets, dimensions)
+    ids = np.array([job_id for job_id, _, _ in documents], dtype=np.int64)
+
+    def write_rows(vectors):
+        for row, features in enumerate(feature_sets):
+            vectors[row] = weighted_vector(features, idf)
+
+    with _build_lock(index_dir):
+        return _publish(index_dir, ids, idf, write_rows)
+
+
+def append_to_semantic_index(documents, index_dir=None):
+    """
+    Adds jobs to the index, weighting them with its current IDF (rebuilt from the
+    database when there is no compatible index yet)
+    :return: Number of indexed jobs
+    """
+    import numpy as np
+    index_dir = index_dir or Config.SEMANTIC_INDEX_DIR
+    if not documents:
+        return 0
+    with _build_lock(index_dir):
+        manifest = _read_manifest(index_dir)
+        if manifest is not None and manifest["dimensions"] == Config.SEMANTIC_DIMENSIONS:
+            version = manifest["version"]
+            old_vectors = np.load(_array_path(index_dir, version, "vectors"), mmap_mode="r")
+            old_ids = np.load(_array_path(index_dir, version, "ids"))
+            idf = np.load(_array_path(index_dir, version, "idf"))
+            ids = np.concatenate([old_ids, np.array([job_id for job_id, _, _ in documents], dtype=np.int64)])
+
+            def write_rows(vectors):
+                vectors[:len(old_ids)] = old_vectors
+                for row, (_, title, description) in enumerate(documents, start=len(old_ids)):
+                    features = hashed_features(_job_text(title, description), len(idf))
+                    vectors[row] = weighted_vector(features, idf)
+
+            return _publish(index_dir, ids, idf, write_rows)
+    return rebuild_semantic_index(index_dir=index_dir)
+
+
+def rebuild_semantic_index(db_storage=None, index_dir=None):
+    """Builds the index from every cached job"""
+    db_storage = db_storage or DBStorage()
+    return build_semantic_index(db_storage.get_search_documents(), index_dir)
+
+
+def ensure_semantic_index(db_storage=None, index_dir=None):
+    """
+    Builds the index when there is no compatible one yet (a cache filled by an older release)
+    :return: Number of indexed jobs, or None when an index already existed
+    """
+    manifest = _read_manifest(index_dir or Config.SEMANTIC_INDEX_DIR)
+    if manifest is not None and manifest["dimensions"] == Config.SEMANTIC_DIMENSIONS:
+        return None
+    return rebuild_semantic_index(db_storage, index_dir)
+
+
+def export_semantic_index(index_dir=None):
+    """The current index as (ids, idf, vectors) arrays, or None when there is none"""
+    index = _load_index(index_dir or Config.SEMANTIC_INDEX_DIR)
+    if index is None:
+        return None
+    _, _, vectors, ids, idf = index
+    return ids, idf, vectors
+
+
+def import_semantic_index(ids, idf, vectors, index_dir=None):
+    """Publishes an exported index as the current version; returns the number of indexed jobs"""
+    index_dir = index_dir or Config.SEMANTIC_INDEX_DIR
+
+    def write_rows(target):
+        target[:] = vectors
+
+    with _build_lock(index_dir):
+        return _publish(index_dir, ids, idf, write_rows)
+
+
+def _load_index(index_dir):
+    """Maps the current index version (reloaded when index.json changes); None when there is none"""
+    global _loaded
+    import numpy as np
+    try:
+        mtime = os.stat(_manifest_path(index_dir)).st_mtime_ns
+    except OSError:
+        return None
+    loaded = _loaded
+    if loaded is not None and loaded[0] == (index_dir, mtime):
+        return loaded
+    with _load_lock:
+        if _loaded is not None and _loaded[0] == (index_dir, mtime):
+            return _loaded
+        manifest = _read_manifest(index_dir)
+        if manifest is None or manifest["dimensions"] != Config.SEMANTIC_DIMENSIONS:
+            return None
+        version = manifest["version"]
+        try:
+            vectors = np.load(_array_path(index_dir, version, "vectors"), mmap_mode="r")
+            ids = np.load(_array_path(index_dir, version, "ids"))
+            idf = np.load(_array_path(index_dir, version, "idf"))
+        except OSError:
+            # Replaced between reading the manifest and the arrays; the next call retries
+            return None
+        _loaded = ((index_dir, mtime), manifest, vectors, ids, idf)
+        return _loaded
+
+
+def search_similar(text, k=None, min_score=None, index_dir=None):
+    """
+    The cached jobs most similar to a text
+    :return: [(job id, cosine similarity)], most similar first
+    """
+    import numpy as np
+    index_dir = index_dir or Config.SEMANTIC_INDEX_DIR
+    k = k or Config.RESULTS_PAGE_SIZE
+    min_score = Config.SEMANTIC_MIN_SCORE if min_score is None else min_score
+
+    index = _load_index(index_dir)
+    if index is None:
+        # Never built on the request path; see ensure_semantic_index
+        return []
+    _, _, vectors, ids, idf = index
+    if not len(ids):
+        return []
+
+    query = weighted_vector(hashed_features(text, len(idf)), idf)
+    if not query.any():
+        return []
+    scores = vectors @ query
+    k = min(k, len(ids))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [(int(ids[i]), float(scores[i])) for i in top if scores[i] >= min_score]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""
+ -- snapshot.py --
+    Portable snapshots of the job cache for fast cold starts and offline benchmarks
+    1. export: the cached jobs, the skill index, the market-trend aggregates and the semantic
+       index go into one deflate-compressed zip with a versioned manifest holding the sha256
+       of every member
+    2. import: the manifest and checksums are verified, then every table is bulk-loaded in a
+       single transaction (readers see the old cache or the new one, never a mix) and the
+       semantic index is published
+    The snapshot keeps its refresh time, so an old snapshot is still refreshed when it is stale.
+    Set SNAPSHOT_PATH to import a snapshot during warm-up when the cache is empty.
+
+    Usage (from the repository root):
+        python -m services.snapshot export snapshot.zip
+        python -m services.snapshot import snapshot.zip [--force]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+
+from sqlalchemy import DateTime
+
+from config import Config
+from models.cache_job_data import CacheJobData
+from models.job_skill import JobSkill
+from models.market_trend import TitleSkillWeekly, TitleWeekly, SourceWeekly, TitleTrend
+from schemas.dbStorage import DBStorage
+
+SNAPSHOT_FORMAT = "jobsearchai-cache-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Referenced tables first; loaded in this order and cleared in reverse
+SNAPSHOT_MODELS = (CacheJobData, JobSkill, TitleWeekly, TitleSkillWeekly, SourceWeekly, TitleTrend)
+SEMANTIC_ARRAYS = ("ids", "idf", "vectors")
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is not one this version can load"""
+
+
+def _datetime_columns(model):
+    return [column.name for column in model.__table__.columns if isinstance(column.type, DateTime)]
+
+
+def _encode_rows(model, rows):
+    """JSON lines of a table's rows (datetimes as ISO-8601)"""
+    datetime_columns = _datetime_columns(model)
+    lines = []
+    for row in rows:
+        for name in datetime_columns:
+            if row.get(name) is not None:
+                row[name] = row[name].isoformat()
+        lines.append(json.dumps(row, separators=(",", ":")))
+    return ("\n".join(lines) + "\n" if lines else "").encode("utf-8")
+
+
+def _decode_rows(model, data):
+    """Rows written by _encode_rows, limited to the columns the model has now"""
+    datetime_columns = _datetime_columns(model)
+    columns = set(model.__table__.columns.keys())
+    rows = []
+    for line in data.decode("utf-8").splitlines():
+        if not line:
+            continue
+        row = {name: value for name, value in json.loads(line).items() if name in columns}
+        for name in datetime_columns:
+            if row.get(name) is not None:
+                row[name] = datetime.fromisoformat(row[name])
+        rows.append(row)
+    return rows
+
+
+def export_snapshot(path, db_storage=None):
+    """
+    Writes the cache and its derived indexes to a snapshot file
+    :return: The manifest that was written
+    """
+    import numpy as np
+    from services.semantic_search import export_semantic_index
+
+    db_storage = db_storage or DBStorage()
+    state = db_storage.get_cache_state()
+    members = {}
+    counts = {}
+    for model in SNAPSHOT_MODELS:
+        rows = db_storage.export_rows(model)
+        members[f"{model.__tablename__}.jsonl"] = _encode_rows(model, rows)
+        counts[model.__tablename__] = len(rows)
+
+    semantic_index = None
+    try:
+        exported_index = export_semantic_index()
+    except Exception as e:
+        print(f"Semantic index not exported: {e}")
+        exported_index = None
+    if exported_index is not None:
+        for name, array in zip(SEMANTIC_ARRAYS, exported_index):
+            buffer = io.BytesIO()
+            np.save(buffer, np.asarray(array))
+            members[f"semantic_{name}.npy"] = buffer.getvalue()
+        semantic_index = {"dimensions": int(len(exported_index[1])), "rows": int(len(exported_index[0]))}
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "generation": state.generation,
+        "refreshed_at": state.refreshed_at.isoformat() if state.refreshed_at else None,
+        "counts": counts,
+        "semantic_index": semantic_index,
+        "sha256": {name: hashlib.sha256(data).hexdigest() for name, data in members.items()},
+    }
+
+    tmp_path = f"{path}.tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+        for name, data in members.items():
+            archive.writestr(name, data)
+    os.replace(tmp_path, path)
+    print(f"Snapshot written to {path}: {counts[CacheJobData.__tablename__]} jobs, "
+          f"{os.path.getsize(path) / 1024:.0f} KiB")
+    return manifest
+
+
+def _read_verified(archive, manifest, name):
+    """A member's bytes after checking them against the manifest checksum"""
+    expected = manifest["sha256"].get(name)
+    if expected is None:
+        raise SnapshotError(f"{name} is not listed in the manifest")
+    data = archive.read(name)
+    if hashlib.sha256(data).hexdigest() != expected:
+        raise SnapshotError(f"Checksum mismatch for {name}")
+    return data
+
+
+def import_snapshot(path, db_storage=None):
+    """
+    Replaces the cache with a snapshot (one transaction) and publishes its semantic index
+    :return: The new cache generation
+    """
+    import numpy as np
+    from services.cache_logic import forget_checked_generation
+    from services.response_cache import invalidate_responses
+    from services.semantic_search import import_semantic_index, rebuild_semantic_index
+
+    db_storage = db_storage or DBStorage()
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME))
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            raise SnapshotError(f"{path} is not a cache snapshot")
+        if manifest.get("version") != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {manifest.get('version')} (expected {SNAPSHOT_VERSION})")
+
+        rows_by_model = []
+        for model in SNAPSHOT_MODELS:
+            name = f"{model.__tablename__}.jsonl"
+            rows = _decode_rows(model, _read_verified(archive, manifest, name)) if name in archive.namelist() else []
+            rows_by_model.append((model, rows))
+
+        semantic_arrays = None
+        semantic_index = manifest.get("semantic_index")
+        if semantic_index and semantic_index["dimensions"] == Config.SEMANTIC_DIMENSIONS:
+            semantic_arrays = [np.load(io.BytesIO(_read_verified(archive, manifest, f"semantic_{name}.npy")))
+                               for name in SEMANTIC_ARRAYS]
+
+    refreshed_at = datetime.fromisoformat(manifest["refreshed_at"]) if manifest.get("refreshed_at") else None
+    generation = db_storage.load_rows(rows_by_model, refreshed_at)
+    forget_checked_generation()
+    invalidate_responses(generation, db_storage)
+
+    try:
+        if semantic_arrays is not None:
+            import_semantic_index(*semantic_arrays)
+        else:
+            rebuild_semantic_index(db_storage)
+    except Exception as e:
+        print(f"Error loading semantic index from snapshot: {e}")
+
+    print(f"Snapshot {path} loaded: {manifest['counts'].get(CacheJobData.__tablename__, 0)} jobs, "
+          f"generation {generation}")
+    return generation
+
+
+def import_snapshot_if_empty(path=None):
+    """Warm-up hook: loads SNAPSHOT_PATH into an empty cache; returns True when it did"""
+    path = path or Config.SNAPSHOT_PATH
+    if not path or not os.path.exists(path):
+        return False
+    db_storage = DBStorage()
+    if db_storage.check_for_data():
+        return False
+    try:
+        import_snapshot(path, db_storage)
+    except (SnapshotError, zipfile.BadZipFile, OSError, ValueError, KeyError) as e:
+        print(f"Error importing snapshot {path}: {e}")
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path")
+    parser.add_argument("--force", action="store_true", help="Import even when the cache already has data")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_snapshot(args.path)
+    elif args.force:
+        import_snapshot(args.path)
+    elif not import_snapshot_if_empty(args.path):
+        print("Cache already has data (or the snapshot could not be loaded). Use --force to replace it.")
+
+
+if __name__ == "__main__":
+    main()
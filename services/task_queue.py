@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+ -- task_queue.py --
+    Asynchronous A2A task mode
+    1. A task is stored in the database as 'submitted' and its id is returned at once
+    2. A bounded thread pool runs the job search ('working' -> 'completed' / 'failed')
+       A task left unfinished for TASK_STALE_SECONDS (its worker died) is reported as failed,
+       and tasks are deleted TASK_TTL_HOURS after their last update
+    3. Clients poll with `tasks/get` or receive the finished task on their push URL
+       (https only, on a public address or a TASK_PUSH_ALLOWED_HOSTS host)
+    Tasks live in the database, so any gunicorn worker can answer a poll.
+"""
+import ipaddress
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+import requests
+
+from config import Config
+from models.a2a_task import A2ATask
+from schemas.dbStorage import DBStorage
+
+_executor = ThreadPoolExecutor(max_workers=Config.TASK_WORKERS, thread_name_prefix="a2a-task")
+_slots = threading.BoundedSemaphore(Config.TASK_QUEUE_LIMIT)
+_PRUNE_INTERVAL_SECONDS = 300
+_last_prune = None
+INTERRUPTED_MESSAGE = "Sorry, this task was interrupted. Please send your message again."
+FAILED_MESSAGE = "Sorry, something went wrong. Please try again."
+
+
+class InvalidPushUrl(ValueError):
+    """The push notification URL is not one the server will call"""
+
+
+def check_push_url(url):
+    """
+    Guards against server-side request forgery through client-supplied push URLs:
+    only https URLs whose host resolves to public addresses (and, when configured,
+    is in TASK_PUSH_ALLOWED_HOSTS) are called.
+    :raises InvalidPushUrl: Otherwise
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port or 443
+    except ValueError:
+        raise InvalidPushUrl("Malformed push notification URL")
+    if parts.scheme != "https" or not parts.hostname:
+        raise InvalidPushUrl("Push notification URLs must be https")
+    host = parts.hostname.lower()
+    if Config.TASK_PUSH_ALLOWED_HOSTS and host not in Config.TASK_PUSH_ALLOWED_HOSTS:
+        raise InvalidPushUrl(f"Push notification host {host} is not allowed")
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, UnicodeError):
+        raise InvalidPushUrl(f"Push notification host {host} does not resolve")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        # Private, loopback, link-local (cloud metadata), reserved and shared ranges are not global
+        if not ip.is_global or ip.is_multicast:
+            raise InvalidPushUrl(f"Push notification host {host} is not a public address")
+
+
+def submit_task(user_message, context_id=None, message_id=None, push_url=None, push_token=None):
+    """
+    Stores a new task and schedules it on the executor.
+    :return: The submitted A2ATask, or None when the queue is full
+    :raises InvalidPushUrl: push_url is not an https URL on a public (or allowed) host
+    """
+    if push_url:
+        check_push_url(push_url)
+    if not _slots.acquire(blocking=False):
+        print("Task queue is full. Rejecting task.")
+        return None
+
+    try:
+        task = A2ATask(user_message, context_id=context_id, message_id=message_id,
+                       push_url=push_url, push_token=push_token)
+        db_storage = DBStorage()
+        db_storage.save(task)
+        _executor.submit(_run_task, task.id)
+    except Exception:
+        _slots.release()
+        raise
+    _prune_tasks(db_storage)
+    return task
+
+
+def get_task(task_id):
+    """
+    Retrieves a task by id. An unfinished task that has not moved for TASK_STALE_SECONDS
+    lost its worker (restart, crash) and is marked failed.
+    """
+    db_storage = DBStorage()
+    task = db_storage.get_task(task_id)
+    if task is not None and task.state in (A2ATask.SUBMITTED, A2ATask.WORKING) and \
+            task.updated_at < datetime.now() - timedelta(seconds=Config.TASK_STALE_SECONDS):
+        print(f"Task {task_id} stalled in '{task.state}'. Marking it failed.")
+        task.set_state(A2ATask.FAILED, INTERRUPTED_MESSAGE)
+        db_storage.save(task)
+    return task
+
+
+def _prune_tasks(db_storage):
+    """Deletes tasks older than TASK_TTL_HOURS, at most once every few minutes per process"""
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < _PRUNE_INTERVAL_SECONDS:
+        return
+    _last_prune = now
+    try:
+        deleted = db_storage.delete_tasks_before(datetime.now() - timedelta(hours=Config.TASK_TTL_HOURS))
+        if deleted:
+            print(f"Deleted {deleted} expired tasks")
+    except Exception as e:
+        print(f"Error pruning tasks: {e}")
+
+
+def _run_task(task_id):
+    """Processes a task on an executor thread"""
+    # Imported here so the agent is only loaded once a task actually runs
+    from agent.handler import answer_message
+
+    db_storage = DBStorage()
+    try:
+        task = db_storage.get_task(task_id)
+        task.set_state(A2ATask.WORKING)
+        db_storage.save(task)
+
+        try:
+            response_text = answer_message(task.user_message, task.context_id)
+            task.set_state(A2ATask.COMPLETED, response_text)
+        except Exception as e:
+            print(f"Error running task {task_id}: {e}")
+            task.set_state(A2ATask.FAILED, FAILED_MESSAGE)
+        db_storage.save(task)
+
+        if task.push_url:
+            _push_result(task)
+    except Exception as e:
+        print(f"Error updating task {task_id}: {e}")
+    finally:
+        DBStorage.remove_sessions()
+        _slots.release()
+
+
+def _push_result(task):
+    """Sends the finished task to the client's push notification URL"""
+    headers = {"Content-Type": "application/json"}
+    if task.push_token:
+        headers["X-A2A-Notification-Token"] = task.push_token
+    try:
+        # Checked again when sending: the host's DNS records may have changed since submission
+        check_push_url(task.push_url)
+        # A redirect could point anywhere, so none are followed
+        response = requests.post(task.push_url, json=task.to_a2a(), headers=headers,
+                                 timeout=Config.TASK_PUSH_TIMEOUT, allow_redirects=False)
+        response.raise_for_status()
+    except (requests.exceptions.RequestException, InvalidPushUrl) as e:
+        print(f"Error pushing task {task.id} to {task.push_url}: {e}")
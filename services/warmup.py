@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+ -- warmup.py --
+    Prepares a process to serve traffic before it accepts requests
+    1. Import the heavy modules the request path needs (openai, bs4, sqlalchemy, fuzzywuzzy, numpy)
+    2. Open the database engine and make sure the cache is populated and fresh
+       (an empty cache is loaded from SNAPSHOT_PATH when one is configured)
+    3. Build the search indexes (title gazetteer, and the semantic index when the cache
+       predates it)
+    Run once in the gunicorn master (see gunicorn.conf.py) so forked workers inherit it.
+"""
+import time
+
+from config import Config
+
+
+def warm_up():
+    """Loads the agent and primes the cache; returns the time it took in seconds"""
+    start = time.perf_counter()
+
+    import agent.handler  # noqa: F401  Loads the whole request path
+    import openai  # noqa: F401
+    import bs4  # noqa: F401
+    from fuzzywuzzy import fuzz  # noqa: F401
+    import numpy  # noqa: F401
+    from services.cache_logic import caching_logic, refresh_title_gazetteer
+    from services.semantic_search import ensure_semantic_index
+    from services.snapshot import import_snapshot_if_empty
+
+    try:
+        if import_snapshot_if_empty():
+            # Serve the snapshot right away; a stale one is refreshed on demand under the refresh lease
+            refresh_title_gazetteer()
+            print("Cache loaded from snapshot")
+        else:
+            generation = caching_logic()  # Opens the DB, refreshes if stale, builds the gazetteer
+            print(f"Cache generation {generation} ready")
+        indexed = ensure_semantic_index()
+        if indexed is not None:
+            print(f"Semantic index built ({indexed} jobs)")
+    except Exception as e:
+        # Workers can still start; the first request retries the cache
+        print(f"Error warming up cache: {e}")
+
+    elapsed = time.perf_counter() - start
+    print(f"Warm-up finished in {elapsed:.2f}s")
+    return elapsed
+
+
+if __name__ == "__main__":
+    if Config.WARM_UP_ON_START:
+        warm_up()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Job source registry: circuit breaker transitions and health-based ordering"""
+import pytest
+
+import adapters.registry as registry
+from adapters.registry import CLOSED, HALF_OPEN, OPEN, AdapterRegistry, SourceUnavailable
+
+
+class FakeClock:
+    """Stands in for the time module inside adapters.registry"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+class Source:
+    """A job source that fails while `failing` is set"""
+
+    def __init__(self, jobs=("job",)):
+        self.failing = False
+        self.calls = 0
+        self.jobs = list(jobs)
+
+    def __call__(self, *args):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("source is down")
+        return self.jobs
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(registry, "time", fake)
+    return fake
+
+
+def make_registry(**sources):
+    adapters = AdapterRegistry(window=10, failure_threshold=3, open_seconds=60)
+    for priority, (name, source) in enumerate(sources.items()):
+        adapters.register(name, source, priority)
+    return adapters
+
+
+def fail(adapters, name, times):
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            adapters.fetch(name)
+
+
+def state(adapters, name):
+    return adapters.status()[name]["state"]
+
+
+def test_consecutive_failures_open_the_circuit(clock):
+    source = Source()
+    adapters = make_registry(remotive=source)
+    source.failing = True
+    fail(adapters, "remotive", 2)
+    assert state(adapters, "remotive") == CLOSED
+    fail(adapters, "remotive", 1)
+    assert state(adapters, "remotive") == OPEN
+
+    with pytest.raises(SourceUnavailable):
+        adapters.fetch("remotive")
+    assert source.calls == 3
+    assert not adapters.is_available("remotive")
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    source = Source()
+    adapters = make_registry(remotive=source)
+    source.failing = True
+    fail(adapters, "remotive", 3)
+
+    clock.now += 60
+    assert adapters.is_available("remotive")
+    source.failing = False
+    assert adapters.fetch("remotive") == ["job"]
+    assert state(adapters, "remotive") == CLOSED
+    assert adapters.status()["remotive"]["consecutive_failures"] == 0
+
+
+def test_failed_probe_reopens_the_circuit(clock):
+    source = Source()
+    adapters = make_registry(remotive=source)
+    source.failing = True
+    fail(adapters, "remotive", 3)
+
+    clock.now += 60
+    fail(adapters, "remotive", 1)  # A single failed probe is enough
+    assert state(adapters, "remotive") == OPEN
+    clock.now += 59
+    with pytest.raises(SourceUnavailable):
+        adapters.fetch("remotive")
+
+
+def test_only_one_probe_at_a_time(clock):
+    adapters = make_registry(remotive=Source())
+    calls = []
+
+    def probe_then_retry(*args):
+        # A second caller arrives while the probe is in flight
+        calls.append(state(adapters, "remotive"))
+        with pytest.raises(SourceUnavailable):
+            adapters.fetch("remotive")
+        return ["job"]
+
+    source = Source()
+    source.failing = True
+    adapters.register("remotive", source, 0)
+    fail(adapters, "remotive", 3)
+    adapters.register("remotive", probe_then_retry, 0)
+    clock.now += 60
+    assert adapters.fetch("remotive") == ["job"]
+    assert calls == [HALF_OPEN]
+
+
+def test_unhealthy_sources_are_tried_last(clock):
+    healthy, flaky = Source(), Source()
+    adapters = make_registry(flaky=flaky, healthy=healthy)
+    assert adapters.ordered() == ["flaky", "healthy"]
+    flaky.failing = True
+    fail(adapters, "flaky", 1)
+    adapters.fetch("healthy")
+    assert adapters.ordered() == ["healthy", "flaky"]
+
+    # Once the bad spell is old news the source gets its priority back
+    clock.now += 60
+    assert adapters.ordered() == ["flaky", "healthy"]
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""LLM admission control: concurrency cap, priority order and load shedding"""
+import threading
+import time
+
+from services.admission import AdmissionController, PRIORITY_RECOMMENDATIONS, PRIORITY_TITLE
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_waiting_titles_are_served_before_recommendations():
+    controller = AdmissionController(max_concurrent=1, latency_budget=5.0, initial_call_seconds=0.01)
+    assert controller.acquire(PRIORITY_TITLE)
+    served = []
+
+    def call(priority, name):
+        assert controller.acquire(priority)
+        served.append(name)
+        controller.release(0.01)
+
+    threads = [threading.Thread(target=call, args=(PRIORITY_RECOMMENDATIONS, "recommendations"))]
+    threads[0].start()
+    wait_until(lambda: controller.queue_depth == 1)
+    threads.append(threading.Thread(target=call, args=(PRIORITY_TITLE, "title")))
+    threads[1].start()
+    wait_until(lambda: controller.queue_depth == 2)
+
+    controller.release(0.01)
+    for thread in threads:
+        thread.join(5)
+    assert served == ["title", "recommendations"]
+
+
+def test_calls_over_the_latency_budget_are_shed():
+    controller = AdmissionController(max_concurrent=1, latency_budget=1.0, initial_call_seconds=5.0)
+    with controller.slot(PRIORITY_RECOMMENDATIONS) as admitted:
+        assert admitted
+        # The slot is taken and a call is expected to last 5s: waiting would exceed the budget
+        with controller.slot(PRIORITY_TITLE) as second:
+            assert second is False
+    with controller.slot(PRIORITY_TITLE) as admitted:
+        assert admitted
+
+
+def test_waiter_gives_up_at_the_deadline():
+    controller = AdmissionController(max_concurrent=1, latency_budget=0.1, initial_call_seconds=0.01)
+    assert controller.acquire(PRIORITY_TITLE)
+    start = time.monotonic()
+    assert controller.acquire(PRIORITY_TITLE) is False
+    assert 0.05 < time.monotonic() - start < 2
+    assert controller.queue_depth == 0
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""JSON-RPC batches answer every message as it would be answered on its own"""
+import agent.handler as handler
+from agent.handler import NO_TITLE_MESSAGE, process_batch, process_message
+
+DESCRIPTION = ("We are hiring an engineer to build python django services, run them with docker and kubernetes, "
+               "and look after our postgres databases. You will work with product on new features, review code "
+               "and mentor others on the team. Experience with REST APIs and CI pipelines is a plus.")
+MESSAGES = ["python developer", "jobs requiring kubernetes and python", "remote python developer",
+            "python developer", DESCRIPTION, "xyzzy plugh", "more", "backend engineer"]
+
+
+def message_item(i, text, context_id=None):
+    message = {"role": "user", "messageId": f"m{i}", "parts": [{"kind": "text", "text": text}]}
+    if context_id:
+        message["contextId"] = context_id
+    return {"jsonrpc": "2.0", "id": i, "method": "message/send", "params": {"message": message}}
+
+
+def test_batch_matches_individual_answers(cache):
+    individual = [process_message(message) for message in MESSAGES]
+    assert process_batch(MESSAGES) == individual
+
+
+def test_skill_search_in_a_batch_is_not_a_title_search(cache):
+    response = process_batch(["python developer", "jobs requiring kubernetes and python"])[1]
+    assert response != NO_TITLE_MESSAGE
+    assert "kubernetes" in response.lower()
+
+
+def test_batched_title_searches_share_one_recommendation_call(cache, monkeypatch):
+    batch_calls = []
+    monkeypatch.setattr(handler, "generate_batch_recommendations",
+                        lambda jobs: batch_calls.append(len(jobs)) or [cache(job) for job in jobs])
+    process_batch(["python developer", "backend engineer", "frontend developer", "python developer"])
+    assert batch_calls == [3]
+
+
+def test_batch_follow_ups_use_each_items_conversation(cache):
+    from app import app
+    client = app.test_client()
+    client.post("/a2a/jobsearchai", json=[message_item(1, "python developer", "c1"),
+                                          message_item(2, "frontend developer", "c2")])
+    response = client.post("/a2a/jobsearchai", json=[message_item(3, "only remote", "c1"),
+                                                     message_item(4, "only remote", "c2")])
+    first, second = (item["result"]["parts"][0]["text"] for item in response.get_json())
+    assert "Python Developer" in first and "Berlin" not in first
+    assert "Frontend Developer" in second and "Python" not in second
+
+
+def test_batch_endpoint_keeps_request_order_and_reports_bad_items(cache):
+    from app import app
+    response = app.test_client().post("/a2a/jobsearchai", json=[
+        message_item(1, "backend engineer"),
+        "not a request",
+        {"jsonrpc": "2.0", "id": 3, "method": "tasks/get", "params": {"id": "missing"}},
+        message_item(4, "frontend developer"),
+    ])
+    first, bad, poll, last = response.get_json()
+    assert first["id"] == 1 and "Backend Engineer" in first["result"]["parts"][0]["text"]
+    assert bad["error"]["code"] == -32600
+    assert poll["id"] == 3 and poll["error"]["code"] == -32001
+    assert last["id"] == 4 and "Frontend Developer" in last["result"]["parts"][0]["text"]
+
+
+def test_empty_and_oversized_batches_are_rejected(fresh_db, monkeypatch):
+    from app import app
+    from config import Config
+    client = app.test_client()
+    assert client.post("/a2a/jobsearchai", json=[]).get_json()["error"]["code"] == -32600
+    monkeypatch.setattr(Config, "BATCH_MAX_SIZE", 2)
+    items = [message_item(i, "python developer") for i in range(3)]
+    assert client.post("/a2a/jobsearchai", json=items).get_json()["error"]["code"] == -32600
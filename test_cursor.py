@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""Continuation cursors: encoding, paging through results and damaged tokens"""
+import re
+
+import pytest
+
+from agent.handler import INVALID_CURSOR_MESSAGE, process_message
+from config import Config
+from utils.cursor import decode_cursor, encode_cursor, looks_like_cursor
+
+
+def next_token(response):
+    match = re.search(r'Reply "more (\S+)"', response)
+    return match and match.group(1)
+
+
+def test_cursor_round_trip():
+    data = {'q': 'python developer', 'a': {'mode': 'sql', 'key': [0.5, 16, 'Python Developer', 3]}, 'n': 11,
+            'f': {'remote': True}}
+    token = encode_cursor(data)
+    assert re.fullmatch(r"[A-Za-z0-9_-]+", token)
+    assert looks_like_cursor(token)
+    assert decode_cursor(token) == data
+
+
+@pytest.mark.parametrize("token", ["", "not base64!", "cHl0aG9u", encode_cursor([1, 2])])
+def test_non_cursors_decode_to_none(token):
+    assert decode_cursor(token) is None
+
+
+def test_pages_cover_every_match_once(cache, monkeypatch):
+    monkeypatch.setattr(Config, "RESULTS_PAGE_SIZE", 2)
+    response = process_message("python developer")
+    seen = re.findall(r"jobs\.example\.com/(\d+)", response)
+    token = next_token(response)
+    while token:
+        response = process_message(f"more {token}")
+        seen += re.findall(r"jobs\.example\.com/(\d+)", response)
+        token = next_token(response)
+    assert len(seen) == len(set(seen)) >= 4
+
+
+def test_truncated_or_corrupted_cursor_is_reported(cache, monkeypatch):
+    monkeypatch.setattr(Config, "RESULTS_PAGE_SIZE", 2)
+    token = next_token(process_message("python developer"))
+    assert token
+    assert process_message(f"more {token[:len(token) // 2]}") == INVALID_CURSOR_MESSAGE
+    assert process_message(f"more {encode_cursor({'q': 'python developer', 'a': 'garbage'})}") == INVALID_CURSOR_MESSAGE
+
+
+def test_bare_more_without_a_search_is_not_an_error(cache):
+    assert "nothing more to show" in process_message("more")
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+"""Database connections go back to the pool after every request and job"""
+from agent.handler import process_message
+from schemas.dbStorage import DBStorage
+
+# More requests than the default QueuePool holds (pool_size 5 + max_overflow 10)
+REQUESTS = 30
+
+
+def test_handler_reuses_one_connection_per_thread(cache):
+    engine = DBStorage.get_engine()
+    for _ in range(REQUESTS):
+        assert "Python Developer" in process_message("python developer")
+        assert engine.pool.checkedout() <= 1
+    DBStorage.remove_sessions()
+    assert engine.pool.checkedout() == 0
+
+
+def test_requests_return_their_connections(cache):
+    from app import app
+    engine = DBStorage.get_engine()
+    client = app.test_client()
+    for i in range(REQUESTS):
+        response = client.post("/a2a/jobsearchai", json={
+            "jsonrpc": "2.0", "id": i, "method": "message/send",
+            "params": {"message": {"role": "user", "messageId": f"m{i}",
+                                   "parts": [{"kind": "text", "text": "backend engineer"}]}},
+        })
+        assert response.status_code == 200
+        assert "Backend Engineer" in response.get_json()["result"]["parts"][0]["text"]
+        assert engine.pool.checkedout() == 0
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Structured search filters: parsing, SQL filtering and the in-memory twin"""
+import pytest
+
+from agent.handler import process_message
+from services.cache_logic import get_cached_jobs_page, matches_filters
+from utils.intent_detector import parse_search_filters
+
+FILTERS = [{'remote': True}, {'remote': False}, {'days': 7}, {'source': 'arbeitnow'}, {'location': 'germany'},
+           {'location': 'usa'}, {'location': 'europe'}, {'remote': True, 'location': 'germany', 'days': 7}]
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("remote python developer posted this week", ("python developer", {'remote': True, 'days': 7})),
+    ("onsite python developer", ("python developer", {'remote': False})),
+    ("python developer on site", ("python developer", {'remote': False})),
+    ("on-site python developer", ("python developer", {'remote': False})),
+    ("python developer posted in the last 3 days", ("python developer", {'days': 3})),
+    ("python jobs from remotive", ("python jobs", {'source': 'remotive'})),
+    ("python developer in berlin", ("python developer", {'location': 'germany'})),
+    ("python developer", ("python developer", {})),
+])
+def test_filter_phrases_are_parsed(message, expected):
+    search_text, filters = parse_search_filters(message)
+    assert (" ".join(search_text.split()), filters) == expected
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sql_filters_match_the_in_memory_twin(cache, filters):
+    everything, _ = get_cached_jobs_page("python developer")
+    filtered, _ = get_cached_jobs_page("python developer", filters=filters)
+    assert [job.id for job in filtered] == [job.id for job in everything if matches_filters(job, filters)]
+
+
+def test_filters_narrow_the_search(cache):
+    jobs = get_cached_jobs_page("python developer", filters={'remote': True, 'location': 'germany'})[0]
+    assert sorted(job.location for job in jobs) == ["Munich", "Worldwide"]
+    response = process_message("remote python developer in germany")
+    assert "Munich" in response and "Berlin" not in response and "USA" not in response
+
+
+def test_region_matches_its_countries_and_worldwide_jobs(cache):
+    jobs = get_cached_jobs_page("python developer", filters={'location': 'europe'})[0]
+    assert sorted(job.location for job in jobs) == ["Berlin, Germany", "Munich", "Worldwide"]
+    response = process_message("python developer in europe")
+    assert "Berlin" in response and "USA" not in response
+
+
+def test_filtered_miss_names_the_filters(cache):
+    response = process_message("onsite python developer in usa")
+    assert "No cached jobs" in response and "usa" in response.lower()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Follow-ups are answered from the conversation's last result set"""
+import re
+import time
+
+import pytest
+
+import agent.handler as handler
+import services.conversation_store as conversation_store
+from agent.handler import process_message
+from config import Config
+from services.cache_logic import current_generation, save_to_cache
+from services.conversation_store import TTLCache, get_conversation
+
+
+def listed_urls(response):
+    return re.findall(r"jobs\.example\.com/(\d+)", response)
+
+
+@pytest.fixture
+def no_new_searches(monkeypatch):
+    """Fails the test if a follow-up extracts a title again"""
+    def resolve(message):
+        raise AssertionError(f"searched again for {message!r}")
+    return lambda: monkeypatch.setattr(handler, "resolve_job_title", resolve)
+
+
+def test_ttl_cache_expires_and_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=0.2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    time.sleep(0.25)
+    assert cache.get("a") is None and len(cache) == 1
+
+
+def test_more_pages_through_the_conversation(cache, monkeypatch, no_new_searches):
+    monkeypatch.setattr(Config, "RESULTS_PAGE_SIZE", 2)
+    seen = listed_urls(process_message("python developer", context_id="c1"))
+    no_new_searches()
+    for _ in range(3):
+        seen += listed_urls(process_message("more", context_id="c1"))
+    assert len(seen) == len(set(seen)) == 4
+    assert "That's all the jobs" in process_message("more", context_id="c1")
+
+
+def test_filter_follow_up_narrows_the_last_results(cache, no_new_searches):
+    process_message("python developer", context_id="c1")
+    no_new_searches()
+    response = process_message("just the ones in europe", context_id="c1")
+    assert "Berlin" in response and "Munich" in response and "USA" not in response
+
+
+def test_recommendations_are_generated_once_per_job(cache):
+    process_message("python developer", context_id="c1")
+    calls = len(cache.calls)
+    first = process_message("recommend for job 2", context_id="c1")
+    assert len(cache.calls) == calls + 1
+    assert process_message("recommend for job 2", context_id="c1") == first
+    assert len(cache.calls) == calls + 1
+    assert "Pick a number between 1 and" in process_message("recommend for job 99", context_id="c1")
+
+
+def test_refresh_ends_the_conversation(cache):
+    process_message("python developer", context_id="c1")
+    assert get_conversation("c1", current_generation())
+    save_to_cache()
+    assert get_conversation("c1", current_generation()) is None
+
+
+def test_shared_conversations_survive_another_worker(cache, monkeypatch, no_new_searches):
+    monkeypatch.setattr(Config, "CONVERSATION_SHARED", True)
+    monkeypatch.setattr(Config, "RESULTS_PAGE_SIZE", 2)
+    process_message("python developer", context_id="c1")
+    conversation_store._conversations.clear()  # As if the next message reached another worker
+    no_new_searches()
+    assert len(listed_urls(process_message("more", context_id="c1"))) == 2
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""JobRecord: the one job type shared from the adapters to the formatters"""
+import dataclasses
+from datetime import datetime
+
+import pytest
+import requests
+
+import adapters.remoteok as remoteok
+from models.job_record import JOB_COLUMNS, JobRecord
+from services.cache_logic import get_cached_jobs_page
+
+
+def test_records_are_frozen_and_slotted():
+    job = JobRecord("Python Developer")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        job.job_title = "Go Developer"
+    assert not hasattr(job, "__dict__")
+
+
+def test_row_round_trip():
+    job = JobRecord("Python Developer", "Build APIs", "https://jobs.example.com/1", "Acme", "Berlin",
+                    "2026-10-01", False, "arbeitnow", datetime(2026, 10, 1), "germany", datetime(2026, 10, 2),
+                    tags=("python",))
+    stored = job.with_id(7)
+    assert JobRecord.from_row([getattr(stored, name) for name in JOB_COLUMNS]) == dataclasses.replace(stored, tags=())
+    assert "id" not in job.column_values() and "tags" not in job.column_values()
+    data = stored.to_dict()
+    assert data["id"] == 7 and data["posted_at"] == "2026-10-01T00:00:00" and "tags" not in data
+
+
+def test_adapter_output_is_a_job_record(monkeypatch):
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"legal": "metadata"},
+                    {"position": "Python Developer", "company": "Acme", "description": "<p>Build <b>APIs</b></p>",
+                     "location": "Worldwide", "url": "https://remoteok.example/1", "tags": ["python"],
+                     "date": "2026-10-01T00:00:00+00:00"}]
+
+    monkeypatch.setattr(requests, "get", lambda url, **kwargs: Response())
+    (job,) = remoteok.parse_remoteok_job()
+    assert isinstance(job, JobRecord)
+    assert job.source == "remoteok" and job.tags == ("python",) and "<" not in job.job_description
+
+
+def test_cached_jobs_come_back_as_typed_records(cache):
+    job = get_cached_jobs_page("python developer")[0][0]
+    assert isinstance(job, JobRecord)
+    assert job.id is not None and isinstance(job.posted_at, datetime) and job.tags == ()
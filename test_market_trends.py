@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Weekly market-trend aggregates: canonical titles, shares and week-over-week deltas"""
+from datetime import datetime, timedelta
+
+from schemas.dbStorage import DBStorage
+from services.market_trends import canonical_title, get_market_skills, iso_week, update_market_trends
+
+THIS_WEEK = datetime(2026, 10, 14, 12, 0)
+LAST_WEEK = THIS_WEEK - timedelta(weeks=1)
+
+
+def test_canonical_title_drops_seniority_and_suffixes():
+    assert canonical_title("Senior Software Engineer (Backend) - Acme") == "software engineer"
+    assert canonical_title("Sr. Python Developer, Berlin") == "python developer"
+    assert canonical_title("") is None
+
+
+def test_iso_week_label():
+    assert iso_week(THIS_WEEK) == "2026-W42"
+
+
+def test_trend_shares_and_deltas(fresh_db):
+    db_storage = DBStorage()
+    update_market_trends(db_storage, [("python developer", "remotive", {"python"})] * 2, LAST_WEEK)
+    update_market_trends(db_storage, [
+        ("python developer", "remotive", {"python", "django"}),
+        ("python developer", "jobicy", {"python"}),
+        ("python developer", "arbeitnow", {"python", "docker"}),
+        ("go developer", "remotive", {"go"}),
+    ], THIS_WEEK)
+
+    trend = db_storage.get_title_trend("python developer")
+    assert trend.postings == 3 and trend.postings_delta == 1
+    skills = {skill['skill']: skill for skill in trend.skills()}
+    assert skills["python"]["share"] == 1.0 and skills["python"]["delta"] == 1
+    assert skills["django"]["share"] == 0.33 and skills["django"]["delta"] == 1
+    # A title first seen this week has no deltas
+    assert db_storage.get_title_trend("go developer").postings_delta is None
+
+
+def test_top_ups_add_to_the_week_and_full_refreshes_replace_it(fresh_db):
+    db_storage = DBStorage()
+    update_market_trends(db_storage, [("python developer", "remotive", {"python"})], THIS_WEEK)
+    update_market_trends(db_storage, [("python developer", "jobicy", {"python", "flask"})], THIS_WEEK,
+                         replace=False)
+    assert db_storage.get_title_trend("python developer").postings == 2
+
+    update_market_trends(db_storage, [("python developer", "remotive", {"python"})], THIS_WEEK)
+    assert db_storage.get_title_trend("python developer").postings == 1
+
+
+def test_market_skills_fall_back_to_the_best_match(fresh_db):
+    db_storage = DBStorage()
+    update_market_trends(db_storage, [("python developer", "remotive", {"python"})], THIS_WEEK)
+    assert get_market_skills("pythonista", "Senior Python Developer", db_storage)[0]["skill"] == "python"
+    assert get_market_skills("pythonista", None, db_storage) == []
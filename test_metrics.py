@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Metrics are recorded in memory and merged across worker files on scrape"""
+import json
+import os
+import subprocess
+import sys
+
+import utils.metrics as metrics
+from config import Config
+from services.admission import AdmissionController, PRIORITY_TITLE
+
+
+def test_recording_never_writes_to_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_flusher_pid", os.getpid())  # No background thread in this test
+    flushes = []
+    monkeypatch.setattr(metrics, "_flush", lambda: flushes.append(True))
+    controller = AdmissionController(max_concurrent=1, latency_budget=1.0)
+    with controller.slot(PRIORITY_TITLE) as admitted:
+        assert admitted
+    metrics.inc_counter("jobsearchai_search_misses_total")
+    assert flushes == []
+
+
+def test_scrape_merges_live_workers_and_archives_exited_ones(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_flusher_pid", os.getpid())
+    metrics.reset_metrics()
+    metrics.inc_counter("jobsearchai_search_misses_total", 2)
+
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    snapshot = {"counters": [["jobsearchai_search_misses_total", [], 3.0]],
+                "gauges": [["jobsearchai_llm_active_calls", [], 7.0]], "histograms": []}
+    live_file = tmp_path / f"metrics_{os.getppid()}.json"
+    exited_file = tmp_path / f"metrics_{exited.pid}.json"
+    for path in (live_file, exited_file):
+        path.write_text(json.dumps(snapshot))
+
+    # The exited worker's counter survives its file, its gauge does not
+    for _ in range(2):
+        rendered = metrics.render_metrics()
+        assert "jobsearchai_search_misses_total 8.0" in rendered
+        assert "jobsearchai_llm_active_calls 7.0" in rendered
+    assert not exited_file.exists()
+    assert live_file.exists()
+    assert (tmp_path / metrics.ARCHIVE_NAME).exists()
+    metrics.reset_metrics()
+
+
+def test_forked_child_gets_unlocked_metrics_locks():
+    with metrics._flush_lock, metrics._registry._lock:
+        pid = os.fork()
+        if pid == 0:
+            locked = metrics._flush_lock.locked() or metrics._registry._lock.locked()
+            os._exit(1 if locked else 0)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+def test_adapter_gauges_take_the_latest_value_across_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_flusher_pid", os.getpid())
+    metrics.reset_metrics()
+    labels = [["source", "remotive"]]
+    older = {"counters": [], "histograms": [],
+             "gauges": [["jobsearchai_adapter_health", labels, 1.0, 100.0],
+                        ["jobsearchai_adapter_circuit_open", labels, 1.0, 100.0],
+                        ["jobsearchai_llm_active_calls", [], 2.0, 100.0]]}
+    newer = {"counters": [], "histograms": [],
+             "gauges": [["jobsearchai_adapter_health", labels, 0.5, 200.0],
+                        ["jobsearchai_adapter_circuit_open", labels, 1.0, 200.0],
+                        ["jobsearchai_llm_active_calls", [], 3.0, 200.0]]}
+    # Both files belong to running processes: this one's parent and init
+    (tmp_path / f"metrics_{os.getppid()}.json").write_text(json.dumps(newer))
+    (tmp_path / "metrics_1.json").write_text(json.dumps(older))
+
+    rendered = metrics.render_metrics()
+    assert 'jobsearchai_adapter_health{source="remotive"} 0.5' in rendered
+    assert 'jobsearchai_adapter_circuit_open{source="remotive"} 1.0' in rendered
+    assert "jobsearchai_llm_active_calls 5.0" in rendered
+    metrics.reset_metrics()
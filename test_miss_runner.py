@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Search misses are logged and drive targeted fetches for the missed titles"""
+import pytest
+
+import services.miss_runner as miss_runner
+from config import Config
+from conftest import make_job
+from schemas.dbStorage import DBStorage
+from services.cache_logic import get_cached_jobs_page, record_search_miss
+
+
+@pytest.fixture
+def searches(cache, monkeypatch):
+    """Records targeted searches; each source answers from the returned dict ({source: [jobs]})"""
+    monkeypatch.setattr(Config, "MISS_RUNNER_SOURCE_INTERVAL", 0)
+    calls = []
+    answers = {}
+
+    def search(source, query):
+        calls.append((source, query))
+        return answers.get(source, [])
+
+    monkeypatch.setattr(miss_runner, "search_job_listings", search)
+    return calls, answers
+
+
+def top_misses():
+    return [(miss.job_title, miss.misses) for miss in DBStorage().get_top_misses(10)]
+
+
+def test_misses_are_counted_per_normalized_title(fresh_db):
+    for title in ("Haskell Developer", "haskell developer", "Elm Developer"):
+        record_search_miss(title)
+    assert top_misses() == [("Haskell Developer", 2), ("Elm Developer", 1)]
+
+
+def test_fruitful_miss_is_fetched_and_dropped(searches):
+    calls, answers = searches
+    record_search_miss("Haskell Developer")
+    answers["remotive"] = [make_job(100, "Haskell Developer")]
+
+    assert miss_runner.run_once() == 1
+    assert [source for source, _ in calls] == list(miss_runner.SEARCHABLE_SOURCES)
+    assert top_misses() == []
+    assert get_cached_jobs_page("haskell developer")[0]
+
+
+def test_fruitless_miss_waits_before_a_retry(searches):
+    calls, _ = searches
+    record_search_miss("Haskell Developer")
+    assert miss_runner.run_once() == 0
+    calls.clear()
+    assert miss_runner.run_once() == 0
+    assert calls == []
+    assert top_misses() == [("Haskell Developer", 1)]
+
+
+def test_interrupted_title_resumes_without_repeating_sources(searches):
+    calls, _ = searches
+    record_search_miss("Haskell Developer")
+    first, *rest = miss_runner.SEARCHABLE_SOURCES
+    miss_runner.save_state({'last_call': {}, 'current': {'key': 'haskell developer', 'done': [first], 'added': 0}})
+
+    miss_runner.run_once()
+    assert [source for source, _ in calls] == rest
+    assert miss_runner.load_state()['current'] is None
+
+
+def test_miss_waits_while_a_full_refresh_holds_the_lease(searches):
+    calls, answers = searches
+    record_search_miss("Haskell Developer")
+    answers["remotive"] = [make_job(100, "Haskell Developer")]
+    db_storage = DBStorage()
+    assert db_storage.acquire_refresh_lease("refresher", 60)
+
+    assert miss_runner.run_once() == 0
+    assert top_misses() == [("Haskell Developer", 1)]
+    assert not get_cached_jobs_page("haskell developer")[0]
+    assert miss_runner.load_state()['current']['key'] == 'haskell developer'
+
+    db_storage.release_refresh_lease("refresher")
+    calls.clear()
+    assert miss_runner.run_once() == 1
+    assert top_misses() == []
+    assert ("remotive", "Haskell Developer") in calls
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""On-demand request profiling: triggers, written profiles and the ring buffer"""
+import json
+import os
+
+import pytest
+
+from config import Config
+from utils.profiling import PROFILE_HEADER, profile_trigger, profiled
+
+
+@pytest.fixture
+def profile_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(Config, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_RATE", 0.0)
+    return tmp_path / "profiles"
+
+
+def test_triggers(profile_dir, monkeypatch):
+    assert profile_trigger("secret") == "token"
+    assert profile_trigger(None, "secret") == "token"
+    assert profile_trigger("guess") is None
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_RATE", 1.0)
+    assert profile_trigger() == "sample"
+    monkeypatch.setattr(Config, "PROFILE_TOKEN", None)
+    monkeypatch.setattr(Config, "PROFILE_SAMPLE_RATE", 0.0)
+    assert profile_trigger("secret") is None
+
+
+def test_profile_is_written_with_its_top_functions(profile_dir):
+    with profiled("token", {"path": "/a2a/jobsearchai"}) as profile_id:
+        sorted(range(10000), key=lambda i: -i)
+    assert profile_id
+    assert (profile_dir / f"{profile_id}.prof").exists()
+    metadata = json.loads((profile_dir / f"{profile_id}.json").read_text())
+    assert metadata["path"] == "/a2a/jobsearchai" and metadata["trigger"] == "token" and metadata["top"]
+
+
+def test_only_one_request_is_profiled_at_a_time(profile_dir):
+    with profiled("token") as outer:
+        with profiled("sample") as inner:
+            pass
+    assert outer and inner is None
+
+
+def test_ring_buffer_keeps_the_newest_profiles(profile_dir, monkeypatch):
+    monkeypatch.setattr(Config, "PROFILE_KEEP", 2)
+    ids = []
+    for _ in range(3):
+        with profiled("token") as profile_id:
+            ids.append(profile_id)
+    assert sorted(os.listdir(profile_dir)) == sorted(f"{i}{ext}" for i in ids[1:] for ext in (".prof", ".json"))
+
+
+def test_request_with_the_token_is_profiled(cache, profile_dir):
+    from app import app
+    response = app.test_client().post("/a2a/jobsearchai", headers={PROFILE_HEADER: "secret"}, json={
+        "jsonrpc": "2.0", "id": 1, "method": "message/send",
+        "params": {"message": {"role": "user", "messageId": "m1",
+                               "parts": [{"kind": "text", "text": "python developer"}]}},
+    })
+    profile_id = response.headers["X-Profile-Id"]
+    assert (profile_dir / f"{profile_id}.json").exists()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""The refresh lease lets exactly one process refresh the cache at a time"""
+import threading
+import time
+
+import services.cache_logic as cache_logic
+from conftest import SAMPLE_JOBS
+from models.cache_state import CacheState
+from schemas.dbStorage import DBStorage
+from services.cache_logic import refresh_cache
+
+
+def test_lease_is_exclusive_until_released(fresh_db):
+    db_storage = DBStorage()
+    assert db_storage.acquire_refresh_lease("a", 60)
+    assert not db_storage.acquire_refresh_lease("b", 60)
+    db_storage.release_refresh_lease("a")
+    assert db_storage.acquire_refresh_lease("b", 60)
+
+
+def test_expired_lease_is_taken_over_and_the_old_owner_notices(fresh_db):
+    db_storage = DBStorage()
+    assert db_storage.acquire_refresh_lease("crashed", -1)
+    assert db_storage.acquire_refresh_lease("b", 60)
+    assert not db_storage.renew_refresh_lease("crashed", 60, CacheState.STORING)
+    assert db_storage.get_cache_state().refresh_owner == "b"
+
+
+def test_concurrent_refreshes_fetch_once(cache, monkeypatch):
+    fetches = []
+
+    def slow_fetch():
+        fetches.append(threading.get_ident())
+        time.sleep(0.2)
+        return list(SAMPLE_JOBS)
+
+    monkeypatch.setattr(cache_logic, "aggregate_job_listings", slow_fetch)
+    generation = DBStorage().get_cache_state().generation
+    results = []
+
+    def refresh():
+        try:
+            results.append(refresh_cache(force=True))
+        finally:
+            DBStorage.remove_sessions()
+
+    threads = [threading.Thread(target=refresh) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert len(fetches) == 1
+    assert sorted(results) == [False] * 5 + [True]
+    state = DBStorage().get_cache_state()
+    assert state.generation == generation + 1 and state.refresh_status == CacheState.IDLE
+
+
+def test_failed_refresh_is_recorded_and_not_retried_at_once(cache, monkeypatch):
+    fetches = []
+
+    def failing_fetch():
+        fetches.append(1)
+        raise RuntimeError("every source is down")
+
+    monkeypatch.setattr(cache_logic, "aggregate_job_listings", failing_fetch)
+    assert refresh_cache(force=True) is False
+    state = DBStorage().get_cache_state()
+    assert state.refresh_status == CacheState.FAILED and "every source is down" in state.refresh_error
+    assert state.refresh_owner is None
+
+    assert refresh_cache() is False
+    assert len(fetches) == 1
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""Repeated searches are answered from memory until the cache generation changes"""
+from sqlalchemy import event
+
+import services.cache_logic as cache_logic
+from agent.handler import process_message
+from config import Config
+from schemas.dbStorage import DBStorage
+
+
+def count_statements():
+    """Records every SQL statement the cache database runs"""
+    statements = []
+    event.listen(DBStorage.get_engine(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+def test_response_cache_hit_makes_no_database_round_trip(cache):
+    first = process_message("python developer")
+    statements = count_statements()
+    assert process_message("python developer") == first
+    assert statements == []
+
+
+def test_generation_is_checked_again_after_the_window(cache, monkeypatch):
+    process_message("python developer")
+    monkeypatch.setattr(Config, "GENERATION_CHECK_SECONDS", 0)
+    statements = count_statements()
+    process_message("python developer")
+    assert statements
+
+
+def test_refresh_in_this_process_is_seen_immediately(cache):
+    generation = cache_logic.current_generation()
+    cache_logic.save_to_cache()
+    assert cache_logic.current_generation() == generation + 1
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""Opening a database made by an older release keeps its tasks and conversations"""
+import sqlite3
+
+from sqlalchemy import inspect
+
+from models.a2a_task import A2ATask
+from schemas.dbStorage import DBStorage
+
+
+def test_outdated_tables_are_migrated_or_rebuilt(fresh_db):
+    connection = sqlite3.connect(fresh_db / "cache.db")
+    connection.executescript("""
+        CREATE TABLE a2a_task (id VARCHAR(36) PRIMARY KEY, state VARCHAR(20) NOT NULL, user_message TEXT NOT NULL,
+                               result_text TEXT, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL);
+        INSERT INTO a2a_task VALUES ('t1', 'completed', 'python developer', 'done',
+                                     '2026-01-01 10:00:00', '2026-01-01 10:00:00');
+        CREATE TABLE cache_state (id INTEGER PRIMARY KEY, generation INTEGER NOT NULL, refreshed_at DATETIME);
+        INSERT INTO cache_state VALUES (1, 7, NULL);
+        CREATE TABLE cache_job_data (id INTEGER PRIMARY KEY, job_title VARCHAR(255));
+        INSERT INTO cache_job_data VALUES (1, 'Python Developer');
+    """)
+    connection.commit()
+    connection.close()
+
+    db_storage = DBStorage()
+    task = db_storage.get_task('t1')
+    assert task.result_text == 'done' and task.push_url is None
+    state = db_storage.get_cache_state()
+    assert state.generation == 7 and state.refresh_status == 'idle'
+
+    columns = {column['name'] for column in inspect(DBStorage.get_engine()).get_columns('cache_job_data')}
+    assert 'job_description' in columns
+    assert db_storage.get_page_by_title('python developer', 10)[0] == []
+
+    # Migrated tables keep working for new rows
+    db_storage.save(A2ATask("backend engineer", push_url="https://hooks.example.com/a2a"))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""Semantic matching never builds its index inside a request"""
+import shutil
+
+import services.semantic_search as semantic_search
+from agent.handler import process_message
+from config import Config
+from services.refresh_runner import run_once
+from services.semantic_search import ensure_semantic_index, search_similar
+
+DESCRIPTION = ("We need someone to design Go and Kubernetes backends with PostgreSQL, own their deployments and "
+               "on-call rotation, and work with product managers on the roadmap for our platform team. "
+               "Strong Go experience and Kubernetes operations knowledge are required for this position.")
+
+
+def test_description_is_matched_on_content(cache):
+    assert "Backend Engineer" in process_message(DESCRIPTION)
+
+
+def test_missing_index_is_not_built_on_the_request_path(cache, monkeypatch):
+    shutil.rmtree(Config.SEMANTIC_INDEX_DIR)
+    builds = []
+    monkeypatch.setattr(semantic_search, "build_semantic_index", lambda *args: builds.append(args))
+    assert search_similar(DESCRIPTION) == []
+    process_message(DESCRIPTION)
+    assert builds == []
+
+
+def test_refresh_runner_builds_a_missing_index(cache):
+    shutil.rmtree(Config.SEMANTIC_INDEX_DIR)
+    assert run_once() is False  # The cache is fresh
+    assert search_similar(DESCRIPTION)
+    assert ensure_semantic_index() is None
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+"""Skill extraction at ingest and searches answered from the skill index"""
+import re
+
+from agent.handler import process_message
+from services.cache_logic import get_cached_jobs_by_skills
+from utils.skills import extract_job_skills, extract_query_skills
+
+
+def test_ambiguous_aliases_only_count_in_tags_and_queries():
+    assert extract_job_skills([], "Ready to go? We ship python services.") == {"python"}
+    assert extract_job_skills(["Go"], "") == {"go"}
+    assert extract_query_skills("jobs requiring go and kubernetes") == ["go", "kubernetes"]
+
+
+def test_longest_alias_wins_and_separators_split():
+    assert extract_query_skills("react native developer") == ["react native"]
+    assert extract_job_skills([], "python/django, ci/cd.") == {"python", "django", "ci/cd"}
+
+
+def test_skill_search_intersects_the_index(cache):
+    assert [job.job_title for job in get_cached_jobs_by_skills(["kubernetes", "go"])] == ["backend engineer"]
+    assert [job.job_title for job in get_cached_jobs_by_skills(["react", "typescript"])] == ["frontend developer"]
+    assert get_cached_jobs_by_skills(["rust"]) == []
+
+
+def test_skill_search_with_a_title(cache):
+    titles = {job.job_title for job in get_cached_jobs_by_skills(["python"], "python developer")}
+    assert titles and all("python developer" in title for title in titles)
+
+
+def test_skill_query_is_answered_without_a_title(cache):
+    response = process_message("jobs requiring react and typescript")
+    assert "Frontend Developer" in response
+    assert not re.search(r"Full Stack", response)
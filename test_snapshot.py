@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Cache snapshots round-trip every table and the semantic index, and reject damaged files"""
+import json
+import zipfile
+
+import pytest
+
+from config import Config
+from schemas.dbStorage import DBStorage
+from services.cache_logic import current_generation, get_cached_jobs_by_skills, get_cached_jobs_page
+from services.semantic_search import search_similar
+from services.snapshot import SnapshotError, export_snapshot, import_snapshot, import_snapshot_if_empty
+
+
+@pytest.fixture
+def snapshot(cache, tmp_path):
+    path = tmp_path / "snapshot.zip"
+    manifest = export_snapshot(str(path))
+    return path, manifest
+
+
+def switch_to_empty_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, "DATABASE_URL", f"sqlite:///{tmp_path / 'restored.db'}")
+    monkeypatch.setattr(Config, "SEMANTIC_INDEX_DIR", str(tmp_path / "restored_index"))
+
+
+def test_snapshot_round_trip(snapshot, monkeypatch, tmp_path):
+    path, manifest = snapshot
+    refreshed_at = DBStorage().get_cache_state().refreshed_at
+    jobs_before = get_cached_jobs_page("python developer")[0]
+    current_generation()
+
+    switch_to_empty_cache(monkeypatch, tmp_path)
+    assert import_snapshot_if_empty(str(path))
+    assert manifest["counts"]["cache_job_data"] == 8
+
+    state = DBStorage().get_cache_state()
+    assert state.refreshed_at == refreshed_at
+    assert current_generation() == state.generation
+    assert get_cached_jobs_page("python developer")[0] == jobs_before
+    assert [job.job_title for job in get_cached_jobs_by_skills(["kubernetes", "go"])] == ["backend engineer"]
+    assert search_similar("react typescript interfaces")
+
+
+def test_snapshot_is_not_loaded_over_data(snapshot):
+    path, _ = snapshot
+    assert import_snapshot_if_empty(str(path)) is False
+
+
+def rewrite(path, member, transform):
+    with zipfile.ZipFile(path) as archive:
+        members = {name: archive.read(name) for name in archive.namelist()}
+    members[member] = transform(members[member])
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+
+
+def test_tampered_member_is_rejected(snapshot):
+    path, _ = snapshot
+    rewrite(path, "cache_job_data.jsonl", lambda data: data.replace(b"Company 1", b"Company X"))
+    with pytest.raises(SnapshotError, match="Checksum"):
+        import_snapshot(str(path))
+
+
+def test_other_versions_are_rejected(snapshot):
+    path, _ = snapshot
+    rewrite(path, "manifest.json", lambda data: json.dumps({**json.loads(data), "version": 99}).encode())
+    with pytest.raises(SnapshotError, match="version"):
+        import_snapshot(str(path))
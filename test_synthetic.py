@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""Synthetic benchmark data is deterministic and shaped like real boards"""
+import random
+from collections import Counter
+
+from benchmarks.search_scaling import LATENCY_METRICS, find_regressions
+from benchmarks.synthetic import add_typo, generate_jobs, generate_queries
+
+
+def test_same_seed_same_jobs_and_queries():
+    jobs = generate_jobs(200, seed=7)
+    assert jobs == generate_jobs(200, seed=7)
+    assert jobs != generate_jobs(200, seed=8)
+    assert generate_queries(jobs, 20, seed=1) == generate_queries(jobs, 20, seed=1)
+
+
+def test_titles_are_skewed_and_descriptions_vary_in_length():
+    jobs = generate_jobs(1000)
+    counts = Counter(job.job_title for job in jobs).most_common()
+    assert counts[0][1] > 10 * counts[-1][1]
+    lengths = sorted(len(job.job_description) for job in jobs)
+    assert lengths[0] >= 200 and lengths[-1] > 4 * lengths[len(lengths) // 2]
+
+
+def test_exact_queries_match_titles_and_typo_queries_do_not():
+    jobs = generate_jobs(300)
+    exact, typos = generate_queries(jobs, 30)
+    titles = [job.job_title.lower() for job in jobs]
+    assert len(exact) == len(typos) == 30
+    assert all(any(query in title for title in titles) for query in exact)
+    assert not any(query in title for query in typos for title in titles)
+
+
+def test_typo_changes_one_letter():
+    rng = random.Random(3)
+    for _ in range(50):
+        typo = add_typo("engineer", rng)
+        assert typo != "engineer" and abs(len(typo) - len("engineer")) <= 1
+
+
+def test_regressions_need_both_tolerance_and_minimum_delta():
+    def scale(p50_ms, jobs_per_s=1000.0):
+        return {"jobs": 1000, "ingest": {"jobs_per_s": jobs_per_s},
+                **{metric: {"p50_ms": p50_ms} for metric in LATENCY_METRICS}}
+
+    baseline = {"scales": [scale(10.0)]}
+    assert find_regressions({"scales": [scale(10.5)]}, baseline, tolerance=0.2, min_delta_ms=1.0) == []
+    assert find_regressions({"scales": [scale(11.5)]}, baseline, tolerance=0.2, min_delta_ms=2.0) == []
+    regressions = find_regressions({"scales": [scale(20.0, jobs_per_s=500.0)]}, baseline, tolerance=0.2,
+                                   min_delta_ms=1.0)
+    assert {regression["metric"] for regression in regressions} == set(LATENCY_METRICS) | {"ingest"}
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""Asynchronous A2A tasks: lifecycle, expiry and push URL checks"""
+import socket
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+import agent.handler as handler
+import services.task_queue as task_queue
+from config import Config
+from models.a2a_task import A2ATask
+from schemas.dbStorage import DBStorage
+from services.task_queue import InvalidPushUrl, check_push_url, get_task, submit_task
+
+
+def wait_for(task_id, timeout=10):
+    """Polls a task until it finishes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        task = get_task(task_id)
+        if task.state in (A2ATask.COMPLETED, A2ATask.FAILED):
+            return task
+        time.sleep(0.02)
+    pytest.fail(f"task {task_id} did not finish")
+
+
+def test_task_completes_with_the_search_results(cache):
+    task = submit_task("python developer")
+    assert task.state == A2ATask.SUBMITTED
+    finished = wait_for(task.id)
+    assert finished.state == A2ATask.COMPLETED
+    assert "Python Developer" in finished.result_text
+
+
+def test_task_that_raises_ends_failed(cache, monkeypatch):
+    def broken(message, context_id=None):
+        raise RuntimeError("database is gone")
+    monkeypatch.setattr(handler, "handle_job_search", broken)
+    finished = wait_for(submit_task("python developer").id)
+    assert finished.state == A2ATask.FAILED
+    assert finished.to_a2a()["status"]["state"] == "failed"
+
+
+def test_stalled_task_is_failed_on_lookup(fresh_db):
+    db_storage = DBStorage()
+    task = A2ATask("python developer")
+    task.set_state(A2ATask.WORKING)
+    task.updated_at = datetime.now() - timedelta(seconds=Config.TASK_STALE_SECONDS + 1)
+    db_storage.save(task)
+
+    polled = get_task(task.id)
+    assert polled.state == A2ATask.FAILED
+    assert "interrupted" in polled.result_text
+
+
+def test_recent_unfinished_task_is_left_alone(fresh_db):
+    task = A2ATask("python developer")
+    task.set_state(A2ATask.WORKING)
+    DBStorage().save(task)
+    assert get_task(task.id).state == A2ATask.WORKING
+
+
+def test_expired_tasks_are_pruned(fresh_db, monkeypatch):
+    db_storage = DBStorage()
+    old = A2ATask("old")
+    old.set_state(A2ATask.COMPLETED, "done")
+    old.updated_at = datetime.now() - timedelta(hours=Config.TASK_TTL_HOURS + 1)
+    db_storage.save(old)
+    recent = A2ATask("recent")
+    db_storage.save(recent)
+
+    monkeypatch.setattr(task_queue, "_last_prune", None)
+    task_queue._prune_tasks(db_storage)
+    assert db_storage.get_task(old.id) is None
+    assert db_storage.get_task(recent.id) is not None
+
+
+@pytest.fixture
+def resolve_to(monkeypatch):
+    """Makes every host resolve to the given address (no DNS lookups in tests)"""
+    def set_address(address):
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        monkeypatch.setattr(socket, "getaddrinfo",
+                            lambda host, port, **kwargs: [(family, socket.SOCK_STREAM, 6, "", (address, port))])
+    return set_address
+
+
+def test_public_https_push_url_is_accepted(resolve_to):
+    resolve_to("93.184.216.34")
+    check_push_url("https://hooks.example.com/a2a")
+
+
+@pytest.mark.parametrize("url", [
+    "http://hooks.example.com/a2a",
+    "file:///etc/passwd",
+    "https:///no-host",
+    "https://hooks.example.com:99999/a2a",
+])
+def test_non_https_or_malformed_push_urls_are_rejected(resolve_to, url):
+    resolve_to("93.184.216.34")
+    with pytest.raises(InvalidPushUrl):
+        check_push_url(url)
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1", "10.0.0.5", "192.168.1.1", "169.254.169.254", "::1", "fd00::1",
+                                     "100.64.0.1", "0.0.0.0"])
+def test_internal_addresses_are_rejected(resolve_to, address):
+    resolve_to(address)
+    with pytest.raises(InvalidPushUrl):
+        check_push_url("https://hooks.example.com/a2a")
+
+
+def test_allow_list_limits_push_hosts(resolve_to, monkeypatch):
+    resolve_to("93.184.216.34")
+    monkeypatch.setattr(Config, "TASK_PUSH_ALLOWED_HOSTS", {"hooks.example.com"})
+    check_push_url("https://HOOKS.example.com/a2a")
+    with pytest.raises(InvalidPushUrl):
+        check_push_url("https://other.example.com/a2a")
+
+
+def test_submission_with_internal_push_url_is_refused(fresh_db, resolve_to):
+    from app import app
+    resolve_to("169.254.169.254")
+    response = app.test_client().post("/a2a/jobsearchai", json={
+        "jsonrpc": "2.0", "id": 1, "method": "message/send",
+        "params": {"configuration": {"blocking": False,
+                                     "pushNotificationConfig": {"url": "https://metadata.internal/latest"}},
+                   "message": {"role": "user", "messageId": "m1",
+                               "parts": [{"kind": "text", "text": "python developer"}]}},
+    })
+    assert response.get_json()["error"]["code"] == -32602
+
+
+def test_push_is_rechecked_and_never_follows_redirects(fresh_db, resolve_to, monkeypatch):
+    from models.a2a_task import A2ATask
+    calls = []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr(task_queue.requests, "post", lambda url, **kwargs: calls.append(kwargs) or Response())
+    task = A2ATask("python developer", push_url="https://hooks.example.com/a2a")
+
+    resolve_to("93.184.216.34")
+    task_queue._push_result(task)
+    assert calls and calls[0]["allow_redirects"] is False
+
+    # The host now resolves to an internal address: nothing is sent
+    resolve_to("10.1.2.3")
+    task_queue._push_result(task)
+    assert len(calls) == 1
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Job titles come from the regex, then the cached-title gazetteer, and only then the LLM"""
+import pytest
+
+import agent.handler as handler
+from schemas.dbStorage import DBStorage
+from utils.gazetteer import Gazetteer, TitleGazetteer
+
+
+def test_gazetteer_prefers_the_longest_phrase():
+    gazetteer = Gazetteer()
+    gazetteer.add("engineer")
+    gazetteer.add("backend engineer")
+    gazetteer.add("senior backend engineer")
+    assert gazetteer.find_longest("any senior backend engineer roles?") == "senior backend engineer"
+    assert gazetteer.find_longest("a backend engineer please") == "backend engineer"
+    assert gazetteer.find_longest("nothing known here") is None
+
+
+def test_gazetteer_breaks_length_ties_by_frequency():
+    gazetteer = Gazetteer()
+    gazetteer.add("data engineer", weight=1)
+    gazetteer.add("data scientist", weight=5)
+    assert gazetteer.find_longest("data engineer or data scientist") == "data scientist"
+
+
+def test_title_gazetteer_indexes_full_titles_and_sub_phrases():
+    gazetteer = TitleGazetteer.from_titles([("Senior Backend Engineer II", 2)],
+                                           normalizer=DBStorage.normalize_for_storage)
+    assert gazetteer.find_longest("backend engineer jobs") == "backend engineer"
+    assert gazetteer.find_longest("I am a senior backend engineer ii") == "senior backend engineer ii"
+
+
+def test_multi_word_catalogue_title_skips_the_llm(cache, monkeypatch):
+    def no_llm(message):
+        pytest.fail("the LLM was asked for a title the cache already holds")
+    monkeypatch.setattr(handler, "extract_title_with_llm", no_llm)
+
+    message = "I would love to work as a mid-level full stack engineer somewhere nice"
+    assert handler.resolve_job_title(message) == "mid-level full stack engineer"
+    assert "Mid-Level Full Stack Engineer" in handler.process_message(message)
+
+
+def test_unknown_long_message_falls_back_to_the_llm(cache, monkeypatch):
+    asked = []
+    monkeypatch.setattr(handler, "extract_title_with_llm",
+                        lambda message: asked.append(message) or {"status": "True", "job_title": "astronaut"})
+    assert handler.resolve_job_title("I have always dreamed of floating in orbit one day") == "astronaut"
+    assert asked
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""Stateless continuation cursors for paginated responses"""
+import base64
+import json
+import re
+from typing import Dict, Optional
+
+# Every token encodes a JSON object, i.e. starts with the encoding of '{"'
+_CURSOR_PREFIX = "eyJ"
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_=-]+")
+
+
+def encode_cursor(data: Dict) -> str:
+    """Packs cursor data into a short URL-safe token"""
+    raw = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> Optional[Dict]:
+    """Unpacks a token made by encode_cursor; returns None if it is not a valid cursor"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def looks_like_cursor(token: str) -> bool:
+    """True for tokens shaped like encode_cursor output (a JSON object), even truncated or corrupted ones"""
+    return bool(token) and token.startswith(_CURSOR_PREFIX) and _TOKEN_PATTERN.fullmatch(token) is not None
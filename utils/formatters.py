@@ -1,23 +1,33 @@
 #!/usr/bin/env python
 """Parse texts"""
 from pprint import pprint
-from bs4 import BeautifulSoup
 from typing import Optional, List, Dict
 
 
 def html_to_text(html_content):
     """Convert HTML content to plain text"""
+    from bs4 import BeautifulSoup  # Only needed while ingesting jobs
     soup = BeautifulSoup(html_content, 'html.parser')
     return soup.get_text().strip()
 
-def format_job_response(jobs: List, recommendations: Optional[List[Dict]], job_title:str) -> str:
+def format_job_response(jobs: List, recommendations: Optional[List[Dict]], job_title:str,
+                        start_index: int = 1, next_cursor: Optional[str] = None,
+                        show_recommendations: bool = True, recommendations_paused: bool = False,
+                        top_skills: Optional[List[str]] = None, has_more: bool = False) -> str:
     """
-    Format jobs and recommendations into a nice message
+    Format one page of jobs and recommendations into a nice message
 
-    :param jobs: List of jobs object from database
+    :param jobs: List of JobRecords from the cache (one page)
     :param recommendations: List of recommendation dicts or None
-    :param job_title:
-    :return: The search term user used
+    :param job_title: The search term user used
+    :param start_index: Number of the first job on this page
+    :param next_cursor: Token for the next page, if there is one
+    :param show_recommendations: False on follow-up pages, which carry no recommendations section
+    :param recommendations_paused: True when recommendations were skipped because the LLM queue was full
+    :param top_skills: Most requested skills across the jobs (from the skill index), shown when there
+        are no LLM recommendations
+    :param has_more: Without a cursor, the conversation holds more results (a bare "more" shows them)
+    :return: The formatted message
 
     ===========JOBS FOUND===========
     Example: Here is a list of jobs for {job_title}:
@@ -30,49 +40,82 @@ def format_job_response(jobs: List, recommendations: Optional[List[Dict]], job_t
     ==========PORTFOLIO RECOMMENDATIONS===========
     Based on: {first_job_title} at {first_company_name}..
     Portfolio Project Recommendations:
+
+    ==========MORE RESULTS===========
+    Reply "more {cursor}" to see the next page.
     """
 
     if not jobs:
         return format_no_jobs_message(job_title)
 
-    # Start building the message
-    # print("==================JOBS FOUND==================")
-    # pprint(jobs)
-    message = f"Here is a list of jobs for '{job_title.title()}':\n\n"
-    all_jobs_list = [jobs.to_dict() for jobs in jobs]
-
-    # Add all jobs to message
-    for i, job in enumerate(all_jobs_list, 1):
-        message += f"{i}. {job['job_title'].title()} @ {job['company_name']} - {job['location']} - "
-        if job.get('job_url'):
-            message += f"[Apply Here]({job['job_url']})\n"
+    # Build the message from parts; the cost is proportional to the page, not the result set
+    if start_index == 1:
+        parts = [f"Here is a list of jobs for '{job_title.title()}':\n\n"]
+    else:
+        parts = [f"More jobs for '{job_title.title()}':\n\n"]
+
+    # Add all jobs to message (read straight off the records, no per-job dict copies)
+    for i, job in enumerate(jobs, start_index):
+        parts.append(f"{i}. {job.job_title.title()} @ {job.company_name} - {job.location} - ")
+        if job.job_url:
+            parts.append(f"[Apply Here]({job.job_url})\n")
         else:
-            message += "\n"
+            parts.append("\n")
 
         # Add description (truncate if too long)
-        desc = job.get('job_description', 'No description available')
+        desc = job.job_description or 'No description available'
         if len(desc) > 150:
             desc = desc[:150] + "..."
-        message += f"   Description: {desc}\n\n"
+        parts.append(f"   Description: {desc}\n\n")
 
     # Add recommendations if available
+    if show_recommendations:
+        parts.append(format_recommendations(jobs[0], recommendations, recommendations_paused, top_skills))
+
+    if next_cursor:
+        parts.append(f'\nShowing jobs {start_index}-{start_index + len(jobs) - 1}. '
+                     f'Reply "more {next_cursor}" to see the next page.\n')
+    elif has_more:
+        parts.append(f'\nShowing jobs {start_index}-{start_index + len(jobs) - 1}. '
+                     'Reply "more" to see the next page.\n')
+
+    return "".join(parts)
+
+
+def format_recommendations(job, recommendations: Optional[List[Dict]], recommendations_paused: bool = False,
+                           top_skills: Optional[List[str]] = None) -> str:
+    """Portfolio project recommendations section for a job (or why there are none)"""
+    parts = []
     if recommendations:
-        first_job = jobs[0].to_dict()  # Assuming jobs are objects with a to_dict method
-        message += f"Portfolio Project Recommendations\n"
-        message += f"Based on: {first_job['job_title']} at {first_job['company_name']}\n"
+        parts.append("Portfolio Project Recommendations\n")
+        parts.append(f"Based on: {job.job_title} at {job.company_name}\n")
 
         for i, rec in enumerate(recommendations, 1):
-            message += f"{i}.  {rec['title']}\n"
-            message += f"   • {rec['description']}\n"
-            message += f"   • Stack: {', '.join(rec['technologies'])}\n"
-            message += f"   • Demonstrates: {rec['demonstrates']}\n"
-            message += f"   • Time: {rec['timeline']}\n\n"
+            parts.append(f"{i}.  {rec['title']}\n")
+            parts.append(f"   • {rec['description']}\n")
+            parts.append(f"   • Stack: {', '.join(rec['technologies'])}\n")
+            parts.append(f"   • Demonstrates: {rec['demonstrates']}\n")
+            parts.append(f"   • Time: {rec['timeline']}\n\n")
+
+    elif recommendations_paused:
+        parts.append("Portfolio project recommendations are paused while I'm busy. Ask again in a moment.\n")
 
     else:
-        message += "No portfolio project recommendations available at this time.\n"
+        parts.append("No portfolio project recommendations available at this time.\n")
+
+    if not recommendations and top_skills:
+        parts.append(f"Skills these employers ask for most: {', '.join(top_skills)}\n"
+                     "A portfolio project combining them is a strong place to start.\n")
+    return "".join(parts)
 
 
-    return message
+def format_job_recommendations(job, number: int, recommendations: Optional[List[Dict]],
+                               recommendations_paused: bool = False, top_skills: Optional[List[str]] = None) -> str:
+    """Recommendations for one job of a previous list, e.g. after 'recommend for job 3'"""
+    parts = [f"{number}. {job.job_title.title()} @ {job.company_name} - {job.location} - "]
+    parts.append(f"[Apply Here]({job.job_url})\n\n" if job.job_url else "\n\n")
+    parts.append(format_recommendations(job, recommendations, recommendations_paused, top_skills))
+    return "".join(parts)
 
 
 def format_no_jobs_message(job_title: str) -> str:
@@ -81,3 +124,19 @@ def format_no_jobs_message(job_title: str) -> str:
             "--'python developer'\n"
             "--'looking for backend engineer jobs'\n"
             "--'show me data analyst positions'\n\n."""
+
+
+def describe_search(job_title: str, filters: Optional[Dict] = None) -> str:
+    """Search label with its filters, e.g. 'python developer (remote, last 7 days, europe)'"""
+    if not filters:
+        return job_title
+    parts = []
+    if 'remote' in filters:
+        parts.append("remote" if filters['remote'] else "on-site")
+    if filters.get('days'):
+        parts.append("last 24 hours" if filters['days'] == 1 else f"last {filters['days']} days")
+    if filters.get('location'):
+        parts.append(filters['location'])
+    if filters.get('source'):
+        parts.append(f"from {filters['source']}")
+    return f"{job_title} ({', '.join(parts)})"
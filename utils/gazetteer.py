@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+ -- gazetteer.py --
+    Word-level trie of known phrases (job titles, skills, ...) used to find
+    the longest known phrase inside arbitrary user text without an LLM call.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+_TERMINAL = "\0"
+
+
+class Gazetteer:
+    """Trie over word tokens that returns the longest known phrase in a text"""
+
+    def __init__(self, normalizer: Optional[Callable[[str], str]] = None):
+        """Creates an empty gazetteer. `normalizer` is applied to phrases and texts alike"""
+        self._root: Dict = {}
+        self._normalizer = normalizer
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _tokenize(self, text: str) -> List[str]:
+        """Splits text into the tokens the trie is keyed by"""
+        if not text:
+            return []
+        if self._normalizer:
+            text = self._normalizer(text) or ""
+        return text.lower().split()
+
+    def add(self, phrase: str, value: Optional[str] = None, weight: int = 1):
+        """Adds a phrase; `value` is what lookups return (defaults to the normalized phrase)"""
+        tokens = self._tokenize(phrase)
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        if _TERMINAL in node:
+            stored_value, stored_weight = node[_TERMINAL]
+            node[_TERMINAL] = (stored_value, stored_weight + weight)
+        else:
+            node[_TERMINAL] = (value or " ".join(tokens), weight)
+            self._size += 1
+
+    def find_all(self, text: str) -> List[Tuple[str, int, int, int]]:
+        """
+        Finds every known phrase in the text.
+        :return: List of (value, start token index, length in tokens, weight)
+        """
+        tokens = self._tokenize(text)
+        matches = []
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if _TERMINAL in node:
+                    value, weight = node[_TERMINAL]
+                    matches.append((value, start, end - start + 1, weight))
+        return matches
+
+    def find_longest(self, text: str) -> Optional[str]:
+        """Returns the longest known phrase in the text (ties go to the most frequent)"""
+        best = None
+        for value, start, length, weight in self.find_all(text):
+            key = (length, weight, -start)
+            if best is None or key > best[0]:
+                best = (key, value)
+        return best[1] if best else None
+
+
+class TitleGazetteer(Gazetteer):
+    """Gazetteer of the job titles currently held in the cache"""
+
+    def __init__(self, normalizer: Optional[Callable[[str], str]] = None, max_phrase_words: int = 4):
+        super().__init__(normalizer)
+        self.max_phrase_words = max_phrase_words
+
+    def add_title(self, title: str, count: int = 1):
+        """
+        Indexes a cached title. Besides the full title, every contiguous run of
+        2..max_phrase_words words is indexed so that "senior backend engineer ii"
+        also teaches the gazetteer "backend engineer".
+        """
+        tokens = self._tokenize(title)
+        if not tokens:
+            return
+        self.add(" ".join(tokens), weight=count)
+        for size in range(2, min(self.max_phrase_words, len(tokens) - 1) + 1):
+            for start in range(len(tokens) - size + 1):
+                self.add(" ".join(tokens[start:start + size]), weight=count)
+
+    @classmethod
+    def from_titles(cls, title_counts: Iterable[Tuple[str, int]], normalizer=None, max_phrase_words: int = 4):
+        """Builds a gazetteer from (title, count) pairs"""
+        gazetteer = cls(normalizer, max_phrase_words)
+        for title, count in title_counts:
+            gazetteer.add_title(title, count)
+        return gazetteer
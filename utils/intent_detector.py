@@ -2,6 +2,170 @@
 """Takes messy user input and extracts a clean job title to search with"""
 import re
 
+from config import Config
+from utils.job_fields import find_location
+from utils.skills import extract_query_skills
+
+
+_MORE_PATTERN = re.compile(r"^\s*(?:show\s+(?:me\s+)?)?more(?:\s+(?:results|jobs))?\b\s*(\S+)?\s*$", re.IGNORECASE)
+
+
+def parse_more_request(user_input):
+    """
+    Detects a request for the next page of results, e.g. "more <cursor>".
+
+    Args:
+        user_input: Raw user message
+
+    Returns:
+        The cursor token ("" when none was given) or None if this is not a "more" request
+    """
+    if not user_input or not isinstance(user_input, str):
+        return None
+    match = _MORE_PATTERN.match(user_input)
+    if not match:
+        return None
+    return match.group(1) or ""
+
+
+def looks_like_job_description(user_input):
+    """
+    Detects a pasted job description (or a long free-text brief) rather than a search.
+
+    Args:
+        user_input: Raw user message
+
+    Returns:
+        True when the message is long enough to be matched on its content
+    """
+    if not user_input or not isinstance(user_input, str):
+        return False
+    words = len(user_input.split())
+    return words >= Config.SEMANTIC_MIN_WORDS or (user_input.count("\n") >= 2 and words >= Config.SEMANTIC_MIN_WORDS // 2)
+
+
+_REMOTE_PATTERN = re.compile(r"\b(?:fully\s+)?remote(?:[- ]only)?\b", re.IGNORECASE)
+_ONSITE_PATTERN = re.compile(r"\b(?:on[- ]?site|in[- ]office|in[- ]person|not remote)\b", re.IGNORECASE)
+_SOURCE_PATTERN = re.compile(r"\b(?:from|on|via)\s+(remotive|remote\s?ok|jobicy|arbeitnow)\b", re.IGNORECASE)
+_RECENCY_PATTERN = re.compile(
+    r"\b(?:posted\s+|added\s+|published\s+)?"
+    r"(?:(today|in the (?:last|past) 24 hours)|(this week|(?:in the )?(?:last|past) week)|"
+    r"(this month|(?:in the )?(?:last|past) month)|(?:in the )?(?:last|past) (\d{1,3}) days?)\b",
+    re.IGNORECASE
+)
+_LOCATION_CUE_PATTERN = re.compile(r"\b(?:in|based in|located in|from)\s+((?:the\s+)?[\w.]+(?:\s+[\w.]+)?)",
+                                   re.IGNORECASE)
+
+
+def parse_search_filters(user_input):
+    """
+    Pulls structured filters out of a search, e.g. "remote python jobs posted this week".
+
+    Args:
+        user_input: Raw user message
+
+    Returns:
+        (the message without the filter phrases, {'remote', 'days', 'source', 'location'} for the
+        filters that were asked for)
+    """
+    if not user_input or not isinstance(user_input, str):
+        return user_input, {}
+    filters = {}
+    message = user_input
+
+    match = _RECENCY_PATTERN.search(message)
+    if match:
+        today, week, month, days = match.groups()
+        filters['days'] = 1 if today else 7 if week else 30 if month else max(1, int(days))
+        message = message[:match.start()] + " " + message[match.end():]
+
+    match = _SOURCE_PATTERN.search(message)
+    if match:
+        filters['source'] = re.sub(r"\s", "", match.group(1).lower())
+        message = message[:match.start()] + " " + message[match.end():]
+
+    if _ONSITE_PATTERN.search(message):
+        filters['remote'] = False
+        message = _ONSITE_PATTERN.sub(" ", message)
+    elif _REMOTE_PATTERN.search(message):
+        filters['remote'] = True
+        message = _REMOTE_PATTERN.sub(" ", message)
+
+    for match in _LOCATION_CUE_PATTERN.finditer(message):
+        location = find_location(match.group(1))
+        if location:
+            filters['location'] = location
+            message = message[:match.start()] + " " + message[match.end():]
+            break
+
+    return re.sub(r"\s+", " ", message).strip(), filters
+
+
+_RECOMMEND_PATTERN = re.compile(
+    r"^\s*(?:please\s+)?(?:recommend(?:ations?)?|suggest(?:ions?)?|(?:portfolio\s+)?projects?|ideas?)\s+"
+    r"(?:(?:projects?|ideas?|something)\s+)?(?:for|on|based on)\s+(?:the\s+)?(?:job|result|number|no\.?)?\s*#?(\d{1,3})\b",
+    re.IGNORECASE
+)
+_FOLLOW_UP_FILLER_PATTERN = re.compile(
+    r"\b(?:only|just|show|me|the|those|these|them|ones?|jobs?|results?|positions?|roles?|please|that|which|are|"
+    r"filter|keep|now|and|posted)\b|[^\w\s]",
+    re.IGNORECASE
+)
+
+
+def parse_follow_up(user_input):
+    """
+    Detects a follow-up that refines the previous results rather than a new search,
+    e.g. "only remote", "just the ones in europe" or "recommend for job 3".
+
+    Args:
+        user_input: Raw user message
+
+    Returns:
+        ('recommend', job number), ('filter', filters) or None for anything else
+    """
+    if not user_input or not isinstance(user_input, str):
+        return None
+    match = _RECOMMEND_PATTERN.match(user_input)
+    if match:
+        return 'recommend', int(match.group(1))
+    remainder, filters = parse_search_filters(user_input)
+    # Nothing but filter phrases and filler words: the filters apply to the previous results
+    if filters and not _FOLLOW_UP_FILLER_PATTERN.sub(" ", remainder).strip():
+        return 'filter', filters
+    return None
+
+
+_SKILL_CUE_PATTERN = re.compile(
+    r"\b(?:requiring|requires?|that requires?|needing|with|using|that uses?|knowing|"
+    r"skilled in|experience (?:in|with))\s+(.+)$",
+    re.IGNORECASE
+)
+
+
+def parse_skill_query(user_input):
+    """
+    Detects a search by required skills, e.g. "jobs requiring kubernetes and go"
+    or "backend engineer with python".
+
+    Args:
+        user_input: Raw user message
+
+    Returns:
+        (job title or None, [canonical skills]) or None if no skills are asked for
+    """
+    if not user_input or not isinstance(user_input, str):
+        return None
+    match = _SKILL_CUE_PATTERN.search(user_input.strip())
+    if not match:
+        return None
+    skills = extract_query_skills(match.group(1))
+    if not skills:
+        return None
+    prefix = user_input[:match.start()].strip()
+    job_title = extract_job_title(prefix) if prefix else None
+    return job_title, skills
+
 
 def extract_job_title(user_input):
     """
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+ -- job_fields.py --
+    Normalizes the source-specific fields adapters return into typed, filterable values
+    1. Remote flag: booleans, "true"/"false" strings, or the source's own convention
+    2. Posting time: epoch seconds or ISO-8601 strings, with or without offset -> naive UTC datetime
+    3. Location: free text -> a short canonical region ("usa", "europe", "worldwide", ...);
+       a region filter also matches the regions inside it and postings open worldwide
+"""
+import re
+from datetime import datetime, timezone
+
+# Boards that only list remote jobs
+REMOTE_ONLY_SOURCES = {"remotive", "remoteok", "jobicy"}
+
+# Canonical region -> spellings found in postings and queries (matched as whole words)
+LOCATION_ALIASES = {
+    "worldwide": ["worldwide", "anywhere", "global", "globally", "world"],
+    "usa": ["usa", "us", "u.s.", "united states", "america", "north america"],
+    "canada": ["canada"],
+    "latam": ["latam", "latin america", "south america", "mexico", "brazil", "argentina"],
+    "uk": ["uk", "united kingdom", "england", "london", "britain"],
+    "europe": ["europe", "eu", "emea", "european union"],
+    "germany": ["germany", "deutschland", "berlin", "munich", "hamburg"],
+    "asia": ["asia", "apac", "india", "singapore", "japan", "philippines"],
+    "africa": ["africa", "nigeria", "ghana", "kenya", "south africa"],
+    "australia": ["australia", "new zealand", "oceania"],
+}
+
+# Longest spellings first so "north america" wins over "america"
+_LOCATION_PATTERN = re.compile(
+    r"(?<![\w.])(" + "|".join(sorted((re.escape(alias) for aliases in LOCATION_ALIASES.values() for alias in aliases),
+                                     key=len, reverse=True)) + r")(?![\w])",
+    re.IGNORECASE
+)
+_ALIAS_TO_REGION = {alias: region for region, aliases in LOCATION_ALIASES.items() for alias in aliases}
+
+# Region -> the canonical regions inside it (postings name the country or city more often than the region)
+REGION_MEMBERS = {
+    "europe": {"germany", "uk"},
+}
+
+
+def parse_remote(value, source=None):
+    """Boolean remote flag, None when unknown"""
+    if source in REMOTE_ONLY_SOURCES:
+        return True
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in ("true", "yes", "1", "remote"):
+            return True
+        if lowered in ("false", "no", "0", "onsite", "on-site"):
+            return False
+    return None
+
+
+def parse_posted_at(value):
+    """Posting time as a naive UTC datetime, None when it can't be parsed"""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+            return datetime.fromtimestamp(float(value), tz=timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def find_location(text):
+    """The first canonical region mentioned in a text, or None"""
+    if not text:
+        return None
+    match = _LOCATION_PATTERN.search(text)
+    return _ALIAS_TO_REGION[match.group(1).lower()] if match else None
+
+
+def expand_location(region):
+    """Normalized locations a filter on the region matches: itself, the regions inside it and worldwide postings"""
+    return {region, "worldwide"} | REGION_MEMBERS.get(region, set())
+
+
+def normalize_location(value):
+    """Canonical region of a posting's location; unknown places keep their first segment, lowercased"""
+    if not value or not isinstance(value, str):
+        return None
+    region = find_location(value)
+    if region:
+        return region
+    first_segment = re.split(r"[,;/|(]", value)[0].strip().lower()
+    return first_segment[:64] or None
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+"""
+ -- metrics.py --
+    Lightweight in-process metrics exposed in Prometheus text format
+    1. Counters, gauges and histograms keyed by name + labels
+    2. `timed(stage)` spans for the request hot path
+    3. When METRICS_DIR is set, a background thread in each process writes its values
+       to that directory and /metrics merges every process' file, so the numbers
+       are correct whichever gunicorn worker serves the scrape. Required with more than
+       one worker: without it a scrape only sees the worker that served it.
+    4. The counters and histograms of exited workers are folded into an archive file, so
+       merged totals never go backwards when a worker restarts; their gauges are dropped.
+       Gauges are summed across processes, except LATEST_GAUGES (shared state such as a
+       job source's health), where the most recently set value wins.
+    Recording a value never touches the disk, so it is safe under other locks (see
+    services/admission.py).
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import Config
+
+# Upper bounds (seconds) for latency histograms
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_HELP = {
+    "jobsearchai_stage_duration_seconds": ("histogram", "Time spent in each request stage"),
+    "jobsearchai_cache_lookups_total": ("counter", "Cache lookups by cache and result"),
+    "jobsearchai_adapter_fetch_duration_seconds": ("histogram", "Job source fetch latency"),
+    "jobsearchai_adapter_fetches_total": ("counter", "Job source fetches by outcome"),
+    "jobsearchai_adapter_health": ("gauge", "Job source health score (0-1)"),
+    "jobsearchai_adapter_circuit_open": ("gauge", "1 while a job source's circuit is open"),
+    "jobsearchai_cache_refresh_duration_seconds": ("histogram", "Full cache refresh duration"),
+    "jobsearchai_llm_queue_depth": ("gauge", "Callers waiting for an LLM slot"),
+    "jobsearchai_llm_active_calls": ("gauge", "LLM calls in flight"),
+    "jobsearchai_llm_admissions_total": ("counter", "LLM admission decisions by priority and outcome"),
+    "jobsearchai_search_misses_total": ("counter", "Searches that found no cached jobs"),
+    "jobsearchai_miss_refreshes_total": ("counter", "Targeted fetches for missed titles by outcome"),
+    "jobsearchai_profiles_total": ("counter", "Request profiles by trigger and outcome"),
+}
+
+
+# Gauges every process reports about the same thing: merged by most recent value, not summed
+LATEST_GAUGES = {"jobsearchai_adapter_health", "jobsearchai_adapter_circuit_open"}
+
+ARCHIVE_NAME = "metrics_archive.json"
+
+
+class MetricsRegistry:
+    """Thread-safe store of metric values for one process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1.0, **labels):
+        """Increments a counter"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set_gauge(self, name, value, **labels):
+        """Sets a gauge to the given value"""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = (float(value), time.time())
+
+    def observe(self, name, value, **labels):
+        """Records an observation in a histogram"""
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(DEFAULT_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(DEFAULT_BUCKETS):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def reset(self):
+        """Drops every value"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """Returns a JSON-serializable copy of every value"""
+        with self._lock:
+            return {
+                "counters": [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                "gauges": [[name, list(labels), value, set_at]
+                           for (name, labels), (value, set_at) in self._gauges.items()],
+                "histograms": [[name, list(labels), list(h[0]), h[1], h[2]]
+                               for (name, labels), h in self._histograms.items()],
+            }
+
+
+_registry = MetricsRegistry()
+_flush_lock = threading.Lock()
+# Process that owns the running flusher thread (threads do not survive a fork)
+_flusher_pid = None
+
+
+def _reset_locks_after_fork():
+    """A fork copies locks held by other threads (e.g. the master's flusher) as locked forever"""
+    global _flush_lock
+    _flush_lock = threading.Lock()
+    _registry._lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+
+def _metrics_file(pid=None):
+    return os.path.join(Config.METRICS_DIR, f"metrics_{pid or os.getpid()}.json")
+
+
+def _flush():
+    """Writes this process' values to METRICS_DIR"""
+    with _flush_lock:
+        try:
+            os.makedirs(Config.METRICS_DIR, exist_ok=True)
+            path = _metrics_file()
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(_registry.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {e}")
+
+
+def _flush_periodically():
+    while True:
+        time.sleep(Config.METRICS_FLUSH_INTERVAL)
+        _flush()
+
+
+def _ensure_flusher():
+    """Starts this process' flusher thread once METRICS_DIR is in use"""
+    global _flusher_pid
+    if not Config.METRICS_DIR or _flusher_pid == os.getpid():
+        return
+    with _flush_lock:
+        if _flusher_pid == os.getpid():
+            return
+        _flusher_pid = os.getpid()
+    threading.Thread(target=_flush_periodically, name="metrics-flush", daemon=True).start()
+
+
+def inc_counter(name, value=1.0, **labels):
+    """Increments a counter"""
+    _registry.inc(name, value, **labels)
+    _ensure_flusher()
+
+
+def set_gauge(name, value, **labels):
+    """Sets a gauge"""
+    _registry.set_gauge(name, value, **labels)
+    _ensure_flusher()
+
+
+def observe(name, value, **labels):
+    """Records a histogram observation"""
+    _registry.observe(name, value, **labels)
+    _ensure_flusher()
+
+
+def reset_metrics():
+    """Forgets values inherited from a parent process (call after fork)"""
+    _registry.reset()
+
+
+def record_cache_lookup(cache, hit):
+    """Counts a hit or miss for the named cache"""
+    inc_counter("jobsearchai_cache_lookups_total", cache=cache, result="hit" if hit else "miss")
+
+
+@contextmanager
+def timed_metric(metric, **labels):
+    """Times the enclosed block into the given latency histogram"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(metric, time.perf_counter() - start, **labels)
+
+
+def timed(stage):
+    """Times the enclosed block as a request stage"""
+    return timed_metric("jobsearchai_stage_duration_seconds", stage=stage)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _read_snapshot(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_snapshot(path, snapshot):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+
+def _archive_dead_worker(path):
+    """Folds an exited worker's counters and histograms into the archive, then removes its file"""
+    with open(os.path.join(Config.METRICS_DIR, ".archive.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            # Another scrape may have archived it while we waited
+            snapshot = _read_snapshot(path)
+        except (OSError, ValueError):
+            return
+        archive_path = os.path.join(Config.METRICS_DIR, ARCHIVE_NAME)
+        try:
+            archive = _read_snapshot(archive_path)
+        except (OSError, ValueError):
+            archive = {"counters": [], "gauges": [], "histograms": []}
+        counters, _, histograms = _merge_snapshots([(archive, False), (snapshot, False)])
+        _write_snapshot(archive_path, {
+            "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+            "gauges": [],
+            "histograms": [[name, list(labels), *histogram] for (name, labels), histogram in histograms.items()],
+        })
+        os.remove(path)
+
+
+def _load_snapshots():
+    """Collects this process' snapshot, every running worker's file and the archive of exited ones"""
+    if not Config.METRICS_DIR:
+        return [(_registry.snapshot(), True)]
+
+    _flush()
+    snapshots = []
+    now = time.time()
+    try:
+        names = os.listdir(Config.METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if name == ARCHIVE_NAME or not (name.startswith("metrics_") and name.endswith(".json")):
+            continue
+        path = os.path.join(Config.METRICS_DIR, name)
+        pid = name[len("metrics_"):-len(".json")]
+        try:
+            if pid.isdigit() and not _pid_alive(int(pid)):
+                _archive_dead_worker(path)
+                continue
+            snapshot = _read_snapshot(path)
+            # Gauges of workers that stopped reporting are dropped, their counters are kept
+            live = now - os.path.getmtime(path) < Config.METRICS_GAUGE_TTL
+        except (OSError, ValueError):
+            continue
+        snapshots.append((snapshot, live))
+    # Read after the loop, so it includes the workers archived by this scrape
+    try:
+        snapshots.append((_read_snapshot(os.path.join(Config.METRICS_DIR, ARCHIVE_NAME)), False))
+    except (OSError, ValueError):
+        pass
+    return snapshots
+
+
+def _merge_snapshots(snapshots):
+    """Merged (counters, gauges, histograms) keyed by (name, labels) from (snapshot, live) pairs"""
+    counters, gauges, histograms = {}, {}, {}
+    latest = {}
+    for snapshot, live in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0.0) + value
+        if live:
+            for name, labels, value, *set_at in snapshot["gauges"]:
+                key = (name, tuple(tuple(label) for label in labels))
+                if name in LATEST_GAUGES:
+                    set_at = set_at[0] if set_at else 0.0
+                    if key not in latest or set_at >= latest[key]:
+                        latest[key] = set_at
+                        gauges[key] = value
+                else:
+                    gauges[key] = gauges.get(key, 0.0) + value
+        for name, labels, buckets, total, count in snapshot["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, [[0] * len(DEFAULT_BUCKETS), 0.0, 0])
+            merged[0] = [a + b for a, b in zip(merged[0], buckets)]
+            merged[1] += total
+            merged[2] += count
+    return counters, gauges, histograms
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def render_metrics():
+    """Renders every metric (merged across workers) in Prometheus text format"""
+    counters, gauges, histograms = _merge_snapshots(_load_snapshots())
+
+    lines = []
+    described = set()
+
+    def describe(name, default_type):
+        if name in described:
+            return
+        described.add(name)
+        metric_type, help_text = METRIC_HELP.get(name, (default_type, name))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+    for (name, labels), value in sorted(counters.items()):
+        describe(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), value in sorted(gauges.items()):
+        describe(name, "gauge")
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+        describe(name, "histogram")
+        for bound, bucket_count in zip(DEFAULT_BUCKETS, buckets):
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(bound)),))} {bucket_count}")
+        lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+ -- profiling.py --
+    On-demand cProfile capture of live requests
+    1. A request is profiled when it carries PROFILE_TOKEN (X-Profile-Token header or ?profile=)
+       or is picked at random at PROFILE_SAMPLE_RATE
+    2. Each profile is written to PROFILE_DIR as <id>.prof (open with `python -m pstats` or snakeviz)
+       plus <id>.json with the request metadata and the top functions by cumulative time
+    3. PROFILE_DIR is a ring buffer: only the newest PROFILE_KEEP profiles are kept
+    When no token is configured and the sample rate is 0, choosing not to profile is one
+    attribute check per request. cProfile allows one active profiler per process, so a request
+    arriving while another is being profiled is served without one.
+"""
+import hmac
+import io
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+from config import Config
+from utils.metrics import inc_counter
+
+PROFILE_HEADER = "X-Profile-Token"
+TOP_FUNCTIONS = 25
+
+_profiler_lock = threading.Lock()
+_not_profiled = nullcontext()
+
+
+def profile_trigger(header_token=None, query_token=None):
+    """
+    Decides whether to profile a request
+    :return: "token" or "sample" when the request should be profiled, otherwise None
+    """
+    if not Config.PROFILE_TOKEN and not Config.PROFILE_SAMPLE_RATE:
+        return None
+    token = header_token or query_token
+    if token and Config.PROFILE_TOKEN and hmac.compare_digest(token.encode(), Config.PROFILE_TOKEN.encode()):
+        return "token"
+    if Config.PROFILE_SAMPLE_RATE and random.random() < Config.PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def profiled(trigger, metadata=None):
+    """
+    Context manager profiling the enclosed block when trigger is set
+    It yields the profile id (None when nothing is recorded); the files are written on exit.
+    """
+    if not trigger:
+        return _not_profiled
+    return _profile(trigger, metadata)
+
+
+@contextmanager
+def _profile(trigger, metadata):
+    if not _profiler_lock.acquire(blocking=False):
+        inc_counter("jobsearchai_profiles_total", trigger=trigger, outcome="busy")
+        yield None
+        return
+
+    import cProfile  # Only loaded once something is profiled
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiling tool (a debugger, coverage) already owns the hook
+        _profiler_lock.release()
+        inc_counter("jobsearchai_profiles_total", trigger=trigger, outcome="busy")
+        yield None
+        return
+
+    started_at = datetime.now(timezone.utc)
+    profile_id = f"{started_at.strftime('%Y%m%dT%H%M%S%f')}_{os.getpid()}"
+    start = time.perf_counter()
+    try:
+        yield profile_id
+    finally:
+        profiler.disable()
+        duration = time.perf_counter() - start
+        _profiler_lock.release()
+
+    try:
+        _write_profile(profile_id, profiler, {
+            **(metadata or {}),
+            "id": profile_id,
+            "trigger": trigger,
+            "pid": os.getpid(),
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+        })
+        inc_counter("jobsearchai_profiles_total", trigger=trigger, outcome="written")
+    except Exception as e:
+        print(f"Error writing profile {profile_id}: {e}")
+
+
+def _write_profile(profile_id, profiler, metadata):
+    """Writes the profile and its metadata, then trims the ring buffer"""
+    import pstats
+    os.makedirs(Config.PROFILE_DIR, exist_ok=True)
+    base = os.path.join(Config.PROFILE_DIR, profile_id)
+    profiler.dump_stats(f"{base}.prof")
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    top = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:TOP_FUNCTIONS]
+    metadata["top"] = [
+        {"function": pstats.func_std_string(function), "calls": calls,
+         "own_s": round(own, 6), "cumulative_s": round(cumulative, 6)}
+        for function, (_, calls, own, cumulative, _) in top
+    ]
+
+    tmp_path = f"{base}.json.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, f"{base}.json")
+    _trim_profiles()
+
+
+def _trim_profiles():
+    """Deletes all but the newest PROFILE_KEEP profiles (ids sort by start time)"""
+    try:
+        ids = sorted({name.rsplit(".", 1)[0] for name in os.listdir(Config.PROFILE_DIR)
+                      if name.endswith((".prof", ".json"))})
+    except OSError:
+        return
+    for old_id in ids[:-Config.PROFILE_KEEP] if Config.PROFILE_KEEP > 0 else ids:
+        for extension in (".prof", ".json"):
+            try:
+                os.remove(os.path.join(Config.PROFILE_DIR, old_id + extension))
+            except FileNotFoundError:
+                pass
@@ -1,7 +1,18 @@
 #!/usr/bin/env python
 """Stores prompt templates for AI agents"""
 import textwrap
-from typing import Dict
+from typing import Dict, List
+
+
+def format_market_skills(market_skills: List[Dict], limit: int = 6) -> str:
+    """Compact one-line summary of this week's most demanded skills, e.g. 'python 62% (+3 wk/wk)'"""
+    parts = []
+    for entry in (market_skills or [])[:limit]:
+        part = f"{entry['skill']} {round(entry['share'] * 100)}%"
+        if entry.get('delta'):
+            part += f" ({entry['delta']:+d} wk/wk)"
+        parts.append(part)
+    return ", ".join(parts) or "N/A"
 
 
 class Prompts:
@@ -13,15 +24,20 @@ class Prompts:
         job_description = job_data.get("job_description", "")
         if len(job_description) > 5000:
             job_description = job_description[:5000] + "..."
+        skills = ", ".join(job_data.get("skills") or []) or "N/A"
+        market_skills = format_market_skills(job_data.get("market_skills"))
         prompt = textwrap.dedent(f"""
         Analyze this job and recommend 3 top portfolio projects that would impress hiring managers for this role.
         Job Title: {job_data.get("job_title", "N/A")}
         Company: {job_data.get("company_name", "N/A")}
+        Key skills in these postings: {skills}
+        Top demanded skills this week (share of postings for this title): {market_skills}
         Description: {job_description}
         
         Requirements:
         - Provide 3 distinct portfolio project ideas that solve real-world problems relevant to this role.
         - Projects should demonstrate key skills and technologies mentioned in or implied by the job description.
+        - Favor the top demanded skills this week where they fit the role.
         - Make projects specific and actionable, not generic templates.
         - If job is a non-technical role, recommend projects that demonstrate relevant soft skills and domain knowledge.
         - If job is a technical, role, recommend projects that demonstrate 2026 high-demand relevant skills for that role. 
@@ -47,6 +63,56 @@ class Prompts:
 """)
         return prompt
 
+    @staticmethod
+    def generate_batch_recommendation_prompt(jobs: List[Dict]):
+        """Prompt template for recommending portfolio projects for several jobs in one call"""
+        job_blocks = []
+        for index, job_data in enumerate(jobs):
+            job_description = job_data.get("job_description", "")
+            if len(job_description) > 2000:
+                job_description = job_description[:2000] + "..."
+            job_blocks.append(textwrap.dedent(f"""
+            Job {index}:
+            Job Title: {job_data.get("job_title", "N/A")}
+            Company: {job_data.get("company_name", "N/A")}
+            Key skills in these postings: {", ".join(job_data.get("skills") or []) or "N/A"}
+            Top demanded skills this week: {format_market_skills(job_data.get("market_skills"))}
+            Description: {job_description}
+            """))
+        jobs_text = "\n".join(job_blocks)
+        prompt = textwrap.dedent(f"""
+        Analyze each of the following {len(jobs)} jobs and, for EACH job separately, recommend 3 top portfolio projects
+        that would impress hiring managers for that role.
+        {jobs_text}
+        Requirements (apply to every job):
+        - Provide 3 distinct portfolio project ideas that solve real-world problems relevant to the role.
+        - Projects should demonstrate key skills and technologies mentioned in or implied by the job description.
+        - Make projects specific and actionable, not generic templates.
+        - If a job is non-technical, recommend projects that demonstrate relevant soft skills and domain knowledge.
+        - If a job is technical, recommend projects that demonstrate 2026 high-demand relevant skills for that role.
+        - One of the projects must be creative or unconventional and stand out from typical projects.
+        - Return ONLY a JSON object in this exact format (no markdown, no extra text):
+        {{
+        "results": [
+        {{
+        "job_index": 0,
+        "projects": [
+        {{
+        "title": "Specific descriptive project name",
+        "description": "Clear 2 - 5 sentence explanation of what to build and why it's relevant to the job",
+        "technologies": ["Tech1", "Tech2", "..."],
+        "demonstrates": "Specific skills from the job description this project proves",
+        "timeline": "Realistic estimated completion time (e.g. '1 week', '2 months')",
+        "standout_factor": "Why this project would impress hiring managers."
+        }}
+        ]
+        }}
+        ]
+        }}
+    Include one entry in "results" per job, using its job number as "job_index". Ensure the JSON is complete and properly formatted.
+""")
+        return prompt
+
     def extract_title_prompt(user_input: str):
         """Prompt template for extracting job title from user input using LLM"""
         prompt = textwrap.dedent(f"""
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+ -- skills.py --
+    Dictionary matcher that extracts skills and technologies from job tags,
+    job descriptions and user queries (built on the gazetteer trie)
+"""
+import re
+from typing import Iterable, List, Optional, Set
+
+from utils.gazetteer import Gazetteer
+
+# Canonical skill -> aliases as they appear in postings (matched case-insensitively, word by word)
+SKILL_ALIASES = {
+    "python": ["python", "python3"],
+    "java": ["java"],
+    "javascript": ["javascript", "js", "ecmascript"],
+    "typescript": ["typescript", "ts"],
+    "go": ["golang", "go"],
+    "rust": ["rust"],
+    "c++": ["c++", "cpp"],
+    "c#": ["c#", "csharp"],
+    ".net": [".net", "dotnet", "asp.net"],
+    "ruby": ["ruby"],
+    "rails": ["rails", "ruby on rails", "ror"],
+    "php": ["php"],
+    "laravel": ["laravel"],
+    "kotlin": ["kotlin"],
+    "swift": ["swift"],
+    "scala": ["scala"],
+    "elixir": ["elixir"],
+    "r": ["r"],
+    "sql": ["sql"],
+    "django": ["django"],
+    "flask": ["flask"],
+    "fastapi": ["fastapi"],
+    "spring": ["spring", "spring boot", "springboot"],
+    "node.js": ["node.js", "nodejs", "node"],
+    "express": ["express", "express.js", "expressjs"],
+    "react": ["react", "react.js", "reactjs"],
+    "react native": ["react native"],
+    "angular": ["angular", "angularjs"],
+    "vue": ["vue", "vue.js", "vuejs"],
+    "next.js": ["next.js", "nextjs"],
+    "svelte": ["svelte"],
+    "graphql": ["graphql"],
+    "rest api": ["rest", "restful", "rest api", "restful api"],
+    "grpc": ["grpc"],
+    "postgresql": ["postgresql", "postgres"],
+    "mysql": ["mysql"],
+    "mongodb": ["mongodb", "mongo"],
+    "redis": ["redis"],
+    "elasticsearch": ["elasticsearch", "elastic search"],
+    "kafka": ["kafka"],
+    "rabbitmq": ["rabbitmq"],
+    "spark": ["spark", "pyspark", "apache spark"],
+    "airflow": ["airflow"],
+    "dbt": ["dbt"],
+    "snowflake": ["snowflake"],
+    "bigquery": ["bigquery"],
+    "aws": ["aws", "amazon web services"],
+    "gcp": ["gcp", "google cloud", "google cloud platform"],
+    "azure": ["azure"],
+    "docker": ["docker"],
+    "kubernetes": ["kubernetes", "k8s"],
+    "terraform": ["terraform"],
+    "ansible": ["ansible"],
+    "ci/cd": ["ci/cd", "ci cd", "continuous integration"],
+    "github actions": ["github actions"],
+    "jenkins": ["jenkins"],
+    "linux": ["linux"],
+    "git": ["git"],
+    "machine learning": ["machine learning", "ml"],
+    "deep learning": ["deep learning"],
+    "pytorch": ["pytorch"],
+    "tensorflow": ["tensorflow"],
+    "llm": ["llm", "llms", "large language models"],
+    "nlp": ["nlp", "natural language processing"],
+    "pandas": ["pandas"],
+    "numpy": ["numpy"],
+    "tableau": ["tableau"],
+    "power bi": ["power bi", "powerbi"],
+    "excel": ["excel"],
+    "figma": ["figma"],
+    "ios": ["ios"],
+    "android": ["android"],
+    "flutter": ["flutter"],
+    "microservices": ["microservices", "microservice"],
+    "html": ["html", "html5"],
+    "css": ["css", "css3", "tailwind", "tailwindcss"],
+    "seo": ["seo"],
+    "salesforce": ["salesforce"],
+    "sap": ["sap"],
+}
+
+# Aliases that are ordinary English words or letters: only trusted in tags and explicit skill queries
+AMBIGUOUS_ALIASES = {"go", "r", "rust", "swift", "spring", "express", "node", "rest", "ts", "js", "ml",
+                     "excel", "spark", "git", "ror", "sap"}
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercases text and keeps the characters skills are spelled with (+, #, ., /)"""
+    text = text.lower()
+    # Sentence punctuation is not part of a skill ("python." / "go,")
+    text = re.sub(r"[.,;:!?)]+(?=\s|$)", " ", text)
+    text = re.sub(r"[^\w+#./\s-]", " ", text)
+    # "python/django" is two skills, "ci/cd" is one
+    text = re.sub(r"(?<!\bci)/(?!cd\b)", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class SkillMatcher:
+    """Finds canonical skills in free text"""
+
+    def __init__(self, include_ambiguous: bool):
+        self._gazetteer = Gazetteer(normalizer=normalize_skill_text)
+        for skill, aliases in SKILL_ALIASES.items():
+            for alias in aliases:
+                if include_ambiguous or alias not in AMBIGUOUS_ALIASES:
+                    self._gazetteer.add(alias, value=skill)
+
+    def find(self, text: Optional[str]) -> List[str]:
+        """Returns the canonical skills mentioned in the text, in order of appearance"""
+        if not text:
+            return []
+        # Prefer the longest alias at each position ("react native" over "react")
+        matches = sorted(self._gazetteer.find_all(text), key=lambda m: (m[1], -m[2]))
+        skills = []
+        covered_until = -1
+        for value, start, length, _ in matches:
+            if start <= covered_until:
+                continue
+            covered_until = start + length - 1
+            if value not in skills:
+                skills.append(value)
+        return skills
+
+
+_strict_matcher = SkillMatcher(include_ambiguous=False)
+_full_matcher = SkillMatcher(include_ambiguous=True)
+
+
+def extract_job_skills(tags: Optional[Iterable[str]], description: Optional[str]) -> Set[str]:
+    """Skills of a job posting: every alias in its tags, unambiguous aliases in its description"""
+    skills = set()
+    for tag in tags or []:
+        if isinstance(tag, str):
+            skills.update(_full_matcher.find(tag))
+    skills.update(_strict_matcher.find(description))
+    return skills
+
+
+def extract_query_skills(text: Optional[str]) -> List[str]:
+    """Skills named in a user query (the user means "Go" when they say it)"""
+    return _full_matcher.find(text)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+ -- text_vectors.py --
+    Hashed TF-IDF feature vectors for job descriptions and free-text queries
+    1. Words and word pairs are hashed (crc32, stable across processes) into a fixed number
+       of buckets with a sign bit, so no vocabulary has to be stored or shared
+    2. Term counts are dampened (1 + log tf), weighted by the corpus IDF and L2-normalized,
+       so the dot product of two vectors is their cosine similarity
+"""
+import re
+import zlib
+from collections import Counter
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOP_WORDS = {
+    'a', 'about', 'all', 'also', 'an', 'and', 'any', 'are', 'as', 'at', 'be', 'been', 'but', 'by', 'can',
+    'do', 'for', 'from', 'has', 'have', 'how', 'if', 'in', 'into', 'is', 'it', 'its', 'more', 'not', 'of',
+    'on', 'or', 'our', 'out', 'so', 'such', 'than', 'that', 'the', 'their', 'them', 'there', 'they', 'this',
+    'to', 'up', 'us', 'was', 'we', 'were', 'what', 'when', 'which', 'who', 'will', 'with', 'you', 'your',
+}
+
+
+def tokenize(text):
+    """Lowercased words of a text without stop words or trailing punctuation"""
+    if not text:
+        return []
+    words = (token.rstrip('.') for token in _TOKEN_PATTERN.findall(text.lower()))
+    return [word for word in words if word and word not in STOP_WORDS]
+
+
+def hashed_features(text, dimensions):
+    """
+    Sparse hashed term counts of a text: {bucket: signed count}
+    Word pairs are included so "machine learning" is more than "machine" + "learning".
+    """
+    words = tokenize(text)
+    terms = Counter(words)
+    terms.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    features = {}
+    for term, count in terms.items():
+        digest = zlib.crc32(term.encode('utf-8'))
+        bucket = digest % dimensions
+        sign = 1.0 if digest & 0x80000000 else -1.0
+        features[bucket] = features.get(bucket, 0.0) + sign * count
+    return features
+
+
+def weighted_vector(features, idf):
+    """Dense L2-normalized TF-IDF vector (float32) from hashed_features and an IDF array"""
+    import numpy as np  # Only needed for semantic search
+    vector = np.zeros(len(idf), dtype=np.float32)
+    if features:
+        buckets = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+        counts = np.fromiter(features.values(), dtype=np.float32, count=len(features))
+        vector[buckets] = np.sign(counts) * (1.0 + np.log(np.abs(counts) + 1e-9).clip(min=0)) * idf[buckets]
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def inverse_document_frequencies(feature_sets, dimensions):
+    """Smoothed IDF per bucket, log((1 + n) / (1 + df)) + 1, over the given documents' features"""
+    import numpy as np
+    document_frequency = np.zeros(dimensions, dtype=np.float64)
+    for features in feature_sets:
+        if features:
+            document_frequency[np.fromiter(features.keys(), dtype=np.int64, count=len(features))] += 1
+    return (np.log((1.0 + len(feature_sets)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)